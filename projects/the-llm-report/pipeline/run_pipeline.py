@@ -34,6 +34,8 @@ def run(run_type: str = "standard") -> int:
     from pipeline.src.kb.store import start_run, complete_run, get_untriaged_items, update_item_significance
     from pipeline.src.collect.collector import run_collection
     from pipeline.src.triage.triage_agent import triage_batch, filter_triaged
+    from pipeline.src.config import get_triage_batch_size
+    from pipeline.src.triage import pre_triage, predictor
     from pipeline.src.triage.dedup import deduplicate
     from pipeline.src.analysis.analysis_agent import analyze_batch
     from pipeline.src.editorial.editorial_agent import edit_batch, assemble_newsletter
@@ -67,6 +69,9 @@ def run(run_type: str = "standard") -> int:
             log(f"Recovered {len(recovered)} untriaged items from previous runs", run_id=run_state.run_id)
         triage_input = collection_result.items_new + recovered
 
+        # Triage and dedup read the vector store — let background embedding finish
+        collection_result.wait_for_embeddings()
+
         if not triage_input:
             log("No new items collected — producing minimal edition", run_id=run_state.run_id)
 
@@ -78,9 +83,15 @@ def run(run_type: str = "standard") -> int:
             complete_run(run_state)
             return 2
 
-        # 2. TRIAGE
-        log(f"Stage: Triage ({len(triage_input)} items)", run_id=run_state.run_id)
-        triaged, triage_errors = triage_batch(triage_input)
+        # 2. TRIAGE — obvious noise is archived locally, confident kNN predictions
+        # from past triage results are used as-is, the rest goes to the LLM
+        llm_input, pre_archived = pre_triage.filter_items(triage_input, run_state.run_id)
+        llm_input, predicted = predictor.filter_items(llm_input)
+        log(f"Stage: Triage ({len(llm_input)} items, {len(pre_archived)} auto-archived, "
+            f"{len(predicted)} predicted)", run_id=run_state.run_id)
+        triaged, triage_errors = triage_batch(llm_input, batch_size=get_triage_batch_size())
+        predictor.record_labels(triaged)
+        triaged.extend(pre_archived + predicted)
         run_state.items_triaged = len(triaged)
         run_state.errors.extend(triage_errors)
 
@@ -13,7 +13,7 @@ from typing import Callable, Optional
 
 from pipeline.src.models import AnalyzedStory, StoryGroup, TriagedItem
 from pipeline.src.kb import kb_query, store
-from pipeline.src.collect.tagger import extract_model_mentions, extract_org_mentions
+from pipeline.src.collect.tagger import scan_text
 
 ANALYSIS_MODEL = os.environ.get("ANALYSIS_MODEL", "claude-opus-4-6")
 LITELLM_URL = os.environ.get("LITELLM_PROXY_URL", "http://localhost:4000")
@@ -105,9 +105,8 @@ def analyze_story(
     query_text = f"{primary.title} {primary.raw_content[:300]}"
 
     # Extract entities for structured store lookup
-    model_mentions = extract_model_mentions(f"{primary.title} {primary.raw_content}")
-    org_mentions = extract_org_mentions(f"{primary.title} {primary.raw_content}")
-    entity_names = list(set(model_mentions + org_mentions))
+    scan = scan_text(f"{primary.title} {primary.raw_content}")
+    entity_names = list(set(scan.model_mentions + scan.org_mentions))
 
     # KB-First Query
     ctx = kb_query.query(
@@ -0,0 +1,3 @@
+# The LLM Report — Benchmarks
+# Offline performance checks for pipeline hot paths. Run as modules, e.g.
+#   python -m pipeline.src.bench.feed_parser_bench
@@ -0,0 +1,383 @@
+"""
+The LLM Report — Collection Load Test
+Runs run_collection against a local replay server instead of the internet and
+reports throughput (items/sec), p50/p95 per-source latency and peak RSS, so
+collection regressions show up before production.
+
+  record  run one real collection and save every GET response as a fixture
+  run     serve the fixtures from a local HTTP server (in its own process)
+          with injected latency and errors, scaled to --scale sources
+
+Every request of the shared http_client session is routed to the server by a
+transport adapter, so collectors, streaming, retries, dedup and ingest run
+unchanged against a throwaway KB. Source i of a scaled run replays configured
+source i % k under the host r<i // k>.<host>; the server rewrites that
+replica's links and text so its items are new stories, not duplicates.
+Without --fixtures, sources are synthetic RSS feeds. GitHub is collected over
+REST (GraphQL POSTs are not replayed); embeddings are skipped unless --embed.
+
+Usage (from projects/the-llm-report):
+  python -m pipeline.src.bench.collection_bench record --fixtures DIR
+  python -m pipeline.src.bench.collection_bench run --fixtures DIR --scale 500
+  python -m pipeline.src.bench.collection_bench run --scale 500 --latency-ms 80 --error-rate 0.02
+  ... run --max-p95-ms 2000 --min-items-per-sec 50   # exit 1 on regression
+"""
+
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+from urllib.parse import parse_qs, quote, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+# collector logs through orchestrator.as_built, which lives at the repo root
+REPO_ROOT = str(Path(__file__).resolve().parents[5])
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+INDEX_FILE = "index.json"
+SYNTHETIC_WORDS = (
+    "model release benchmark reasoning context window open weights inference latency "
+    "agent tool evaluation safety alignment dataset training compute cluster partnership "
+    "pricing api endpoint multimodal vision speech fine-tuning distillation quantization "
+    "leaderboard research paper preview enterprise developer platform update launch"
+).split()
+
+_REPLICA_HOST = re.compile(r"^r(\d+)\.(.+)$")
+_ABS_URL = re.compile(rb"(https?://)([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)")
+_TEXT_NODE = re.compile(rb">([^<]{12,})<")
+_WORD = re.compile(rb"(?<![&#\w/.=_-])([A-Za-z]{4,})(?![\w:;/.-])")
+
+
+# ── Fixtures ───────────────────────────────────────────────────────────────
+
+def load_fixtures(directory: Path) -> dict[str, dict]:
+    """{url: {"status", "content_type", "body"}} from a recorded fixture directory."""
+    index = json.loads((directory / INDEX_FILE).read_text())
+    return {
+        url: {**meta, "body": (directory / meta["file"]).read_bytes()}
+        for url, meta in index.items()
+    }
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that saves every GET response it receives."""
+
+    def __init__(self, directory: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.index: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if request.method == "GET":
+            name = hashlib.sha256(request.url.encode()).hexdigest()[:16] + ".body"
+            (self.directory / name).write_bytes(resp.content)
+            with self._lock:
+                self.index[request.url] = {
+                    "file": name,
+                    "status": resp.status_code,
+                    "content_type": resp.headers.get("Content-Type", "application/octet-stream"),
+                }
+        return resp
+
+
+# ── Replica URLs and content ──────────────────────────────────────────────
+
+def replica_url(url: str, replica: int) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, f"r{replica}.{parts.netloc}", parts.path, parts.query, ""))
+
+
+def original_url(url: str) -> tuple[int, str]:
+    """(replica, URL as recorded) for a possibly replica-hosted URL."""
+    parts = urlsplit(url)
+    match = _REPLICA_HOST.match(parts.netloc)
+    if not match:
+        return 0, url
+    return int(match.group(1)), urlunsplit((parts.scheme, match.group(2), parts.path, parts.query, ""))
+
+
+def _vary_text(text: bytes, replica: int) -> bytes:
+    tag = str(replica).encode()
+    return _WORD.sub(lambda m: m.group(1) + tag, text)
+
+
+def _vary_json(value, replica: int):
+    if isinstance(value, dict):
+        return {k: _vary_json(v, replica) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_vary_json(v, replica) for v in value]
+    if isinstance(value, str):
+        if value.startswith(("http://", "https://")):
+            return replica_url(value, replica)
+        if " " in value:
+            return _vary_text(value.encode(), replica).decode()
+    return value
+
+
+def vary(body: bytes, content_type: str, replica: int) -> bytes:
+    """Make replica `replica` of a recorded body: replica-hosted links, distinct text."""
+    if replica == 0:
+        return body
+    if "json" in content_type:
+        try:
+            return json.dumps(_vary_json(json.loads(body), replica)).encode()
+        except ValueError:
+            return body
+    prefix = b"r%d." % replica
+    body = _ABS_URL.sub(lambda m: m.group(1) + prefix + m.group(2), body)
+    return _TEXT_NODE.sub(lambda m: b">" + _vary_text(m.group(1), replica) + b"<", body)
+
+
+def synthetic_feed(url: str, entries: int) -> bytes:
+    """A deterministic RSS feed for `url` with distinct, recent entries."""
+    rng = random.Random(url)
+    now = datetime.now(timezone.utc)
+    base = url.rsplit("/", 1)[0]
+    items = []
+    for j in range(entries):
+        words = " ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(120))
+        title = " ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(8)).capitalize()
+        items.append(
+            f"<item><title>{title}</title><link>{base}/post-{j}</link><guid>{base}/post-{j}</guid>"
+            f"<pubDate>{format_datetime(now - timedelta(hours=j))}</pubDate>"
+            f"<description>&lt;p&gt;{words}&lt;/p&gt;</description></item>"
+        )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>{urlsplit(url).netloc}</title>'
+            f'{"".join(items)}</channel></rss>').encode()
+
+
+# ── Replay server ──────────────────────────────────────────────────────────
+
+def _serve(fixtures_dir: Optional[str], latency_ms: float, error_rate: float, entries: int, seed: int, ready) -> None:
+    fixtures = load_fixtures(Path(fixtures_dir)) if fixtures_dir else {}
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real hosts
+
+        def do_GET(self):
+            url = parse_qs(urlsplit(self.path).query).get("url", [""])[0]
+            with rng_lock:
+                delay = latency_ms / 1000 * rng.uniform(0.5, 1.5)
+                failed = rng.random() < error_rate
+            time.sleep(delay)
+
+            status, content_type, body = 404, "text/plain", b"no fixture"
+            replica, recorded = original_url(url)
+            if failed:
+                status, body = 503, b"injected error"
+            elif recorded in fixtures:
+                fixture = fixtures[recorded]
+                status, content_type = fixture["status"], fixture["content_type"]
+                body = vary(fixture["body"], content_type, replica)
+            elif not fixtures:
+                status, content_type, body = 200, "application/rss+xml", synthetic_feed(url, entries)
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that sends every request to the replay server instead."""
+
+    def __init__(self, server_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.server_url = server_url
+
+    def send(self, request, **kwargs):
+        original = request.url
+        request.url = f"{self.server_url}/replay?url={quote(original, safe='')}"
+        resp = super().send(request, **kwargs)
+        resp.url = original
+        return resp
+
+
+# ── Runs ───────────────────────────────────────────────────────────────────
+
+def scaled_sources(base: list[dict], scale: int) -> list[dict]:
+    """`scale` sources cycling through `base`, each on its own replica host."""
+    sources = []
+    for i in range(scale):
+        source = dict(base[i % len(base)])
+        replica = i // len(base)
+        source["name"] = f"{source['name']} #{i}"
+        source["url"] = replica_url(source["url"], replica)
+        if source.get("sitemap_url"):
+            source["sitemap_url"] = replica_url(source["sitemap_url"], replica)
+        if source.get("article_pattern"):
+            host = re.escape(urlsplit(base[i % len(base)]["url"]).netloc)
+            source["article_pattern"] = source["article_pattern"].replace(host, f"r{replica}\\.{host}")
+        sources.append(source)
+    return sources
+
+
+def synthetic_sources(scale: int) -> list[dict]:
+    return [
+        {"name": f"Synthetic Feed {i}", "type": "rss", "url": f"https://feed{i}.bench.invalid/feed.xml",
+         "tier": 1 + i % 3, "enabled": True}
+        for i in range(scale)
+    ]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _collect(sources: list[dict], adapter: HTTPAdapter, workdir: Path, embed: bool):
+    """run_collection over `sources` with `adapter` mounted, against a throwaway KB."""
+    from orchestrator import as_built
+    from pipeline.src.collect import collector, extractor, github_collector, http_client
+    from pipeline.src.kb import store, vector_store
+    from pipeline.src.models import RunState
+
+    http_client.close()
+    with patch.object(store, "DB_PATH", workdir / "kb.sqlite"), \
+            patch.object(as_built, "AS_BUILT_PATH", workdir / "as-built.md"), \
+            patch.object(http_client, "HTTP2", False), \
+            patch.object(github_collector, "USE_GRAPHQL", False), \
+            patch.object(collector, "_load_sources", return_value=sources):
+        session = http_client._get_session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        embedding = patch.object(vector_store, "embed_items", return_value={}) if not embed else None
+        try:
+            if embedding:
+                embedding.start()
+            start = time.perf_counter()
+            result = collector.run_collection(RunState(run_type="deep-dive"))
+            result.wait_for_embeddings()
+            return result, time.perf_counter() - start
+        finally:
+            if embedding:
+                embedding.stop()
+            extractor.shutdown()
+            http_client.close()
+
+
+def record(args) -> int:
+    from pipeline.src.collect import collector, http_client
+
+    args.fixtures.mkdir(parents=True, exist_ok=True)
+    adapter = RecordingAdapter(args.fixtures, pool_connections=http_client.POOL_HOSTS,
+                               pool_maxsize=http_client.POOL_PER_HOST)
+    with tempfile.TemporaryDirectory() as tmp:
+        result, elapsed = _collect(collector._load_sources("deep-dive"), adapter, Path(tmp), embed=False)
+    (args.fixtures / INDEX_FILE).write_text(json.dumps(adapter.index, indent=1, sort_keys=True))
+    print(f"Recorded {len(adapter.index)} responses from {result.sources_attempted} sources "
+          f"in {elapsed:.1f}s to {args.fixtures}")
+    return 0
+
+
+def run(args) -> int:
+    from pipeline.src.collect import collector
+
+    if args.fixtures:
+        sources = scaled_sources(collector._load_sources("deep-dive"), args.scale)
+    else:
+        sources = synthetic_sources(args.scale)
+
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    server = ctx.Process(
+        target=_serve,
+        args=(str(args.fixtures) if args.fixtures else None, args.latency_ms, args.error_rate,
+              args.entries, args.seed, ready),
+        daemon=True,
+    )
+    server.start()
+    try:
+        port = ready.get(timeout=30)
+        adapter = ReplayAdapter(f"http://127.0.0.1:{port}", pool_connections=1,
+                                pool_maxsize=collector.MAX_CONCURRENCY * 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            result, elapsed = _collect(sources, adapter, Path(tmp), args.embed)
+    finally:
+        server.terminate()
+        server.join()
+
+    latencies = [sum(a.duration_s for a in attempts) for attempts in result.attempts.values()]
+    items = len(result.items_new) + result.items_skipped
+    items_per_sec = items / elapsed if elapsed else 0.0
+    p50, p95 = _percentile(latencies, 50) * 1000, _percentile(latencies, 95) * 1000
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+    print(f"sources        {len(sources)} ({result.sources_succeeded} ok, {len(result.errors)} failed, "
+          f"{len(result.sources_skipped)} skipped)")
+    print(f"items          {items} fetched, {len(result.items_new)} new")
+    print(f"wall time      {elapsed:.2f}s")
+    print(f"throughput     {items_per_sec:.1f} items/s")
+    print(f"source latency p50 {p50:.0f}ms  p95 {p95:.0f}ms")
+    print(f"peak RSS       {peak_rss_mb:.0f} MB")
+
+    regressions = []
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        regressions.append(f"p95 {p95:.0f}ms > {args.max_p95_ms:.0f}ms")
+    if args.min_items_per_sec is not None and items_per_sec < args.min_items_per_sec:
+        regressions.append(f"{items_per_sec:.1f} items/s < {args.min_items_per_sec:.1f}")
+    if args.max_rss_mb is not None and peak_rss_mb > args.max_rss_mb:
+        regressions.append(f"peak RSS {peak_rss_mb:.0f}MB > {args.max_rss_mb:.0f}MB")
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Capture real responses of one collection run")
+    rec.add_argument("--fixtures", type=Path, required=True, help="Directory to write fixtures to")
+
+    replay = commands.add_parser("run", help="Replay fixtures (or synthetic feeds) and report")
+    replay.add_argument("--fixtures", type=Path, help="Recorded fixture directory (default: synthetic RSS)")
+    replay.add_argument("--scale", type=int, default=500, help="Number of sources")
+    replay.add_argument("--latency-ms", type=float, default=50.0, help="Mean server latency per request")
+    replay.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    replay.add_argument("--entries", type=int, default=10, help="Entries per synthetic feed")
+    replay.add_argument("--seed", type=int, default=0)
+    replay.add_argument("--embed", action="store_true", help="Include background embedding")
+    replay.add_argument("--max-p95-ms", type=float)
+    replay.add_argument("--min-items-per-sec", type=float)
+    replay.add_argument("--max-rss-mb", type=float)
+
+    args = parser.parse_args(argv)
+    return record(args) if args.command == "record" else run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
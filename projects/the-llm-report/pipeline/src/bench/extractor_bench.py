@@ -0,0 +1,125 @@
+"""
+The LLM Report — Content Extractor Benchmark
+Compares the single-pass lxml extractor against the previous BeautifulSoup
+tree walk (title + _extract_date + _extract_main_content) on the same pages,
+and checks that both extract the same title, text and date.
+
+Usage (from projects/the-llm-report):
+  python -m pipeline.src.bench.extractor_bench                   # synthetic pages
+  python -m pipeline.src.bench.extractor_bench --fixtures DIR    # captured *.html pages
+"""
+
+from __future__ import annotations
+import argparse
+import re
+import sys
+import time
+from datetime import timezone
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from pipeline.src.collect import extractor
+
+
+def baseline(html: bytes) -> tuple:
+    """The pre-extractor implementation from web_collector."""
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title") or soup.find("h1")
+    title = re.sub(r"\s+", " ", title_tag.get_text().strip() if title_tag else "")[:200]
+
+    published_at = None
+    for meta_name in extractor.DATE_META_NAMES:
+        tag = soup.find("meta", property=meta_name) or soup.find("meta", attrs={"name": meta_name})
+        if tag and tag.get("content"):
+            try:
+                from dateutil.parser import parse as parse_date
+                published_at = parse_date(tag["content"]).astimezone(timezone.utc).replace(tzinfo=timezone.utc)
+                break
+            except Exception:
+                pass
+    if published_at is None:
+        time_tag = soup.find("time", datetime=True)
+        if time_tag:
+            from dateutil.parser import parse as parse_date
+            published_at = parse_date(time_tag["datetime"]).astimezone(timezone.utc).replace(tzinfo=timezone.utc)
+
+    for tag in soup.find_all(list(extractor.BOILERPLATE_TAGS)):
+        tag.decompose()
+    content = None
+    for selector in ["article", "main", '[role="main"]', ".post-content", ".entry-content", ".article-body"]:
+        el = soup.select_one(selector)
+        if el:
+            content = re.sub(r"\s+", " ", el.get_text(separator=" ")).strip()[:extractor.MAX_CONTENT_LENGTH]
+            break
+    if content is None:
+        text = " ".join(p.get_text() for p in soup.find_all("p"))
+        content = re.sub(r"\s+", " ", text).strip()[:extractor.MAX_CONTENT_LENGTH]
+    return title, content, published_at
+
+
+def fast(html: bytes) -> tuple:
+    page = extractor._extract_local(html, None, extractor.MAX_CONTENT_LENGTH)
+    return page.title, page.content, page.published_at
+
+
+def synthetic_pages() -> dict[str, bytes]:
+    """Blog-shaped pages: heavy chrome (nav, scripts, footer) around one article."""
+    nav = "<nav>" + "".join(f'<a href="/s/{i}">Section {i}</a>' for i in range(200)) + "</nav>"
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    footer = "<footer>" + "<p>Footer link</p>" * 300 + "</footer>"
+    para = "<p>The lab released a new <b>frontier model</b> with improved <a href='#'>reasoning</a>.</p>"
+    pages = {}
+    for name, body in {
+        "article.html": f"<article><h1>Launch</h1>{para * 200}</article>",
+        "main-role.html": f"<div role='main'>{para * 200}</div>",
+        "paragraphs.html": f"<div>{para * 200}</div>",
+    }.items():
+        pages[name] = (
+            "<html><head><title>Lab News | Launch</title>"
+            "<meta property='article:published_time' content='2026-02-25T10:00:00Z'>"
+            f"{script}</head><body><header>Site</header>{nav}{body}<aside>Related</aside>{footer}</body></html>"
+        ).encode()
+    return pages
+
+
+def _time(fn, html: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, help="Directory of captured pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    pages = ({p.name: p.read_bytes() for p in sorted(args.fixtures.glob("*.html"))}
+             if args.fixtures else synthetic_pages())
+    if not pages:
+        print("No pages to benchmark", file=sys.stderr)
+        return 1
+
+    print(f"{'page':32} {'KB':>6} {'bs4':>9} {'lxml':>8} {'speedup':>8}  match")
+    total_old = total_new = 0.0
+    mismatches = 0
+    for name, html in pages.items():
+        same = baseline(html) == fast(html)
+        mismatches += not same
+        old_s = _time(baseline, html, args.repeat)
+        new_s = _time(fast, html, args.repeat)
+        total_old += old_s
+        total_new += new_s
+        print(f"{name[:32]:32} {len(html) // 1024:>6} {old_s * 1000:>7.1f}ms {new_s * 1000:>6.1f}ms "
+              f"{old_s / new_s:>7.1f}x  {'yes' if same else 'NO'}")
+    print(f"{'total':32} {'':>6} {total_old * 1000:>7.1f}ms {total_new * 1000:>6.1f}ms "
+          f"{total_old / total_new:>7.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
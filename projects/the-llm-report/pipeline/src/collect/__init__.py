@@ -1,2 +1,2 @@
 # The LLM Report — Collection Package
-from pipeline.src.collect import rss_collector, web_collector, github_collector, tagger
+from pipeline.src.collect import rss_collector, web_collector, github_collector, api_collector, discovery, tagger
@@ -0,0 +1,200 @@
+"""
+The LLM Report — Structured API Collector
+Collects `type: api` sources whose responses are structured (JSON APIs, Atom
+feeds, arXiv listing pages) as one CollectedItem per record — one model, one
+paper — instead of scraping the response as a single web page.
+
+Each source declares a `format` (a key of PARSERS) and optionally a `mapping`
+from CollectedItem fields to record fields in sources.yaml:
+
+    - name: "Hugging Face Trending Models"
+      type: api
+      format: json
+      mapping:
+        items: ""                                  # path to the record list
+        title: "{id}"
+        url: "https://huggingface.co/{id}"
+        content: "{id}: {pipeline_tag} model ({library_name}). Tags: {tags}"
+        published_at: createdAt
+
+Mapping values are templates; `{a.b}` reads a dotted path from the record,
+lists are joined with ", ". A value without braces is itself a path.
+"""
+
+from __future__ import annotations
+import json
+import re
+from typing import Any, Callable, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from pipeline.src.models import CollectedItem
+from pipeline.src.collect import extractor, http_cache, http_client, pending
+from pipeline.src.collect.feed_parser import FeedParseError, html_to_text, iter_entries, parse_date
+from pipeline.src.collect.tagger import tag_item
+
+MAX_ITEMS = 50  # records per source per run, unless the source sets max_items
+MAX_CONTENT_LENGTH = extractor.MAX_CONTENT_LENGTH
+
+_FIELD = re.compile(r"\{([^{}]+)\}")
+
+
+def _lookup(record: Any, path: str) -> Any:
+    """Read a dotted path ("a.b.0") from nested dicts/lists; None if absent."""
+    value = record
+    for part in path.split(".") if path else []:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def _render(template: str, record: dict) -> str:
+    """Fill a mapping template from a record."""
+    if "{" not in template:
+        template = "{" + template + "}"
+
+    def field(match: re.Match) -> str:
+        value = _lookup(record, match.group(1).strip())
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value)
+        return str(value)
+
+    return re.sub(r"\s+", " ", _FIELD.sub(field, template)).strip()
+
+
+# ── Parsers: response body → list of flat records ──────────────────────────
+
+def _parse_json(content: bytes, url: str, mapping: dict) -> list[dict]:
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON from {url}: {e}") from e
+    records = _lookup(data, mapping.get("items", ""))
+    if not isinstance(records, list):
+        raise ValueError(f"Mapping 'items' does not point to a list in {url}")
+    return [r for r in records if isinstance(r, dict)]
+
+
+def _parse_atom(content: bytes, url: str, mapping: dict) -> list[dict]:
+    try:
+        entries = iter_entries(content)
+        return [
+            {
+                "id": e.guid,
+                "title": e.title,
+                "link": e.link,
+                "summary": html_to_text(e.content_html),
+                "published": e.published_at.isoformat() if e.published_at else "",
+            }
+            for e in entries
+        ]
+    except FeedParseError as e:
+        raise ValueError(f"Invalid Atom feed from {url}: {e}") from e
+
+
+def _parse_arxiv_listing(content: bytes, url: str, mapping: dict) -> list[dict]:
+    """arxiv.org/list/<cat>/recent: <dt> holds the abs link, the next <dd> the metadata."""
+    import lxml.html
+
+    doc = lxml.html.fromstring(content)
+    records = []
+    for dt in doc.iter("dt"):
+        dd = dt.getnext()
+        abs_link = dt.xpath(".//a[contains(@href, '/abs/')]/@href")
+        if dd is None or dd.tag != "dd" or not abs_link:
+            continue
+
+        def text_of(cls: str) -> str:
+            el = dd.xpath(f".//div[contains(@class, '{cls}')]")
+            if not el:
+                return ""
+            text = re.sub(r"\s+", " ", el[0].text_content()).strip()
+            return re.sub(r"^(Title|Authors|Subjects):\s*", "", text)
+
+        link = urljoin(url, abs_link[0])
+        abstract = dd.xpath(".//p[contains(@class, 'mathjax')]")  # only on /new listings
+        records.append({
+            "id": link.rsplit("/", 1)[-1],
+            "title": text_of("list-title"),
+            "link": link,
+            "authors": text_of("list-authors"),
+            "subjects": text_of("list-subjects"),
+            "summary": abstract[0].text_content().strip() if abstract else "",
+        })
+    return records
+
+
+PARSERS: dict[str, Callable[[bytes, str, dict], list[dict]]] = {
+    "json": _parse_json,
+    "atom": _parse_atom,
+    "arxiv_listing": _parse_arxiv_listing,
+}
+
+# Field mappings used when a source does not override them
+DEFAULT_MAPPINGS: dict[str, dict[str, str]] = {
+    "json": {"items": "", "title": "{title}", "url": "{url}", "content": "{description}",
+             "published_at": "published_at"},
+    "atom": {"title": "{title}", "url": "{link}", "content": "{summary}", "published_at": "published"},
+    "arxiv_listing": {"title": "{title}", "url": "{link}",
+                      "content": "{title}. Authors: {authors}. Subjects: {subjects}. {summary}",
+                      "published_at": ""},
+}
+
+
+def fetch_api(
+    source_name: str,
+    url: str,
+    tier: int,
+    fmt: str,
+    mapping: Optional[dict] = None,
+    max_items: int = MAX_ITEMS,
+    max_bytes: Optional[int] = None,
+) -> list[CollectedItem]:
+    """
+    Fetch a structured API source and map each record to a CollectedItem.
+    Uses conditional GET (see http_cache) like the other collectors.
+    """
+    if fmt not in PARSERS:
+        raise ValueError(f"Unknown API format '{fmt}' for {source_name}")
+    fields = {**DEFAULT_MAPPINGS[fmt], **(mapping or {})}
+
+    headers = http_cache.conditional_headers(url)
+    try:
+        resp = http_client.get(url, headers=headers, max_bytes=max_bytes)
+    except requests.RequestException as e:
+        raise ConnectionError(f"Failed to fetch {url}: {e}") from e
+
+    if http_cache.is_unchanged(url, resp):
+        return []  # 304 or identical body — skip
+    if resp.status_code != 200:
+        raise ConnectionError(f"HTTP {resp.status_code} from {url}")
+
+    items = []
+    for record in PARSERS[fmt](resp.content, url, fields)[:max_items]:
+        title = _render(fields["title"], record)[:200]
+        link = _render(fields["url"], record)
+        if not title or not link:
+            continue
+        content = _render(fields["content"], record)[:MAX_CONTENT_LENGTH] or title
+        published = _render(fields["published_at"], record) if fields.get("published_at") else ""
+
+        tags, _ = tag_item(title, content)
+        items.append(CollectedItem(
+            source_name=source_name,
+            source_tier=tier,
+            url=link,
+            title=title,
+            raw_content=content,
+            published_at=parse_date(published) if published else None,
+            tags=tags,
+        ))
+
+    pending.defer(http_cache.remember, url, resp)  # once the items are stored
+    return items
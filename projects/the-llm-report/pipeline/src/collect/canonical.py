@@ -0,0 +1,150 @@
+"""
+The LLM Report — Canonical URLs
+The same story reaches us through several feeds and scrapes as URL variants
+(utm_* parameters, fragments, trailing slashes, feedproxy/t.co redirects).
+This module reduces them to one canonical form, backed by two KB tables:
+
+    canonical_urls — normalized URL → redirect target, resolved once
+                     (failed resolutions map to themselves)
+    seen_urls      — canonical URLs already collected, with the source that owns them
+
+Collectors call lookup() before fetching a page or building an item and skip
+URLs another source has already delivered; the orchestrator calls register()
+for every stored batch.
+
+Usage:
+    seen = canonical.lookup(entry.link for entry in entries)
+    if entry.link in seen and seen[entry.link]["source_name"] != source_name:
+        continue  # already collected from another source
+"""
+
+from __future__ import annotations
+import os
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from pipeline.src.models import CollectedItem
+from pipeline.src.collect import http_client
+from pipeline.src.collect.concurrency import current_limiter
+from pipeline.src.kb import store
+
+# Query parameters that only track the click, never select content
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "sr_share", "si", "s_cid",
+}
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_", "mtm_")
+# Link shorteners and feed proxies whose targets are resolved (once) with a GET
+REDIRECT_HOSTS = {
+    "feedproxy.google.com", "feeds.feedburner.com", "t.co", "bit.ly", "buff.ly", "ow.ly",
+    "lnkd.in", "tinyurl.com", "dlvr.it", "trib.al", "news.google.com",
+}
+RESOLVE_REDIRECTS = os.environ.get("CANONICAL_RESOLVE_REDIRECTS", "1").lower() in ("1", "true", "yes")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize(url: str) -> str:
+    """
+    Rule-based canonical form: lowercase scheme and host, no default port,
+    fragment, tracking parameters or trailing slash; remaining query sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _resolve(url: str) -> Optional[str]:
+    """Final URL after redirects; reads at most one chunk of the body."""
+    try:
+        resp = http_client.get(url, stop=lambda chunk: True)
+    except requests.RequestException:
+        return None
+    final = str(getattr(resp, "url", "") or "")
+    return final if final.startswith(("http://", "https://")) else None
+
+
+def _resolve_and_cache(url: str, normalized: str) -> str:
+    """
+    Resolve a shortener/proxy URL and cache the result. A failed resolution is
+    cached as the normalized URL itself so it is not retried on every run.
+    The GET takes a slot on the run-wide host limiter when there is one; if the
+    host is busy the URL stays unresolved (and uncached) until a later lookup.
+    """
+    limiter = current_limiter()
+    if limiter is not None and not limiter.try_acquire(url):
+        return normalized
+    try:
+        final = _resolve(url)
+    finally:
+        if limiter is not None:
+            limiter.release(url)
+    target = normalize(final) if final else normalized
+    store.save_canonical_url(normalized, target)
+    return target
+
+
+def canonical_many(urls: Iterable[str], resolve: bool = True) -> dict[str, str]:
+    """
+    {url: canonical form} for a batch of URLs: normalized, then mapped through
+    the cached redirect targets (one KB query for the whole batch). Uncached
+    shortener/proxy hosts are resolved over the network when `resolve` is set
+    (and CANONICAL_RESOLVE_REDIRECTS is on).
+    """
+    normalized = {url: normalize(url) for url in urls}
+    cached = store.get_canonical_urls(sorted(set(normalized.values())))
+    result: dict[str, str] = {}
+    for url, norm in normalized.items():
+        if norm not in cached:
+            if resolve and RESOLVE_REDIRECTS and urlsplit(norm).hostname in REDIRECT_HOSTS:
+                cached[norm] = _resolve_and_cache(url, norm)
+            else:
+                cached[norm] = norm
+        result[url] = cached[norm]
+    return result
+
+
+def canonical(url: str, resolve: bool = True) -> str:
+    """Canonical form of a single URL (see canonical_many)."""
+    return canonical_many([url], resolve=resolve)[url]
+
+
+def record_redirect(url: str, final_url) -> None:
+    """Cache a redirect observed during a normal fetch (resp.url differs from url)."""
+    final = str(final_url or "")
+    if not final.startswith(("http://", "https://")):
+        return
+    source, target = normalize(url), normalize(final)
+    if source != target:
+        store.save_canonical_url(source, target)
+
+
+def lookup(urls: Iterable[str]) -> dict[str, dict]:
+    """Return {url: seen_urls row} for the given URLs whose canonical form was already collected."""
+    by_canonical: dict[str, list[str]] = {}
+    for url, target in canonical_many(urls).items():
+        by_canonical.setdefault(target, []).append(url)
+    seen = store.get_seen_urls(list(by_canonical))
+    return {url: seen[c] for c, originals in by_canonical.items() if c in seen for url in originals}
+
+
+def register(source_name: str, items: Iterable[CollectedItem]) -> None:
+    """
+    Mark the canonical URLs of collected items as seen. Items addressed by a
+    fragment (changelog sections) are skipped: they are not the whole page.
+    """
+    items = [item for item in items if not urlsplit(item.url).fragment]
+    targets = canonical_many((item.url for item in items), resolve=False)
+    store.save_seen_urls([(targets[item.url], source_name, item.content_hash) for item in items])
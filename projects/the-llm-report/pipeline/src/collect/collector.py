@@ -1,25 +1,37 @@
 """
 The LLM Report — Main Collection Orchestrator
-Runs all sources for a given day type (standard/deep-dive/friday).
+Runs all sources for a given day type (standard/deep-dive/friday), minus the
+ones the adaptive scheduler skips this run (see scheduler).
+Sources are fetched concurrently (global cap + per-host politeness limit);
+failed fetches are retried with jittered exponential backoff off the hot path.
 Handles errors, deduplication at ingest, and KB storage.
 NLSpec Section 5.1
 """
 
 from __future__ import annotations
+import heapq
 import os
+import random
 import sys
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import yaml
 
 from pipeline.src.models import CollectedItem, RunState
-from pipeline.src.kb import store, vector_store
-from pipeline.src.collect import rss_collector, web_collector, github_collector
+from pipeline.src.kb import store
+from pipeline.src.kb.embedding_queue import EmbeddingQueue
+from pipeline.src.collect import (
+    rss_collector, web_collector, github_collector, api_collector, discovery, canonical, http_client, pending,
+    scheduler,
+)
 from pipeline.src.collect.tagger import tag_item
+from pipeline.src.collect.concurrency import HostLimiter, shared_limiter
 from orchestrator.as_built import log as aslog
 
 SOURCES_CONFIG = Path(
@@ -30,6 +42,21 @@ SOURCES_CONFIG = Path(
 )
 MAX_RETRIES = int(os.environ.get("COLLECTION_MAX_RETRIES", "3"))
 RETRY_DELAY = float(os.environ.get("COLLECTION_RETRY_DELAY", "5"))
+MAX_CONCURRENCY = int(os.environ.get("COLLECTION_CONCURRENCY", "8"))
+PER_HOST_LIMIT = int(os.environ.get("COLLECTION_PER_HOST", "2"))
+RETRY_MAX_DELAY = float(os.environ.get("COLLECTION_RETRY_MAX_DELAY", "60"))
+NEAR_DUP_DETECTION = os.environ.get("NEAR_DUP_DETECTION", "1").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class SourceAttempt:
+    """One fetch attempt against a source (kept for retry diagnostics)."""
+    attempt: int
+    started_at: datetime
+    duration_s: float
+    error: Optional[str] = None
+    retry_in_s: Optional[float] = None  # backoff scheduled after this failure
+    bytes_received: int = 0
 
 
 @dataclass
@@ -40,6 +67,20 @@ class CollectionResult:
     errors: list[str] = field(default_factory=list)
     sources_attempted: int = 0
     sources_succeeded: int = 0
+    sources_skipped: dict[str, str] = field(default_factory=dict)  # name → scheduler reason
+    attempts: dict[str, list[SourceAttempt]] = field(default_factory=dict)
+    embeddings: EmbeddingQueue = field(default_factory=EmbeddingQueue)
+
+    def wait_for_embeddings(self) -> dict[str, str]:
+        """
+        Block until every new item is in the vector store.
+        Call before any stage that reads vectors (triage, dedup).
+        Returns {item_id: error} for items that could not be embedded.
+        """
+        failures = self.embeddings.drain()
+        for item_id, error in failures.items():
+            aslog(f"Embedding failed for {item_id}", detail=error, level="WARNING", run_id=self.run_id)
+        return failures
 
 
 def _load_sources(run_type: str = "standard") -> list[dict]:
@@ -66,26 +107,207 @@ def _fetch_source(source: dict) -> list[CollectedItem]:
     tier = source["tier"]
     source_type = source.get("type", "web")
 
+    max_bytes = source.get("max_bytes")  # per-source download cap; None = COLLECTION_MAX_BYTES
+
     if source_type == "rss":
-        return rss_collector.fetch_rss(name, url, tier)
+        return rss_collector.fetch_rss(name, url, tier, max_bytes=max_bytes)
     elif source_type == "github":
         return github_collector.fetch_github(name, url, tier)
     elif source_type == "api":
-        # For now, treat API sources like web scraping
-        return web_collector.fetch_page(name, url, tier)
+        if "format" in source:
+            return api_collector.fetch_api(
+                name, url, tier, source["format"],
+                mapping=source.get("mapping"),
+                max_items=source.get("max_items", api_collector.MAX_ITEMS),
+                max_bytes=max_bytes,
+            )
+        # No declared format: treat the API response like a web page
+        return web_collector.fetch_page(name, url, tier, selectors=source.get("selectors"), max_bytes=max_bytes)
     elif source_type == "web":
+        if source.get("discover"):
+            # Index page: fetch each new/changed article instead of the listing
+            return discovery.discover_articles(
+                name, url, tier, source["discover"],
+                sitemap_url=source.get("sitemap_url"),
+                article_pattern=source.get("article_pattern"),
+                max_articles=source.get("max_articles", discovery.MAX_ARTICLES),
+                selectors=source.get("selectors"),
+                max_bytes=max_bytes,
+            )
         # Check if it looks like a changelog URL
         if any(kw in url.lower() for kw in ["changelog", "models", "release"]):
-            return web_collector.fetch_changelog_entries(name, url, tier)
-        return web_collector.fetch_page(name, url, tier)
+            return web_collector.fetch_changelog_entries(name, url, tier, max_bytes=max_bytes)
+        return web_collector.fetch_page(name, url, tier, selectors=source.get("selectors"), max_bytes=max_bytes)
     else:
         raise ValueError(f"Unknown source type: {source_type}")
 
 
+def _backoff_delay(attempt: int) -> float:
+    """Jittered exponential backoff before retry number `attempt` (1-based)."""
+    base = min(RETRY_DELAY * (2 ** (attempt - 1)), RETRY_MAX_DELAY)
+    return base / 2 + random.uniform(0, base / 2)
+
+
+def _fetch_once(
+    source: dict,
+    limiter: Optional[HostLimiter] = None,
+) -> tuple[list[CollectedItem], Optional[Exception], list, datetime, float, int]:
+    """
+    Run a single fetch attempt.
+    Returns (items, error, writes, started_at, duration_s, bytes_received);
+    `writes` is the collector state to persist once the items are stored (see pending).
+    Collectors that fan out (discovery) share `limiter`, which already holds
+    a slot for the source's host.
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    received = http_client.bytes_received()
+    with pending.capture() as writes, shared_limiter(limiter):
+        try:
+            items = _fetch_source(source)
+            error = None
+        except Exception as e:
+            items, error = [], e
+    return items, error, writes, started_at, time.monotonic() - start, http_client.bytes_received() - received
+
+
+def _fetch_concurrently(
+    sources: list[dict],
+    history: dict[str, list[SourceAttempt]],
+) -> Iterator[tuple[int, list[CollectedItem], Optional[Exception], list]]:
+    """
+    Fetch sources in parallel, yielding (index, items, error, writes) once each
+    source has succeeded or used up MAX_RETRIES attempts.
+    At most MAX_CONCURRENCY fetches run at once and at most PER_HOST_LIMIT
+    against any one host; sources waiting on a busy host do not block
+    sources on other hosts. Failed attempts are requeued with jittered
+    exponential backoff instead of sleeping, so healthy sources keep flowing.
+    Every attempt is appended to `history` under the source name.
+    """
+    cap = max(1, MAX_CONCURRENCY)
+    limiter = HostLimiter(PER_HOST_LIMIT)
+    queued = deque(range(len(sources)))
+    in_flight: dict[Future, int] = {}
+    retries: list[tuple[float, int]] = []  # heap of (due monotonic time, index)
+    attempts = [0] * len(sources)
+
+    with ThreadPoolExecutor(max_workers=cap) as pool:
+        while queued or in_flight or retries:
+            while retries and retries[0][0] <= time.monotonic():
+                queued.append(heapq.heappop(retries)[1])
+
+            # Submit every queued source whose host has a free slot, in config order
+            for index in list(queued):
+                if len(in_flight) >= cap:
+                    break
+                if limiter.try_acquire(sources[index]["url"]):
+                    queued.remove(index)
+                    in_flight[pool.submit(_fetch_once, sources[index], limiter)] = index
+
+            timeout = max(0.0, retries[0][0] - time.monotonic()) if retries else None
+            if not in_flight:
+                # Only backed-off retries remain — wait for the next one to come due
+                time.sleep(timeout or 0)
+                continue
+
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                source = sources[index]
+                limiter.release(source["url"])
+                items, error, writes, started_at, duration, received = future.result()
+                attempts[index] += 1
+
+                record = SourceAttempt(
+                    attempt=attempts[index],
+                    started_at=started_at,
+                    duration_s=duration,
+                    error=f"{type(error).__name__}: {error}" if error else None,
+                    bytes_received=received,
+                )
+                history.setdefault(source["name"], []).append(record)
+
+                if error and attempts[index] < MAX_RETRIES:
+                    record.retry_in_s = _backoff_delay(attempts[index])
+                    heapq.heappush(retries, (time.monotonic() + record.retry_in_s, index))
+                    continue
+                yield index, items, error, writes
+
+
+def _ingest_source(
+    result: CollectionResult,
+    source: dict,
+    items: list[CollectedItem],
+    error: Optional[Exception],
+    run_state: RunState,
+    embedder: EmbeddingQueue,
+    writes: Optional[list] = None,
+) -> None:
+    """
+    Account for one fetched source, store its new items and log its yield.
+    The source's deferred state (`writes`: validators, watermarks, cursors)
+    is persisted only after its items are stored.
+    """
+    result.sources_attempted += 1
+    name = source["name"]
+    history = result.attempts.get(name, [])
+
+    def record_stats(items_new: int) -> None:
+        store.record_source_stats(
+            run_state.run_id, name,
+            items_fetched=len(items),
+            items_new=items_new,
+            bytes_received=sum(a.bytes_received for a in history),
+            latency_s=sum(a.duration_s for a in history),
+            attempts=len(history) or 1,
+            error=str(error) if error else None,
+            http_status=scheduler.http_status(str(error)) if error else None,
+        )
+
+    if error:
+        error_msg = f"{name}: {type(error).__name__}: {error}"
+        result.errors.append(error_msg)
+        attempts = len(history) or MAX_RETRIES
+        aslog(f"Collection error (after {attempts} attempts)", detail=error_msg, level="WARNING", run_id=run_state.run_id)
+        record_stats(0)
+        return
+
+    result.sources_succeeded += 1
+
+    # Ingest the whole batch: one dedup query + one insert transaction.
+    # Near-duplicates are linked to their original and never embedded or triaged.
+    new_items = store.ingest_items(items, near_duplicates=NEAR_DUP_DETECTION)
+    pending.commit(writes or [])
+    result.items_skipped += len(items) - len(new_items)
+    # Other sources skip these URLs (and their tracking/redirect variants) from now on
+    canonical.register(name, items)
+    record_stats(len(new_items))
+
+    # Hand new items to the background embedder and keep collecting
+    embedder.submit([
+        {
+            "item_id": item.id,
+            "title": item.title,
+            "content": item.raw_content,
+            "metadata": {
+                "source_name": item.source_name,
+                "source_tier": item.source_tier,
+                "url": item.url,
+                "tags": ",".join(item.tags),
+            },
+        }
+        for item in new_items
+    ])
+    result.items_new.extend(new_items)
+
+
 def run_collection(run_state: RunState, run_type: str = "standard") -> CollectionResult:
     """
     Main collection entry point.
-    Fetches all sources, deduplicates at ingest, stores to KB.
+    Fetches all sources concurrently, then deduplicates and stores to KB
+    in source-config order (so results are identical to a sequential run).
+    New items are embedded on a background worker; call
+    result.wait_for_embeddings() before any stage that needs the vectors.
 
     Args:
         run_state: Current run state (for logging)
@@ -95,64 +317,40 @@ def run_collection(run_state: RunState, run_type: str = "standard") -> Collectio
         CollectionResult with new items and error summary.
     """
     result = CollectionResult(run_id=run_state.run_id)
-    sources = _load_sources(run_type)
+    sources = []
+    for decision in scheduler.plan(_load_sources(run_type)):
+        if decision.poll:
+            sources.append(decision.source)
+        else:
+            result.sources_skipped[decision.source["name"]] = decision.reason
     aslog(
-        f"Collection started: {len(sources)} sources ({run_type})",
+        f"Collection started: {len(sources)} sources ({run_type}), {len(result.sources_skipped)} skipped",
+        detail="; ".join(f"{name}: {reason}" for name, reason in result.sources_skipped.items()),
         run_id=run_state.run_id,
     )
 
-    for source in sources:
-        result.sources_attempted += 1
-        name = source["name"]
-        items = []
-        last_error = None
-
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                items = _fetch_source(source)
-                last_error = None
-                break
-            except Exception as e:
-                last_error = e
-                if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY * attempt)
-
-        if last_error:
-            error_msg = f"{name}: {type(last_error).__name__}: {last_error}"
-            result.errors.append(error_msg)
-            aslog(f"Collection error (after {MAX_RETRIES} attempts)", detail=error_msg, level="WARNING", run_id=run_state.run_id)
-            continue
-
-        result.sources_succeeded += 1
-
-        # Ingest each item: dedup check → store
-        for item in items:
-            if store.item_exists(item.content_hash):
-                result.items_skipped += 1
-                continue
+    # One batched GraphQL query for every GitHub source instead of O(repos) REST calls
+    github_sources = [s for s in sources if s.get("type") == "github"]
+    if github_sources and github_collector.graphql_enabled():
+        try:
+            github_collector.prefetch_releases(github_sources)
+        except Exception as e:
+            aslog("GitHub GraphQL prefetch failed, using REST", detail=str(e), level="WARNING", run_id=run_state.run_id)
 
-            # Store in structured DB
-            inserted = store.store_item(item)
-            if inserted:
-                # Embed in vector store
-                try:
-                    vector_store.embed_item(
-                        item_id=item.id,
-                        title=item.title,
-                        content=item.raw_content,
-                        metadata={
-                            "source_name": item.source_name,
-                            "source_tier": item.source_tier,
-                            "url": item.url,
-                            "tags": ",".join(item.tags),
-                        },
-                    )
-                except Exception as e:
-                    aslog(f"Embedding failed for {item.id}", detail=str(e), level="WARNING")
-
-                result.items_new.append(item)
-            else:
-                result.items_skipped += 1
+    # Ingest the completed prefix as soon as it is available, so storing
+    # overlaps with the remaining network fetches without reordering.
+    fetched: dict[int, tuple[list[CollectedItem], Optional[Exception], list]] = {}
+    next_index = 0
+    try:
+        for index, items, error, writes in _fetch_concurrently(sources, result.attempts):
+            fetched[index] = (items, error, writes)
+            while next_index in fetched:
+                items, error, writes = fetched.pop(next_index)
+                _ingest_source(result, sources[next_index], items, error, run_state, result.embeddings, writes)
+                next_index += 1
+    finally:
+        # Unconsumed prefetched releases must not leak into a later run
+        github_collector.clear_prefetch()
 
     run_state.items_collected = len(result.items_new)
     aslog(
@@ -0,0 +1,85 @@
+"""
+The LLM Report — Collection Concurrency Helpers
+Per-host politeness accounting shared by the collection engine and any
+collector that fans out to several URLs on the same site.
+
+run_collection makes its limiter the current_limiter() of each fetch, so a
+collector's fan-out counts against the same per-host caps as every other
+source of the run instead of a private limiter of its own.
+"""
+
+from __future__ import annotations
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+
+_local = threading.local()  # fetches run on collector worker threads
+
+
+def host_of(url: str) -> str:
+    """Return the lowercased host of a URL ("" if it has none)."""
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostLimiter:
+    """
+    Tracks in-flight requests per host and caps them at `per_host`.
+    `try_acquire` is non-blocking (for dispatchers that pick other work);
+    `slot` blocks until a slot frees up (for plain worker pools).
+    """
+
+    def __init__(self, per_host: int):
+        self.per_host = max(1, per_host)
+        self._active: Counter[str] = Counter()
+        self._cond = threading.Condition()
+
+    def try_acquire(self, url: str) -> bool:
+        host = host_of(url)
+        with self._cond:
+            if self._active[host] >= self.per_host:
+                return False
+            self._active[host] += 1
+            return True
+
+    def release(self, url: str) -> None:
+        host = host_of(url)
+        with self._cond:
+            self._active[host] -= 1
+            if self._active[host] <= 0:
+                del self._active[host]
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = host_of(url)
+        with self._cond:
+            while self._active[host] >= self.per_host:
+                self._cond.wait()
+            self._active[host] += 1
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    def active(self, url: str) -> int:
+        with self._cond:
+            return self._active[host_of(url)]
+
+
+@contextmanager
+def shared_limiter(limiter: Optional[HostLimiter]) -> Iterator[None]:
+    """Make `limiter` this thread's current_limiter() inside the block."""
+    previous = getattr(_local, "limiter", None)
+    _local.limiter = limiter
+    try:
+        yield
+    finally:
+        _local.limiter = previous
+
+
+def current_limiter() -> Optional[HostLimiter]:
+    """The run-wide limiter of the fetch running on this thread, if any."""
+    return getattr(_local, "limiter", None)
@@ -0,0 +1,294 @@
+"""
+The LLM Report — Article Discovery for Web Sources
+Turns a blog/news index into one item per article. Reads the site's sitemap
+(`discover: sitemap`) or the index page's links (`discover: links`), keeps
+article URLs under the index path (or matching `article_pattern`), and uses
+sitemap <lastmod> plus the KB's discovered_pages table to pick only pages
+that are new or changed since the last run, minus pages whose canonical URL
+another source already delivered (see canonical). Those are fetched
+concurrently with per-host limits; unchanged articles are never downloaded.
+
+    - name: "Mistral AI News"
+      type: web
+      url: "https://mistral.ai/news/"
+      discover: sitemap          # or: links
+      sitemap_url: "https://mistral.ai/sitemap.xml"   # default: <origin>/sitemap.xml
+      article_pattern: "/news/[^/]+/?$"               # default: under the url path
+      max_articles: 10
+      selectors: {content: "div.article-body"}        # optional, see extractor
+"""
+
+from __future__ import annotations
+import gzip
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from typing import Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+
+from pipeline.src.models import CollectedItem
+from pipeline.src.collect import canonical, http_cache, http_client, pending, web_collector
+from pipeline.src.collect.concurrency import HostLimiter, current_limiter
+from pipeline.src.collect.feed_parser import parse_date
+from pipeline.src.kb import store
+
+MAX_ARTICLES = 10  # article pages fetched per source per run
+MAX_AGE_DAYS = int(os.environ.get("DISCOVERY_MAX_AGE_DAYS", "14"))  # ignore older lastmods
+WORKERS = int(os.environ.get("DISCOVERY_WORKERS", "4"))
+PER_HOST = int(os.environ.get("COLLECTION_PER_HOST", "2"))  # standalone calls; run_collection shares its limiter
+SLOT_POLL_S = 0.05  # how often queued articles re-check for a free host slot
+MAX_CHILD_SITEMAPS = 5  # sitemap index entries followed per run
+
+
+@dataclass
+class Candidate:
+    url: str
+    lastmod: Optional[datetime] = None
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _get(url: str):
+    """GET a discovery document. Returns None when unchanged since last run."""
+    headers = http_cache.conditional_headers(url)
+    try:
+        resp = http_client.get(url, headers=headers)
+    except requests.RequestException as e:
+        raise ConnectionError(f"Failed to fetch {url}: {e}") from e
+    if http_cache.is_unchanged(url, resp):
+        return None
+    if resp.status_code != 200:
+        raise ConnectionError(f"HTTP {resp.status_code} from {url}")
+    return resp
+
+
+def parse_sitemap(content: bytes, partial: bool = False) -> tuple[list[Candidate], list[Candidate]]:
+    """
+    Parse a sitemap (optionally gzipped) with iterparse.
+    Returns (page candidates, child sitemaps from a sitemap index).
+    With partial=True (body cut off at the byte cap) the entries parsed
+    before the cut are returned instead of raising.
+    """
+    pages: list[Candidate] = []
+    children: list[Candidate] = []
+    loc = lastmod = None
+    try:
+        if content[:2] == b"\x1f\x8b":
+            content = gzip.decompress(content)
+        for _, elem in ET.iterparse(BytesIO(content)):
+            name = _local(elem.tag)
+            if name == "loc":
+                loc = (elem.text or "").strip()
+            elif name == "lastmod":
+                lastmod = parse_date(elem.text or "")
+            elif name in ("url", "sitemap"):
+                if loc:
+                    (pages if name == "url" else children).append(Candidate(loc, lastmod))
+                loc = lastmod = None
+                elem.clear()
+    except (ET.ParseError, EOFError):
+        if not (partial and (pages or children)):
+            raise
+    return pages, children
+
+
+def parse_links(content: bytes, base_url: str) -> list[Candidate]:
+    """All <a href> targets on an index page, absolutised and de-fragmented."""
+    import lxml.html
+
+    doc = lxml.html.fromstring(content)
+    seen: dict[str, Candidate] = {}
+    for href in doc.xpath("//a/@href"):
+        url = urldefrag(urljoin(base_url, href.strip()))[0]
+        if url.startswith(("http://", "https://")) and url not in seen:
+            seen[url] = Candidate(url)
+    return list(seen.values())
+
+
+def _is_article(url: str, index_url: str, pattern: Optional[re.Pattern]) -> bool:
+    if pattern is not None:
+        return bool(pattern.search(url))
+    page, index = urlparse(url), urlparse(index_url)
+    if page.hostname != index.hostname:
+        return False
+    prefix = index.path if index.path.endswith("/") else index.path + "/"
+    return page.path.startswith(prefix) and page.path.rstrip("/") != index.path.rstrip("/")
+
+
+def _sitemap_candidates(
+    index_url: str, sitemap_url: Optional[str], fetched: list[tuple[str, object]]
+) -> Optional[list[Candidate]]:
+    """Candidates from the sitemap, or None if the sitemap is unchanged since last run."""
+    origin = "{0.scheme}://{0.netloc}".format(urlparse(index_url))
+    sitemap_url = sitemap_url or f"{origin}/sitemap.xml"
+    resp = _get(sitemap_url)
+    if resp is None:
+        return None
+    pages, children = parse_sitemap(resp.content, partial=getattr(resp, "truncated", False) is True)
+    fetched.append((sitemap_url, resp))
+
+    # Sitemap index: follow the most recently modified child sitemaps
+    children.sort(key=lambda c: c.lastmod or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+    for child in children[:MAX_CHILD_SITEMAPS]:
+        child_resp = _get(child.url)
+        if child_resp is not None:
+            truncated = getattr(child_resp, "truncated", False) is True
+            pages.extend(parse_sitemap(child_resp.content, partial=truncated)[0])
+            fetched.append((child.url, child_resp))
+    return pages
+
+
+def _changed(candidates: list[Candidate], known: dict[str, Optional[str]]) -> list[Candidate]:
+    """Keep pages never fetched, or whose lastmod moved past the one recorded."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=MAX_AGE_DAYS)
+    changed = []
+    for c in candidates:
+        if c.lastmod and c.lastmod < cutoff:
+            continue
+        if c.url not in known:
+            changed.append(c)
+            continue
+        recorded = parse_date(known[c.url] or "")
+        if c.lastmod and (recorded is None or c.lastmod > recorded):
+            changed.append(c)
+    # Newest first; pages without lastmod keep their listing order after dated ones
+    changed.sort(key=lambda c: c.lastmod or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+    return changed
+
+
+def _collected_elsewhere(candidates: list[Candidate]) -> list[Candidate]:
+    """
+    Candidates whose canonical URL is already in the KB (e.g. delivered by a
+    feed, or linked with tracking parameters) and unchanged since it was collected.
+    """
+    seen = canonical.lookup(c.url for c in candidates)
+    skipped = []
+    for c in candidates:
+        row = seen.get(c.url)
+        if row is None:
+            continue
+        collected_at = parse_date(row["last_seen_at"])
+        if c.lastmod is None or (collected_at and c.lastmod <= collected_at):
+            skipped.append(c)
+    return skipped
+
+
+def discover_articles(
+    source_name: str,
+    url: str,
+    tier: int,
+    mode: str = "sitemap",
+    sitemap_url: Optional[str] = None,
+    article_pattern: Optional[str] = None,
+    max_articles: int = MAX_ARTICLES,
+    selectors: Optional[dict] = None,
+    max_bytes: Optional[int] = None,
+    limiter: Optional[HostLimiter] = None,
+) -> list[CollectedItem]:
+    """
+    Fetch the new/changed article pages of an index and return one item per article.
+    mode "sitemap" falls back to "links" when the site has no usable sitemap.
+    Article fetches count against `limiter` (default: the run's shared
+    limiter, see concurrency.current_limiter).
+    """
+    if mode not in ("sitemap", "links"):
+        raise ValueError(f"Unknown discovery mode '{mode}' for {source_name}")
+    pattern = re.compile(article_pattern) if article_pattern else None
+    # Discovery documents are only marked as seen once all their changed
+    # articles are in, so a failed or capped run re-discovers the rest next time
+    fetched: list[tuple[str, object]] = []
+
+    candidates: Optional[list[Candidate]] = None
+    if mode == "sitemap":
+        try:
+            candidates = _sitemap_candidates(url, sitemap_url, fetched)
+            if candidates is None:
+                return []  # sitemap unchanged since last run: no article changed
+        except (ConnectionError, ET.ParseError, EOFError):
+            candidates = None
+    if candidates is None:
+        resp = _get(url)
+        if resp is None:
+            return []  # index page unchanged
+        candidates = parse_links(resp.content, url)
+        fetched.append((url, resp))
+
+    articles = [c for c in candidates if _is_article(c.url, url, pattern)]
+    changed = _changed(articles, store.get_discovered_pages(url))
+    for c in _collected_elsewhere(changed):
+        # Recorded as fetched so later runs only revisit it when its lastmod moves
+        store.save_discovered_page(url, c.url, c.lastmod.isoformat() if c.lastmod else None)
+        changed.remove(c)
+    todo = changed[:max_articles]
+    if not todo:
+        for doc_url, resp in fetched:
+            pending.defer(http_cache.remember, doc_url, resp)
+        return []
+
+    # The run's shared limiter already holds a slot for this source, so one
+    # article fetch can always ride on it; more run only while their host has
+    # a free slot. Standalone calls get a private limiter.
+    shared = limiter or current_limiter()
+    limiter = shared or HostLimiter(PER_HOST)
+
+    def fetch(candidate: Candidate) -> tuple[list[CollectedItem], list]:
+        # Runs on a discovery worker thread: capture its deferred writes here
+        # and hand them to the caller's capture below
+        with pending.capture() as writes:
+            items = web_collector.fetch_page(source_name, candidate.url, tier, selectors, max_bytes)
+            lastmod = candidate.lastmod.isoformat() if candidate.lastmod else None
+            pending.defer(store.save_discovered_page, url, candidate.url, lastmod)
+        return items, writes
+
+    workers = max(1, min(WORKERS, len(todo)))
+    queued = deque(range(len(todo)))
+    in_flight: dict[Future, tuple[int, bool]] = {}  # future -> (index, holds a limiter slot)
+    results: dict[int, tuple[list[CollectedItem], list]] = {}
+    errors: list[Exception] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while queued or in_flight:
+            for index in list(queued):
+                if len(in_flight) >= workers:
+                    break
+                candidate_url = todo[index].url
+                if limiter.try_acquire(candidate_url):
+                    acquired = True
+                elif shared is not None and not in_flight:
+                    acquired = False  # on the slot the collector holds for this source
+                else:
+                    continue
+                queued.remove(index)
+                in_flight[pool.submit(fetch, todo[index])] = (index, acquired)
+
+            # Slots also free up as other sources finish: poll while ours run
+            done, _ = wait(in_flight, timeout=SLOT_POLL_S if queued else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, acquired = in_flight.pop(future)
+                if acquired:
+                    limiter.release(todo[index].url)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors.append(e)
+
+    items: list[CollectedItem] = []
+    for index in sorted(results):  # candidate order keeps results deterministic
+        article_items, writes = results[index]
+        items.extend(article_items)
+        pending.defer(pending.commit, writes)
+
+    if errors and len(errors) == len(todo):
+        raise ConnectionError(f"All {len(todo)} article fetches failed for {url}: {errors[0]}")
+    if not errors and len(changed) <= max_articles:  # leftovers are picked up next run
+        for doc_url, resp in fetched:
+            pending.defer(http_cache.remember, doc_url, resp)
+    return items
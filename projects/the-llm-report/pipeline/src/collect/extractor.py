@@ -0,0 +1,266 @@
+"""
+The LLM Report — Main-Content Extractor
+Single lxml parse per page that yields title, publish date and main text
+together, replacing the BeautifulSoup tree walk in web_collector.
+
+Per-source CSS selector overrides come from sources.yaml:
+
+    selectors:
+      content: "div.post-body"     # main text block
+      title: "h1.headline"
+      date: "time.published"       # datetime/content attribute or text
+
+Selectors are tried first and fall back to the built-in heuristics when they
+match nothing. CSS needs the cssselect package; without it overrides are
+evaluated with BeautifulSoup's select_one on the same page.
+
+Pages larger than EXTRACTOR_POOL_MIN_BYTES are parsed in a worker process
+(EXTRACTOR_PROCESSES, 0 disables) so one huge page cannot stall the
+collection threads on the GIL.
+
+ContentWatcher parses a page incrementally while it downloads and tells the
+HTTP client to stop once the main <article> is complete (or already holds
+more text than will be kept) and its publish date has been seen.
+"""
+
+from __future__ import annotations
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+MAX_CONTENT_LENGTH = 5000  # chars — truncate very long pages
+POOL_MIN_BYTES = int(os.environ.get("EXTRACTOR_POOL_MIN_BYTES", str(512 * 1024)))
+PROCESSES = int(os.environ.get("EXTRACTOR_PROCESSES", "2"))
+
+BOILERPLATE_TAGS = ("nav", "footer", "aside", "script", "style", "header")
+DATE_META_NAMES = (
+    "article:published_time", "og:article:published_time",
+    "datePublished", "DC.date", "pubdate",
+)
+# Main-content containers, in priority order
+_CONTAINERS = [
+    etree.XPath(xp) for xp in (
+        "(//article)[1]",
+        "(//main)[1]",
+        "(//*[@role='main'])[1]",
+        "(//*[contains(concat(' ', normalize-space(@class), ' '), ' post-content ')])[1]",
+        "(//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')])[1]",
+        "(//*[contains(concat(' ', normalize-space(@class), ' '), ' article-body ')])[1]",
+    )
+]
+_WS = re.compile(r"\s+")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class Extracted:
+    title: str
+    content: str
+    published_at: Optional[datetime]
+
+
+def _text(el) -> str:
+    return _WS.sub(" ", " ".join(el.itertext())).strip()
+
+
+def _parse_dt(value: str) -> Optional[datetime]:
+    try:
+        from dateutil.parser import parse as parse_date
+        return parse_date(value).astimezone(timezone.utc).replace(tzinfo=timezone.utc)
+    except Exception:
+        return None
+
+
+def _select_with_bs4(html: bytes, selector: str) -> Optional[str]:
+    from bs4 import BeautifulSoup
+    el = BeautifulSoup(html, "html.parser").select_one(selector)
+    return _WS.sub(" ", el.get_text(separator=" ")).strip() if el else None
+
+
+def _override(doc, html: bytes, selector: Optional[str], attrs: tuple[str, ...] = ()) -> Optional[str]:
+    """Text (or first present attribute) of the override selector's first match."""
+    if not selector:
+        return None
+    try:
+        from lxml.cssselect import CSSSelector
+    except ImportError:
+        return _select_with_bs4(html, selector)
+    found = CSSSelector(selector)(doc)
+    if not found:
+        return None
+    for attr in attrs:
+        if found[0].get(attr):
+            return found[0].get(attr)
+    return _text(found[0])
+
+
+def _extract_date(doc) -> Optional[datetime]:
+    meta: dict[str, str] = {}
+    for tag in doc.iter("meta"):
+        content = tag.get("content")
+        if not content:
+            continue
+        for key in (tag.get("property"), tag.get("name")):
+            if key and key not in meta:
+                meta[key] = content
+    for name in DATE_META_NAMES:
+        if name in meta:
+            parsed = _parse_dt(meta[name])
+            if parsed:
+                return parsed
+    for time_tag in doc.iter("time"):
+        if time_tag.get("datetime"):
+            return _parse_dt(time_tag.get("datetime"))
+    return None
+
+
+def _extract_local(html: bytes, selectors: Optional[dict], max_chars: int) -> Extracted:
+    selectors = selectors or {}
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return Extracted(title="", content="", published_at=None)
+
+    title_override = _override(doc, html, selectors.get("title"))
+    if title_override:
+        title = title_override
+    else:
+        title_el = doc.find(".//title")
+        if title_el is None:
+            title_el = doc.find(".//h1")
+        title = _WS.sub(" ", title_el.text_content()).strip() if title_el is not None else ""
+
+    date_override = _override(doc, html, selectors.get("date"), ("datetime", "content"))
+    published_at = (_parse_dt(date_override) if date_override else None) or _extract_date(doc)
+
+    content = _override(doc, html, selectors.get("content")) or ""
+    if not content:
+        etree.strip_elements(doc, etree.Comment, *BOILERPLATE_TAGS, with_tail=False)
+        for probe in _CONTAINERS:
+            found = probe(doc)
+            if found:
+                content = _text(found[0])
+                break
+        else:
+            # Fallback: all paragraph text
+            content = _WS.sub(" ", " ".join(p.text_content() for p in doc.iter("p"))).strip()
+
+    return Extracted(title=title[:200], content=content[:max_chars], published_at=published_at)
+
+
+class _WatchTarget:
+    """lxml parser target for ContentWatcher: counts text, no tree is built."""
+
+    def __init__(self) -> None:
+        self.depth = 0  # open <article> elements of the first outermost one
+        self.closed = False
+        self.chars = 0  # whitespace-collapsed text inside it so far
+        self.dated = False  # a publish date extract() would find has been seen
+
+    def start(self, tag, attrib) -> None:
+        if tag == "article" and not self.closed:
+            self.depth += 1
+        elif tag == "time" and attrib.get("datetime"):
+            self.dated = True
+        elif tag == "meta" and attrib.get("content") and (
+            attrib.get("property") in DATE_META_NAMES or attrib.get("name") in DATE_META_NAMES
+        ):
+            self.dated = True
+
+    def end(self, tag) -> None:
+        if tag == "article" and self.depth:
+            self.depth -= 1
+            self.closed = self.depth == 0
+
+    def data(self, data: str) -> None:
+        if self.depth:
+            self.chars += len(_WS.sub(" ", data))
+
+    def close(self) -> None:
+        return None
+
+
+class ContentWatcher:
+    """
+    Download stop condition for http_client.get(stop=...): feeds chunks to an
+    incremental lxml parser and reports True once the first top-level
+    <article> has closed or has more than `max_chars` of text, so the rest of
+    the page can be skipped without changing what extract() returns.
+    Text is counted from the parser's data events as it arrives, so each
+    chunk costs time proportional to its own size. Dates often follow the
+    article body (bylines, footers): unless a <time datetime> or date meta tag
+    was already seen, reading goes on for up to DATE_SLACK_BYTES to find one.
+    """
+
+    DATE_SLACK_BYTES = 16 * 1024
+
+    def __init__(self, max_chars: int = MAX_CONTENT_LENGTH):
+        self.max_chars = max_chars
+        self.done = False
+        self._target = _WatchTarget()
+        self._parser = etree.HTMLParser(target=self._target)
+        self._slack: Optional[int] = None  # bytes left to look for a date once the content is complete
+
+    def __call__(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+        try:
+            self._parser.feed(chunk)
+        except etree.LxmlError:
+            return False  # keep downloading; extract() handles the full page
+        target = self._target
+        if self._slack is None:
+            # Text beyond max_chars is truncated anyway (+ slack for whitespace collapsing)
+            if target.closed or target.chars > 2 * self.max_chars:
+                self._slack = self.DATE_SLACK_BYTES
+        else:
+            self._slack -= len(chunk)
+        self.done = self._slack is not None and (target.dated or self._slack <= 0)
+        return self.done
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            # spawn: forking a process that runs collection threads is unsafe
+            _pool = ProcessPoolExecutor(PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def extract(
+    html: bytes,
+    selectors: Optional[dict] = None,
+    max_chars: int = MAX_CONTENT_LENGTH,
+) -> Extracted:
+    """Extract title, main text and publish date from a page in one parse."""
+    if len(html) >= POOL_MIN_BYTES:
+        pool = _get_pool()
+        if pool is not None:
+            try:
+                return pool.submit(_extract_local, html, selectors, max_chars).result()
+            except BrokenProcessPool:
+                shutdown()  # a worker died; parse this page in-process
+    return _extract_local(html, selectors, max_chars)
+
+
+def shutdown() -> None:
+    """Stop the worker processes (end of run / tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
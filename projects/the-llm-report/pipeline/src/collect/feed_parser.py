@@ -0,0 +1,189 @@
+"""
+The LLM Report — Fast Feed Parser
+Streaming RSS 2.0 / RSS 1.0 (RDF) / Atom parser built on ElementTree iterparse.
+Extracts title, link, guid, dates and content per entry, and strips HTML with
+a lightweight tokenizer instead of building a BeautifulSoup tree.
+Raises FeedParseError on malformed or unrecognised input so callers can fall
+back to feedparser.
+"""
+
+from __future__ import annotations
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import Iterator, Optional
+
+FEED_ROOTS = {"rss", "feed", "RDF"}
+ENTRY_TAGS = {"item", "entry"}
+# Content fields in feedparser's order of preference: full content, then summary
+CONTENT_FIELDS = ("encoded", "content", "summary", "description")
+DATE_FIELDS = ("pubDate", "published", "issued", "date", "updated", "modified", "created")
+
+
+class FeedParseError(ValueError):
+    """The fast parser cannot handle this document; use feedparser instead."""
+
+
+@dataclass
+class FeedEntry:
+    title: str
+    link: str
+    guid: str
+    published_at: Optional[datetime]
+    content_html: str  # best available content field, still HTML
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text nodes, skipping script/style, like BeautifulSoup.get_text()."""
+
+    _SKIP = {"script", "style", "template"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+_WS = re.compile(r"\s+")
+
+
+def html_to_text(html: str) -> str:
+    """Strip HTML tags and collapse whitespace."""
+    if "<" not in html and "&" not in html:
+        return _WS.sub(" ", html).strip()
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return _WS.sub(" ", " ".join(parser.parts)).strip()
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) timestamp into aware UTC."""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            try:
+                from dateutil.parser import parse as parse_dt
+                dt = parse_dt(value)
+            except Exception:
+                return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _inner_xml(elem: ET.Element) -> str:
+    """Text of an element including serialized children (Atom type="xhtml")."""
+    if len(elem) == 0:
+        return elem.text or ""
+    parts = [elem.text or ""]
+    for child in elem:
+        parts.append(ET.tostring(child, encoding="unicode"))
+    return "".join(parts)
+
+
+def _atom_link(elem: ET.Element) -> str:
+    fallback = ""
+    for child in elem:
+        if _local(child.tag) != "link":
+            continue
+        href = child.get("href")
+        if href is None:
+            return (child.text or "").strip()  # RSS-style <link>text</link>
+        rel = child.get("rel", "alternate")
+        if rel == "alternate":
+            return href.strip()
+        fallback = fallback or href.strip()
+    return fallback
+
+
+def _entry_from_element(elem: ET.Element) -> FeedEntry:
+    fields: dict[str, ET.Element] = {}
+    for child in elem:
+        fields.setdefault(_local(child.tag), child)
+
+    title_el = fields.get("title")
+    title = _inner_xml(title_el).strip() if title_el is not None else ""
+
+    guid_el = fields.get("guid") if "guid" in fields else fields.get("id")
+    guid = (guid_el.text or "").strip() if guid_el is not None else ""
+
+    content_html = ""
+    for name in CONTENT_FIELDS:
+        el = fields.get(name)
+        if el is not None:
+            text = _inner_xml(el)
+            if text.strip():
+                content_html = text
+                break
+
+    published_at = None
+    for name in DATE_FIELDS:
+        el = fields.get(name)
+        if el is not None and el.text:
+            published_at = parse_date(el.text)
+            if published_at:
+                break
+
+    return FeedEntry(
+        title=title,
+        link=_atom_link(elem),
+        guid=guid,
+        published_at=published_at,
+        content_html=content_html,
+    )
+
+
+def iter_entries(content: bytes) -> Iterator[FeedEntry]:
+    """
+    Stream entries from a feed document in document order.
+    Each <item>/<entry> is released as soon as it is converted, so callers
+    that stop early never parse the rest of the document.
+    Raises FeedParseError if the document is not well-formed XML or not a feed.
+    """
+    try:
+        events = ET.iterparse(BytesIO(content), events=("start", "end"))
+        _, root = next(events)
+        if _local(root.tag) not in FEED_ROOTS:
+            raise FeedParseError(f"Not a feed document: <{_local(root.tag)}>")
+        depth = 0
+        for event, elem in events:
+            if _local(elem.tag) not in ENTRY_TAGS:
+                continue
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                yield _entry_from_element(elem)
+                root.clear()  # drop processed entries to bound memory
+    except ET.ParseError as e:
+        raise FeedParseError(str(e)) from e
+    except StopIteration:
+        raise FeedParseError("Empty document")
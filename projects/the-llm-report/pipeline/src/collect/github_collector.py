@@ -1,35 +1,132 @@
 """
 The LLM Report — GitHub API Collector
 Fetches recent releases and discussions from GitHub repos.
-Uses conditional requests (ETag) to avoid re-fetching unchanged data.
+Uses conditional requests (ETag, persisted via http_cache) to avoid re-fetching unchanged data.
+
+With a GITHUB_TOKEN, run_collection first calls prefetch_releases(), which asks
+the GraphQL API for the recent releases of every configured org/repo in one
+query (or a few, GITHUB_GRAPHQL_BATCH owners each). fetch_github then serves
+those sources from the prefetched results, so a run costs O(1) requests
+instead of O(repos). The REST path remains the fallback.
+
+Every GitHub call goes through the RateLimitBudget of its quota — REST "core"
+counts requests, GraphQL counts points, and GitHub limits them separately.
+Each tracks the remaining quota from response headers / GraphQL rateLimit and
+refuses calls that would dip into GITHUB_RATE_RESERVE before the window resets.
+Per-repo release cursors (newest tag collected) persist in the KB's feed watermarks.
 """
 
 from __future__ import annotations
+import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import partial
+from typing import Callable, Iterable, Optional
 
 import requests
 
 from pipeline.src.models import CollectedItem
+from pipeline.src.collect import http_cache, http_client, pending
 from pipeline.src.collect.tagger import tag_item
+from pipeline.src.kb import store
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
-TIMEOUT = int(os.environ.get("COLLECTION_TIMEOUT", "30"))
-USER_AGENT = "TheLLMReport/1.0 (+https://thellmreport.com/about)"
+GRAPHQL_URL = "https://api.github.com/graphql"
+USE_GRAPHQL = os.environ.get("GITHUB_GRAPHQL", "1").lower() in ("1", "true", "yes")
+GRAPHQL_BATCH = int(os.environ.get("GITHUB_GRAPHQL_BATCH", "20"))  # owners/repos per query
+RATE_RESERVE = int(os.environ.get("GITHUB_RATE_RESERVE", "10"))  # requests kept in hand
 MAX_RELEASES = 5  # Per repo per run
+MAX_REPOS = 5  # Most recently pushed repos checked per org
 MAX_AGE_DAYS = 7  # Ignore releases older than this
 
-_etag_cache: dict[str, str] = {}
+
+class GitHubRateLimited(ConnectionError):
+    """The rate-limit budget for this window is spent."""
+
+
+class RateLimitBudget:
+    """
+    Remaining GitHub API quota as last reported by the server.
+    Unknown until the first response; shared by all threads of a run.
+    """
+
+    def __init__(self, reserve: int = RATE_RESERVE):
+        self.reserve = reserve
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch seconds
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def check(self, cost: int = 1) -> None:
+        """Raise GitHubRateLimited if spending `cost` would cut into the reserve."""
+        with self._lock:
+            if self.remaining is None:
+                return
+            if self.reset_at is not None and time.time() >= self.reset_at:
+                self.remaining = None  # window rolled over
+                return
+            if self.remaining - cost < self.reserve:
+                wait_s = max(0, int((self.reset_at or time.time()) - time.time()))
+                raise GitHubRateLimited(
+                    f"GitHub rate limit budget spent ({self.remaining} left, resets in {wait_s}s)"
+                )
+
+    def update(self, remaining: Optional[int], reset_at: Optional[float]) -> None:
+        with self._lock:
+            self.requests += 1
+            if remaining is not None:
+                self.remaining = remaining
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def update_from_headers(self, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        try:
+            self.update(
+                int(remaining) if remaining is not None else None,
+                float(reset) if reset is not None else None,
+            )
+        except (TypeError, ValueError):
+            self.update(None, None)
+
+
+# One budget per quota, keyed like X-RateLimit-Resource
+budgets: dict[str, RateLimitBudget] = {"core": RateLimitBudget(), "graphql": RateLimitBudget()}
+_budgets_lock = threading.Lock()
+
+# Releases fetched by prefetch_releases, keyed by source URL:
+# {url: [(repo full name, [REST-shaped release dicts])]}
+_prefetched: dict[str, list[tuple[str, list[dict]]]] = {}
+_prefetch_lock = threading.Lock()
 
 
 def _headers() -> dict:
-    h = {"User-Agent": USER_AGENT, "Accept": "application/vnd.github.v3+json"}
+    h = {"Accept": "application/vnd.github.v3+json"}
     if GITHUB_TOKEN:
         h["Authorization"] = f"token {GITHUB_TOKEN}"
     return h
 
 
+def _budget_for(headers, resource: str) -> RateLimitBudget:
+    """Budget of the quota a response reports on (X-RateLimit-Resource, else `resource`)."""
+    name = headers.get("X-RateLimit-Resource") or resource
+    with _budgets_lock:
+        return budgets.setdefault(name, RateLimitBudget())
+
+
+def _api_get(url: str, headers: dict):
+    """GET against the REST API, spending from and updating the core budget."""
+    budgets["core"].check()
+    resp = http_client.get(url, headers=headers)
+    _budget_for(resp.headers, "core").update_from_headers(resp.headers)
+    if resp.status_code in (403, 429) and resp.headers.get("X-RateLimit-Remaining") == "0":
+        raise GitHubRateLimited(f"GitHub rate limit exhausted at {url}")
+    return resp
+
+
 def _org_from_url(url: str) -> str:
     """Extract org/user from GitHub URL."""
     # e.g., https://github.com/deepseek-ai → deepseek-ai
@@ -47,11 +144,21 @@ def _repo_from_url(url: str) -> Optional[str]:
     return None
 
 
+def graphql_enabled() -> bool:
+    """GraphQL needs an authenticated token."""
+    return USE_GRAPHQL and bool(GITHUB_TOKEN)
+
+
 def fetch_github(source_name: str, url: str, tier: int) -> list[CollectedItem]:
     """
     Fetch recent releases from a GitHub org or repo.
     Returns CollectedItems for each new release.
     """
+    with _prefetch_lock:
+        prefetched = _prefetched.pop(url.rstrip("/"), None)
+    if prefetched is not None:
+        return _take_releases(source_name, url, tier, ((repo, releases, None) for repo, releases in prefetched))
+
     repo = _repo_from_url(url)
     if repo:
         return _fetch_repo_releases(source_name, repo, url, tier)
@@ -60,105 +167,275 @@ def fetch_github(source_name: str, url: str, tier: int) -> list[CollectedItem]:
         return _fetch_org_releases(source_name, org, url, tier)
 
 
-def _fetch_repo_releases(source_name: str, repo: str, source_url: str, tier: int) -> list[CollectedItem]:
-    """Fetch releases for a specific repo."""
+def _release_cursor_key(repo: str) -> str:
+    return f"https://github.com/{repo}/releases"
+
+
+def _release_item(
+    source_name: str, repo: str, source_url: str, tier: int, release: dict
+) -> Optional[CollectedItem]:
+    """CollectedItem for a REST-shaped release dict, or None if older than MAX_AGE_DAYS."""
+    tag_name = release.get("tag_name", "")
+    name = release.get("name", tag_name)
+    body = release.get("body", "") or ""
+    html_url = release.get("html_url", source_url)
+    published_at_str = release.get("published_at") or release.get("created_at")
+
+    title = f"{source_name}: {name or tag_name}"
+    content = f"Release: {tag_name}\n\n{body}"[:3000]
+
+    tags, _ = tag_item(title, content)
+    if "model-release" not in tags and "framework-release" not in tags:
+        tags.append("release")
+    tags.append(repo.split("/")[-1])  # Add repo name as tag
+
+    published_at = None
+    if published_at_str:
+        try:
+            published_at = datetime.fromisoformat(
+                published_at_str.replace("Z", "+00:00")
+            ).astimezone(timezone.utc)
+        except Exception:
+            pass
+
+    # Skip releases older than MAX_AGE_DAYS
+    if published_at and published_at < datetime.now(timezone.utc) - timedelta(days=MAX_AGE_DAYS):
+        return None
+
+    return CollectedItem(
+        source_name=source_name,
+        source_tier=tier,
+        url=html_url,
+        title=title,
+        raw_content=content,
+        published_at=published_at,
+        tags=tags,
+    )
+
+
+def _new_releases(repo: str, releases: list[dict]) -> list[dict]:
+    """Releases (newest first) up to the newest one collected on a previous run."""
+    cursor = store.get_feed_watermark(_release_cursor_key(repo))
+    last_tag = cursor["last_guid"] if cursor else None
+    new = []
+    for release in releases:
+        if last_tag and release.get("tag_name", "") == last_tag:
+            break  # everything older was collected already
+        new.append(release)
+    return new
+
+
+def _save_release_cursor(repo: str, release: dict) -> None:
+    published = release.get("published_at") or release.get("created_at")
+    store.save_feed_watermark(
+        _release_cursor_key(repo),
+        release["tag_name"],
+        release.get("html_url"),
+        datetime.fromisoformat(published.replace("Z", "+00:00")) if published else None,
+    )
+
+
+def _take_releases(
+    source_name: str,
+    source_url: str,
+    tier: int,
+    repos: Iterable[tuple[str, list[dict], Optional[Callable[[], None]]]],
+) -> list[CollectedItem]:
+    """
+    Items for at most MAX_RELEASES new releases of a source. `repos` yields
+    (repo, releases newest first, deferred validator write or None) in
+    priority order and is consumed lazily, so repos past the cap are not
+    fetched. A repo's cursor only moves past releases actually returned:
+    when it has more new releases than there is room for, its oldest ones
+    are taken and the newer ones are left for the next run.
+    """
+    items: list[CollectedItem] = []
+    for repo, releases, remember in repos:
+        new = _new_releases(repo, releases)
+        fresh = []
+        for release in new:
+            item = _release_item(source_name, repo, source_url, tier, release)
+            if item is not None:
+                fresh.append((release, item))
+
+        room = MAX_RELEASES - len(items)
+        cursor = new[0] if new else None
+        if len(fresh) > room:
+            fresh = fresh[-room:]
+            cursor = fresh[0][0]
+            remember = None  # the response still holds releases to collect
+        items.extend(item for _, item in fresh)
+
+        if cursor is not None and cursor.get("tag_name"):
+            pending.defer(_save_release_cursor, repo, cursor)
+        if remember is not None:
+            pending.defer(remember)
+        if len(items) >= MAX_RELEASES:
+            break
+    return items
+
+
+def _get_repo_releases(repo: str) -> tuple[list[dict], Optional[Callable[[], None]]]:
+    """
+    Releases of a repo (newest first) and the write that remembers the
+    response's validators; ([], None) if unchanged since the last run.
+    """
     api_url = f"https://api.github.com/repos/{repo}/releases?per_page={MAX_RELEASES}"
-    headers = _headers()
-    etag = _etag_cache.get(api_url)
-    if etag:
-        headers["If-None-Match"] = etag
+    headers = http_cache.conditional_headers(api_url, _headers())
 
     try:
-        resp = requests.get(api_url, headers=headers, timeout=TIMEOUT)
+        resp = _api_get(api_url, headers)
     except requests.RequestException as e:
         raise ConnectionError(f"GitHub API failed for {repo}: {e}") from e
 
-    if resp.status_code == 304:
-        return []
+    if http_cache.is_unchanged(api_url, resp):
+        return [], None
     if resp.status_code == 404:
         # Repo might not have releases — try tags or commits
-        return []
+        return [], None
     if resp.status_code != 200:
         raise ConnectionError(f"GitHub API HTTP {resp.status_code} for {repo}")
 
-    if "ETag" in resp.headers:
-        _etag_cache[api_url] = resp.headers["ETag"]
+    return resp.json(), partial(http_cache.remember, api_url, resp)
 
-    releases = resp.json()
-    items = []
-    for release in releases:
-        tag_name = release.get("tag_name", "")
-        name = release.get("name", tag_name)
-        body = release.get("body", "") or ""
-        html_url = release.get("html_url", source_url)
-        published_at_str = release.get("published_at") or release.get("created_at")
-
-        title = f"{source_name}: {name or tag_name}"
-        content = f"Release: {tag_name}\n\n{body}"[:3000]
-
-        tags, _ = tag_item(title, content)
-        if "model-release" not in tags and "framework-release" not in tags:
-            tags.append("release")
-        tags.append(repo.split("/")[-1])  # Add repo name as tag
-
-        published_at = None
-        if published_at_str:
-            try:
-                published_at = datetime.fromisoformat(
-                    published_at_str.replace("Z", "+00:00")
-                ).astimezone(timezone.utc)
-            except Exception:
-                pass
-
-        # Skip releases older than MAX_AGE_DAYS
-        if published_at and published_at < datetime.now(timezone.utc) - timedelta(days=MAX_AGE_DAYS):
-            continue
-
-        item = CollectedItem(
-            source_name=source_name,
-            source_tier=tier,
-            url=html_url,
-            title=title,
-            raw_content=content,
-            published_at=published_at,
-            tags=tags,
-        )
-        items.append(item)
 
-    return items
+def _fetch_repo_releases(source_name: str, repo: str, source_url: str, tier: int) -> list[CollectedItem]:
+    """Fetch releases for a specific repo."""
+    return _take_releases(source_name, source_url, tier, [(repo, *_get_repo_releases(repo))])
 
 
-def _fetch_org_releases(source_name: str, org: str, source_url: str, tier: int) -> list[CollectedItem]:
-    """Fetch releases from all repos in a GitHub org."""
-    # First get org's repos, sorted by recent push
+def _org_repos(org: str) -> list[str]:
+    """
+    Most recently pushed repos of an org (or user), conditionally fetched.
+    The listing itself is kept in the KB so a 304 still yields repo names.
+    """
+    state_key = f"github:repos:{org}"
+    cached = store.get_collector_state(state_key)
     api_url = f"https://api.github.com/orgs/{org}/repos?sort=pushed&direction=desc&per_page=10"
-    headers = _headers()
+    headers = http_cache.conditional_headers(api_url, _headers()) if cached else _headers()
 
     try:
-        resp = requests.get(api_url, headers=headers, timeout=TIMEOUT)
+        resp = _api_get(api_url, headers)
     except requests.RequestException as e:
         raise ConnectionError(f"GitHub API failed for org {org}: {e}") from e
 
     if resp.status_code == 404:
         # Might be a user, not org
         api_url = api_url.replace("/orgs/", "/users/")
+        headers = http_cache.conditional_headers(api_url, _headers()) if cached else _headers()
         try:
-            resp = requests.get(api_url, headers=headers, timeout=TIMEOUT)
+            resp = _api_get(api_url, headers)
         except requests.RequestException:
             return []
 
+    if cached and http_cache.is_unchanged(api_url, resp):
+        return json.loads(cached)
     if resp.status_code != 200:
         return []
 
-    repos = resp.json()
-    items = []
-    for repo_data in repos[:5]:  # Check top 5 most recently active repos
-        repo_full_name = repo_data.get("full_name", "")
-        if not repo_full_name:
-            continue
-        repo_items = _fetch_repo_releases(source_name, repo_full_name, source_url, tier)
-        items.extend(repo_items)
-        if len(items) >= MAX_RELEASES:
-            break
+    repos = [r.get("full_name", "") for r in resp.json()]
+    repos = [r for r in repos if r]
+    store.save_collector_state(state_key, json.dumps(repos))
+    http_cache.remember(api_url, resp)
+    return repos
+
 
-    return items[:MAX_RELEASES]
+def _fetch_org_releases(source_name: str, org: str, source_url: str, tier: int) -> list[CollectedItem]:
+    """Fetch releases from the most recently active repos of a GitHub org."""
+    repos = _org_repos(org)[:MAX_REPOS]
+    return _take_releases(source_name, source_url, tier, ((repo, *_get_repo_releases(repo)) for repo in repos))
+
+
+# ── GraphQL batch mode ──────────────────────────────────────────────────────
+
+_RELEASE_FIELDS = (
+    f"releases(first: {MAX_RELEASES}, orderBy: {{field: CREATED_AT, direction: DESC}}) "
+    "{ nodes { tagName name description url publishedAt createdAt } }"
+)
+
+
+def _graphql_query(targets: list[tuple[str, str]]) -> str:
+    """Build one aliased query; targets are (alias, source URL)."""
+    parts = ["rateLimit { cost remaining resetAt }"]
+    for alias, url in targets:
+        repo = _repo_from_url(url)
+        if repo:
+            owner, name = repo.split("/")
+            parts.append(
+                f"{alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                f"{{ nameWithOwner {_RELEASE_FIELDS} }}"
+            )
+        else:
+            parts.append(
+                f"{alias}: repositoryOwner(login: {json.dumps(_org_from_url(url))}) {{ "
+                f"repositories(first: {MAX_REPOS}, orderBy: {{field: PUSHED_AT, direction: DESC}}) "
+                f"{{ nodes {{ nameWithOwner {_RELEASE_FIELDS} }} }} }}"
+            )
+    return "query { " + " ".join(parts) + " }"
+
+
+def _rest_shape(node: dict) -> dict:
+    return {
+        "tag_name": node.get("tagName") or "",
+        "name": node.get("name"),
+        "body": node.get("description"),
+        "html_url": node.get("url"),
+        "published_at": node.get("publishedAt"),
+        "created_at": node.get("createdAt"),
+    }
+
+
+def _repo_releases(repo_node: dict) -> tuple[str, list[dict]]:
+    releases = [_rest_shape(n) for n in (repo_node.get("releases") or {}).get("nodes") or []]
+    return repo_node.get("nameWithOwner", ""), releases
+
+
+def prefetch_releases(sources: list[dict]) -> int:
+    """
+    Fetch releases for every GitHub source with batched GraphQL queries and
+    stash them for fetch_github. Returns the number of sources prefetched.
+    Sources missing from the response (unknown owner, errors) are left to REST.
+    """
+    urls = list(dict.fromkeys(s["url"].rstrip("/") for s in sources))
+    headers = {"Authorization": f"bearer {GITHUB_TOKEN}"}
+    done = 0
+    for start in range(0, len(urls), max(1, GRAPHQL_BATCH)):
+        chunk = urls[start:start + max(1, GRAPHQL_BATCH)]
+        targets = [(f"s{start + i}", url) for i, url in enumerate(chunk)]
+        budgets["graphql"].check()
+        try:
+            resp = http_client.post(GRAPHQL_URL, json={"query": _graphql_query(targets)}, headers=headers)
+        except requests.RequestException as e:
+            raise ConnectionError(f"GitHub GraphQL failed: {e}") from e
+        _budget_for(resp.headers, "graphql").update_from_headers(resp.headers)
+        if resp.status_code != 200:
+            raise ConnectionError(f"GitHub GraphQL HTTP {resp.status_code}")
+
+        payload = resp.json()
+        data = payload.get("data") or {}
+        rate = data.get("rateLimit") or {}
+        if rate.get("remaining") is not None:
+            reset = rate.get("resetAt")
+            budgets["graphql"].update(
+                int(rate["remaining"]),
+                datetime.fromisoformat(reset.replace("Z", "+00:00")).timestamp() if reset else None,
+            )
+
+        for alias, url in targets:
+            node = data.get(alias)
+            if not node:
+                continue
+            if "repositories" in node:
+                repos = [_repo_releases(n) for n in (node["repositories"].get("nodes") or [])]
+            else:
+                repos = [_repo_releases(node)]
+            with _prefetch_lock:
+                _prefetched[url] = repos
+            done += 1
+    return done
+
+
+def clear_prefetch() -> None:
+    """Drop prefetched results that were not consumed (end of run / tests)."""
+    with _prefetch_lock:
+        _prefetched.clear()
@@ -0,0 +1,61 @@
+"""
+The LLM Report — Persistent HTTP Cache
+Conditional-GET validators (ETag/Last-Modified) and body hashes, persisted in
+the KB so they survive between cron runs. Shared by all collectors.
+
+Usage:
+    headers = http_cache.conditional_headers(url, headers)
+    resp = requests.get(url, headers=headers, ...)
+    if http_cache.is_unchanged(url, resp):
+        return []  # 304, or byte-identical to last fetch — skip parsing
+    ... parse ...
+    pending.defer(http_cache.remember, url, resp)  # after the items are stored
+"""
+
+from __future__ import annotations
+import hashlib
+from typing import Optional
+
+from pipeline.src.kb import store
+
+
+def body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def conditional_headers(url: str, headers: Optional[dict] = None) -> dict:
+    """Return a copy of `headers` with If-None-Match/If-Modified-Since for `url`."""
+    headers = dict(headers or {})
+    cached = store.get_http_cache(url)
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def is_unchanged(url: str, resp) -> bool:
+    """
+    True if the response carries nothing new: a 304, or a 200 whose body is
+    byte-identical to the last one remembered for this URL.
+    """
+    if resp.status_code == 304:
+        return True
+    if resp.status_code != 200:
+        return False
+    cached = store.get_http_cache(url)
+    if cached and cached["body_hash"] == body_hash(resp.content):
+        remember(url, resp)  # refresh validators the server may have rotated
+        return True
+    return False
+
+
+def remember(url: str, resp) -> None:
+    """Persist the validators and body hash of a successfully processed 200 response."""
+    store.save_http_cache(
+        url,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        body_hash=body_hash(resp.content),
+    )
@@ -0,0 +1,173 @@
+"""
+The LLM Report — Shared HTTP Client
+One pooled keep-alive session for every collector, so repeated requests to
+api.github.com or the same blog host reuse TCP+TLS connections instead of
+handshaking per call. Sets a consistent User-Agent and default timeout.
+Optional HTTP/2 via httpx (COLLECTION_HTTP2=1, requires the h2 package).
+Bodies are streamed and cut off at COLLECTION_MAX_BYTES (or a per-source
+max_bytes), and callers can end a download early once they have enough.
+"""
+
+from __future__ import annotations
+import os
+import threading
+from typing import Callable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TIMEOUT = int(os.environ.get("COLLECTION_TIMEOUT", "30"))
+USER_AGENT = "TheLLMReport/1.0 (+https://thellmreport.com/about)"
+POOL_HOSTS = int(os.environ.get("COLLECTION_POOL_HOSTS", "32"))  # hosts kept warm
+POOL_PER_HOST = int(os.environ.get("COLLECTION_POOL_PER_HOST", "4"))  # connections per host
+HTTP2 = os.environ.get("COLLECTION_HTTP2", "").lower() in ("1", "true", "yes")
+MAX_BYTES = int(os.environ.get("COLLECTION_MAX_BYTES", str(5 * 1024 * 1024)))  # 0 = unlimited
+CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+_http2_client = None
+_lock = threading.Lock()
+_transfer = threading.local()  # per-thread body byte counter
+
+
+def bytes_received() -> int:
+    """Response body bytes received by get() on the calling thread so far."""
+    return getattr(_transfer, "bytes", 0)
+
+
+def _count(resp):
+    _transfer.bytes = bytes_received() + len(resp.content or b"")
+    return resp
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _session = session
+    return _session
+
+
+def _get_http2_client():
+    """Return a shared httpx HTTP/2 client, or None if httpx/h2 is unavailable."""
+    global _http2_client
+    if _http2_client is None:
+        with _lock:
+            if _http2_client is None:
+                try:
+                    import httpx
+                    _http2_client = httpx.Client(
+                        http2=True,
+                        timeout=TIMEOUT,
+                        follow_redirects=True,
+                        headers={"User-Agent": USER_AGENT},
+                        limits=httpx.Limits(
+                            max_connections=POOL_HOSTS * POOL_PER_HOST,
+                            max_keepalive_connections=POOL_HOSTS,
+                        ),
+                    )
+                except ImportError:
+                    _http2_client = False
+    return _http2_client or None
+
+
+def _read_body(
+    chunks: Iterable[bytes], max_bytes: int, stop: Optional[Callable[[bytes], bool]]
+) -> tuple[bytes, bool]:
+    """Read chunks until the body ends, max_bytes is reached or stop() says so."""
+    body = bytearray()
+    for chunk in chunks:
+        if max_bytes and len(body) + len(chunk) > max_bytes:
+            body += chunk[: max_bytes - len(body)]
+            return bytes(body), True
+        body += chunk
+        if stop is not None and stop(chunk):
+            return bytes(body), True
+    return bytes(body), False
+
+
+def get(
+    url: str,
+    headers: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    stop: Optional[Callable[[bytes], bool]] = None,
+    **kwargs,
+):
+    """
+    GET through the shared pooled session.
+    Returns a requests-compatible response (status_code, headers, content, json()).
+    The body is streamed: at most `max_bytes` (default MAX_BYTES) are kept, and
+    `stop(chunk)` returning True ends the download early. Either sets
+    `resp.truncated = True`.
+    Transport failures raise requests.RequestException regardless of backend.
+    """
+    timeout = timeout or TIMEOUT
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    streaming = bool(max_bytes) or stop is not None
+    if HTTP2:
+        client = _get_http2_client()
+        if client is not None:
+            import httpx
+            try:
+                if not streaming:
+                    return _count(client.get(url, headers=headers, timeout=timeout, **kwargs))
+                request = client.build_request("GET", url, headers=headers, timeout=timeout, **kwargs)
+                resp = client.send(request, stream=True)
+                try:
+                    body, truncated = _read_body(resp.iter_bytes(CHUNK_SIZE), max_bytes, stop)
+                finally:
+                    resp.close()
+            except httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+            resp._content = body
+            resp.truncated = truncated
+            return _count(resp)
+
+    resp = _get_session().get(url, headers=headers, timeout=timeout, stream=streaming, **kwargs)
+    if streaming:
+        try:
+            body, truncated = _read_body(resp.iter_content(CHUNK_SIZE), max_bytes, stop)
+        except Exception:
+            resp.close()
+            raise
+        # close() returns a fully read connection to the pool and drops a cut-off
+        # one, rather than draining the rest of an oversized body
+        resp._content_consumed = not truncated
+        resp.close()
+        resp._content = body
+        resp._content_consumed = True
+        resp.truncated = truncated
+    return _count(resp)
+
+
+def post(url: str, json=None, headers: Optional[dict] = None, timeout: Optional[float] = None, **kwargs):
+    """POST through the shared pooled session (e.g. GraphQL queries). Same error contract as get()."""
+    timeout = timeout or TIMEOUT
+    if HTTP2:
+        client = _get_http2_client()
+        if client is not None:
+            import httpx
+            try:
+                return client.post(url, json=json, headers=headers, timeout=timeout, **kwargs)
+            except httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+    return _get_session().post(url, json=json, headers=headers, timeout=timeout, **kwargs)
+
+
+def close() -> None:
+    """Close pooled connections (end of run / tests)."""
+    global _session, _http2_client
+    with _lock:
+        if _session is not None:
+            _session.close()
+        if _http2_client:
+            _http2_client.close()
+        _session = None
+        _http2_client = None
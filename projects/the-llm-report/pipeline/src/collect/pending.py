@@ -0,0 +1,52 @@
+"""
+The LLM Report — Deferred Collector State
+Conditional-GET validators, feed watermarks, changelog fingerprints, discovered
+page lastmods and release cursors all say "everything up to here is in the KB".
+Persisting them while fetching loses items whenever ingest fails afterwards
+(or the process dies): the next run gets a 304 or stops at the watermark.
+
+Collectors hand such writes to defer(). run_collection captures them per fetch
+and commits them only after the source's items were stored:
+
+    with pending.capture() as writes:
+        items = fetch(...)
+    store.ingest_items(items)
+    pending.commit(writes)
+
+Outside a capture (direct calls, tests) deferred writes run immediately.
+"""
+
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Iterator, Optional
+
+_local = threading.local()  # fetches run on collector worker threads
+
+
+@contextmanager
+def capture() -> Iterator[list[Callable[[], None]]]:
+    """Collect the writes deferred on this thread inside the block."""
+    previous: Optional[list] = getattr(_local, "writes", None)
+    writes: list[Callable[[], None]] = []
+    _local.writes = writes
+    try:
+        yield writes
+    finally:
+        _local.writes = previous
+
+
+def defer(fn: Callable, *args, **kwargs) -> None:
+    """Run fn(*args, **kwargs) once the fetched items are stored (now, outside a capture)."""
+    writes = getattr(_local, "writes", None)
+    if writes is None:
+        fn(*args, **kwargs)
+    else:
+        writes.append(partial(fn, *args, **kwargs))
+
+
+def commit(writes: list[Callable[[], None]]) -> None:
+    """Persist captured writes, in the order they were deferred."""
+    for write in writes:
+        write()
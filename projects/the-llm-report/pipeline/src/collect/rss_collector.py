@@ -1,36 +1,33 @@
 """
 The LLM Report — RSS Feed Collector
 Fetches and parses RSS/Atom feeds.
-Uses ETag/Last-Modified for conditional fetching to avoid re-fetching unchanged data.
+Parses with the streaming fast path in feed_parser and falls back to
+feedparser only for malformed or unusual documents.
+Uses ETag/Last-Modified for conditional fetching to avoid re-fetching unchanged data,
+and skips parsing when the body is byte-identical to the last fetch (see http_cache).
+Per-feed watermarks (newest GUID/link and published date, kept in the KB) let a
+changed feed stop at the first previously seen entry, so steady-state runs
+only clean, tag and hash new entries.
 """
 
 from __future__ import annotations
-import hashlib
-import os
-import re
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterator, Optional
 
 import feedparser
 import requests
-from bs4 import BeautifulSoup
 
 from pipeline.src.models import CollectedItem
+from pipeline.src.collect import canonical, http_cache, http_client, pending
+from pipeline.src.kb import store
+from pipeline.src.collect.feed_parser import FeedEntry, FeedParseError, html_to_text, iter_entries
 from pipeline.src.collect.tagger import tag_item
 
-TIMEOUT = int(os.environ.get("COLLECTION_TIMEOUT", "30"))
-USER_AGENT = "TheLLMReport/1.0 (+https://thellmreport.com/about)"
-
-# In-memory ETag/Last-Modified cache (persisted via SQLite in a full implementation)
-_etag_cache: dict[str, str] = {}
-_lastmod_cache: dict[str, str] = {}
-
 
 def _clean_html(html: str) -> str:
     """Strip HTML tags and clean whitespace."""
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(separator=" ")
-    return re.sub(r'\s+', ' ', text).strip()
+    return html_to_text(html)
 
 
 def _parse_date(entry) -> Optional[datetime]:
@@ -38,7 +35,6 @@ def _parse_date(entry) -> Optional[datetime]:
     for field in ("published_parsed", "updated_parsed", "created_parsed"):
         t = getattr(entry, field, None)
         if t:
-            import time
             try:
                 return datetime.fromtimestamp(time.mktime(t), tz=timezone.utc)
             except Exception:
@@ -46,58 +42,114 @@ def _parse_date(entry) -> Optional[datetime]:
     return None
 
 
-def fetch_rss(source_name: str, url: str, tier: int) -> list[CollectedItem]:
+def _feedparser_entries(content: bytes) -> list[FeedEntry]:
+    """Slow path: let feedparser recover what it can from a malformed feed."""
+    entries = []
+    for entry in feedparser.parse(content).entries:
+        content_html = ""
+        if hasattr(entry, "content") and entry.content:
+            content_html = entry.content[0].get("value", "")
+        elif hasattr(entry, "summary"):
+            content_html = entry.summary
+        elif hasattr(entry, "description"):
+            content_html = entry.description
+        entries.append(FeedEntry(
+            title=getattr(entry, "title", ""),
+            link=getattr(entry, "link", ""),
+            guid=getattr(entry, "id", ""),
+            published_at=_parse_date(entry),
+            content_html=content_html,
+        ))
+    return entries
+
+
+def parse_feed(content: bytes) -> Iterator[FeedEntry]:
+    """
+    Yield feed entries lazily, switching to feedparser if the fast parser
+    rejects the document (entries already yielded are not repeated).
+    """
+    yielded = 0
+    try:
+        for entry in iter_entries(content):
+            yield entry
+            yielded += 1
+    except FeedParseError:
+        yield from _feedparser_entries(content)[yielded:]
+
+
+def _is_watermark(entry: FeedEntry, watermark: dict) -> bool:
+    """True if this entry is the newest entry recorded on a previous run."""
+    if entry.guid and watermark.get("last_guid"):
+        return entry.guid.strip() == watermark["last_guid"]
+    return bool(watermark.get("last_link")) and entry.link.strip() == watermark["last_link"]
+
+
+def _watermark_date(watermark: Optional[dict]) -> Optional[datetime]:
+    value = (watermark or {}).get("newest_published_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+def fetch_rss(
+    source_name: str, url: str, tier: int, max_bytes: Optional[int] = None
+) -> list[CollectedItem]:
     """
     Fetch and parse an RSS/Atom feed.
     Uses conditional GET (ETag/Last-Modified) to skip unchanged feeds.
+    The body is capped at max_bytes (default COLLECTION_MAX_BYTES); a cut-off
+    feed is parsed as far as it goes.
     Returns list of CollectedItems (only new content, not dedup-checked here).
     """
-    headers = {"User-Agent": USER_AGENT}
-    etag = _etag_cache.get(url)
-    lastmod = _lastmod_cache.get(url)
-    if etag:
-        headers["If-None-Match"] = etag
-    if lastmod:
-        headers["If-Modified-Since"] = lastmod
+    headers = http_cache.conditional_headers(url)
 
     try:
-        resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+        resp = http_client.get(url, headers=headers, max_bytes=max_bytes)
     except requests.RequestException as e:
         raise ConnectionError(f"Failed to fetch {url}: {e}") from e
 
-    if resp.status_code == 304:
-        return []  # Not modified — skip
+    if http_cache.is_unchanged(url, resp):
+        return []  # 304 or identical body — skip
     if resp.status_code != 200:
         raise ConnectionError(f"HTTP {resp.status_code} from {url}")
 
-    # Cache conditional headers for next time
-    if "ETag" in resp.headers:
-        _etag_cache[url] = resp.headers["ETag"]
-    if "Last-Modified" in resp.headers:
-        _lastmod_cache[url] = resp.headers["Last-Modified"]
-
-    feed = feedparser.parse(resp.content)
-    items = []
-    for entry in feed.entries:
-        title = getattr(entry, "title", "").strip()
-        link = getattr(entry, "link", "").strip()
-        if not title or not link:
+    watermark = store.get_feed_watermark(url)
+    seen_before = _watermark_date(watermark)
+    newest: Optional[FeedEntry] = None
+    prev_date: Optional[datetime] = None
+    descending = True  # feed lists newest first (so far)
+
+    candidates: list[tuple[FeedEntry, str, str]] = []
+    for entry in parse_feed(resp.content):
+        date = entry.published_at
+        if date and prev_date and date > prev_date:
+            descending = False
+        prev_date = date or prev_date
+        if newest is None or (date and (newest.published_at is None or date > newest.published_at)):
+            newest = entry
+
+        if watermark and _is_watermark(entry, watermark):
+            if descending:
+                break  # everything after this was collected on an earlier run
             continue
+        if seen_before and date and date < seen_before:
+            continue  # older than anything collected before; order unknown, keep scanning
 
-        # Extract content
-        content = ""
-        if hasattr(entry, "content") and entry.content:
-            content = _clean_html(entry.content[0].get("value", ""))
-        elif hasattr(entry, "summary"):
-            content = _clean_html(entry.summary)
-        elif hasattr(entry, "description"):
-            content = _clean_html(entry.description)
+        title = entry.title.strip()
+        link = entry.link.strip()
+        if title and link:
+            candidates.append((entry, title, link))
 
+    seen = canonical.lookup(link for _, _, link in candidates)
+    items = []
+    for entry, title, link in candidates:
+        if link in seen and seen[link]["source_name"] != source_name:
+            continue  # same story already collected through another source
+
+        content = _clean_html(entry.content_html)
         if not content:
             content = title  # Fallback: use title as content
 
         tags, _ = tag_item(title, content)
-        published_at = _parse_date(entry)
+        published_at = entry.published_at
 
         item = CollectedItem(
             source_name=source_name,
@@ -110,4 +162,13 @@ def fetch_rss(source_name: str, url: str, tier: int) -> list[CollectedItem]:
         )
         items.append(item)
 
+    # Cache conditional headers and advance the watermark once the items are stored
+    pending.defer(http_cache.remember, url, resp)
+    if newest is not None and (
+        seen_before is None or (newest.published_at and newest.published_at >= seen_before)
+    ):
+        pending.defer(
+            store.save_feed_watermark,
+            url, newest.guid.strip() or None, newest.link.strip() or None, newest.published_at,
+        )
     return items
@@ -0,0 +1,103 @@
+"""
+The LLM Report — Adaptive Source Scheduler
+Decides which of the sources loaded for a run are actually polled, from the
+per-source yield history in the KB's source_stats table (new items, bytes,
+latency and errors per run, recorded by the collector):
+
+    - run_days (0=Monday, UTC) from sources.yaml are honoured first, even with
+      adaptive scheduling off; every other rule only picks among run days
+    - low-yield sources — LOW_YIELD_RUNS polls in a row without a new item
+      (errors count as empty) — back off: the gap between polls doubles per
+      further empty poll, from 2 days up to MIN_REVISIT_DAYS
+    - sources answering HTTP 403 CIRCUIT_403_THRESHOLD times in a row are
+      circuit-broken for CIRCUIT_COOLDOWN_DAYS, then probed once again
+    - no other source is left unpolled for longer than MIN_REVISIT_DAYS, so a
+      quiet source that wakes up is noticed (on its first run day after that)
+
+A source with no history is polled on its first run day.
+"""
+
+from __future__ import annotations
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from pipeline.src.kb import store
+
+ADAPTIVE = os.environ.get("SCHEDULER_ADAPTIVE", "1").lower() in ("1", "true", "yes")
+MIN_REVISIT_DAYS = float(os.environ.get("SCHEDULER_MIN_REVISIT_DAYS", "7"))
+LOW_YIELD_RUNS = int(os.environ.get("SCHEDULER_LOW_YIELD_RUNS", "4"))
+CIRCUIT_403_THRESHOLD = int(os.environ.get("SCHEDULER_403_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_DAYS = float(os.environ.get("SCHEDULER_403_COOLDOWN_DAYS", "14"))
+HISTORY_RUNS = 20  # polls per source read back from source_stats
+
+_HTTP_STATUS = re.compile(r"\bHTTP (\d{3})\b")
+
+
+@dataclass
+class Decision:
+    source: dict
+    poll: bool
+    reason: str
+
+
+def http_status(error: Optional[str]) -> Optional[int]:
+    """HTTP status carried in a collector error message ("HTTP 403 from ..."), if any."""
+    match = _HTTP_STATUS.search(error or "")
+    return int(match.group(1)) if match else None
+
+
+def _leading(history: list[dict], predicate) -> int:
+    """How many of the newest polls in a row satisfy `predicate`."""
+    count = 0
+    for row in history:
+        if not predicate(row):
+            break
+        count += 1
+    return count
+
+
+def _off_day(source: dict, now: datetime) -> Optional[Decision]:
+    """Skip decision when `now` is not one of the source's run_days."""
+    run_days = source.get("run_days")
+    if run_days is not None and now.weekday() not in run_days:
+        return Decision(source, False, f"not a run day (run_days {list(run_days)})")
+    return None
+
+
+def decide(source: dict, history: list[dict], now: datetime) -> Decision:
+    """Poll-or-skip decision for one source given its polls, newest first."""
+    off_day = _off_day(source, now)
+    if off_day:
+        return off_day
+    if not history:
+        return Decision(source, True, "no history")
+    last_poll = datetime.fromisoformat(history[0]["polled_at"])
+    idle_days = (now - last_poll).total_seconds() / 86400
+
+    forbidden = _leading(history, lambda r: r["http_status"] == 403)
+    if forbidden >= CIRCUIT_403_THRESHOLD:
+        if idle_days < CIRCUIT_COOLDOWN_DAYS:
+            return Decision(source, False, f"circuit open: HTTP 403 on last {forbidden} polls")
+        return Decision(source, True, f"circuit probe after {idle_days:.1f} days")
+    if idle_days >= MIN_REVISIT_DAYS:
+        return Decision(source, True, f"revisit after {idle_days:.1f} days")
+
+    empty = _leading(history, lambda r: r["items_new"] == 0)
+    if empty >= LOW_YIELD_RUNS:
+        gap_days = min(MIN_REVISIT_DAYS, 2.0 ** (empty - LOW_YIELD_RUNS + 1))
+        if idle_days < gap_days:
+            return Decision(source, False, f"low yield: {empty} empty polls, next in {gap_days - idle_days:.1f} days")
+        return Decision(source, True, f"low yield probe after {empty} empty polls")
+    return Decision(source, True, "active")
+
+
+def plan(sources: list[dict], now: Optional[datetime] = None) -> list[Decision]:
+    """Decisions for `sources`, in config order."""
+    now = now or datetime.now(timezone.utc)
+    if not ADAPTIVE:
+        return [_off_day(s, now) or Decision(s, True, "adaptive scheduling disabled") for s in sources]
+    histories = store.get_source_stats([s["name"] for s in sources], limit=HISTORY_RUNS)
+    return [decide(s, histories.get(s["name"], []), now) for s in sources]
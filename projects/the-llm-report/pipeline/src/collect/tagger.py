@@ -2,11 +2,15 @@
 The LLM Report — Regex Tagger
 Auto-tags items before LLM calls. Only calls LLM if regex tagging is ambiguous.
 Cost optimization: prevents LLM calls for obvious patterns.
+All patterns are precompiled into one engine (literal prefilter + regex
+confirmation) that returns tags, model mentions and org mentions together.
 NLSpec Section 5.1
 """
 
 from __future__ import annotations
 import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
 
 # Pattern map: tag → list of regex patterns
 TAG_PATTERNS: dict[str, list[str]] = {
@@ -67,50 +71,136 @@ TAG_PATTERNS: dict[str, list[str]] = {
     ],
 }
 
+MODEL_PATTERNS: list[str] = [
+    r"\bGPT-[\d.]+\b", r"\bClaude[\s-][\w.]+\b", r"\bGemini[\s-][\w.]+\b",
+    r"\bLLaMA[\s-]?\d+\b", r"\bDeepSeek[\s-][\w.]+\b", r"\bQwen[\s-]?\d+\b",
+    r"\bMistral[\s-][\w.]+\b", r"\bGrok[\s-]?\d*\b", r"\bPhi[\s-]?\d+\b",
+]
+
+ORG_NAMES: list[str] = [
+    "OpenAI", "Anthropic", "Google DeepMind", "Google", "Meta",
+    "DeepSeek", "Mistral", "Hugging Face", "Microsoft", "Amazon",
+    "Apple", "xAI", "Cohere", "AI21", "StrongDM",
+]
+
 AMBIGUOUS_THRESHOLD = 0  # If 0 tags found, consider ambiguous
 
 
+@dataclass
+class TagScan:
+    """Everything the tagger extracts from one text (tags, model and org mentions)."""
+    tags: list[str]
+    is_ambiguous: bool
+    model_mentions: list[str]
+    org_mentions: list[str]
+
+
+_REGEX_META = set("\\.^$*+?{}[]()|")
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Leading literal text every match of `pattern` must contain (lowercased),
+    e.g. r"\breleas(es|ed)" → "releas". Empty if the pattern has none.
+    """
+    body = pattern[2:] if pattern.startswith(r"\b") else pattern
+    literal = []
+    for ch in body:
+        if ch in _REGEX_META:
+            if ch in "?*{" and literal:
+                literal.pop()  # previous char is optional
+            break
+        literal.append(ch)
+    return "".join(literal).lower()
+
+
+class _Rule:
+    __slots__ = ("literal", "regex")
+
+    def __init__(self, pattern: str):
+        self.literal = _required_literal(pattern)
+        self.regex = re.compile(pattern, re.IGNORECASE)
+
+
+class _TagEngine:
+    """
+    Precompiled tagging engine for tag patterns, model patterns and org names.
+    Each pattern is compiled once and guarded by its required leading literal:
+    the text is lowercased once, every literal is checked with a substring
+    search (about one per pattern), and only patterns whose literal occurs
+    are run as regexes. Most texts pass few literals, so the regex work
+    stays small; the substring checks still grow with the pattern count.
+    """
+
+    def __init__(self) -> None:
+        self.tag_rules = {tag: [_Rule(p) for p in patterns] for tag, patterns in TAG_PATTERNS.items()}
+        self.model_rules = [_Rule(p) for p in MODEL_PATTERNS]
+        self.org_rules = {org: _Rule(r"\b" + re.escape(org) + r"\b") for org in ORG_NAMES}
+
+    def scan(self, text: str) -> TagScan:
+        lowered = text.lower()
+
+        def hit(rule: _Rule) -> bool:
+            return rule.literal in lowered and rule.regex.search(text) is not None
+
+        tags = [tag for tag, rules in self.tag_rules.items() if any(hit(r) for r in rules)]
+
+        models: dict[str, None] = {}
+        for rule in self.model_rules:
+            if rule.literal in lowered:
+                models.update(dict.fromkeys(rule.regex.findall(text)))
+
+        return TagScan(
+            tags=tags,
+            is_ambiguous=len(tags) == AMBIGUOUS_THRESHOLD,
+            model_mentions=list(models),
+            org_mentions=[org for org, rule in self.org_rules.items() if hit(rule)],
+        )
+
+
+_engine: Optional[_TagEngine] = None
+
+
+def _get_engine() -> _TagEngine:
+    global _engine
+    if _engine is None:
+        _engine = _TagEngine()
+    return _engine
+
+
+def scan_text(text: str) -> TagScan:
+    """
+    Tags, model mentions and org mentions for `text`: a literal substring
+    prefilter per pattern, then that pattern's regex where the literal occurs.
+    """
+    return _get_engine().scan(text)
+
+
+def scan_items(items: Iterable[tuple[str, str]]) -> list[TagScan]:
+    """
+    Batch API: scan many (title, content) pairs with the shared compiled
+    engine — each text gets the literal prefilter, then the regexes of the
+    patterns whose literal it contains.
+    """
+    engine = _get_engine()
+    return [engine.scan(f"{title} {content}") for title, content in items]
+
+
 def tag_item(title: str, content: str) -> tuple[list[str], bool]:
     """
     Apply regex tagging to an item.
     Returns (tags, is_ambiguous).
     is_ambiguous = True when LLM tagging should be called.
     """
-    text = f"{title} {content}".lower()
-    tags = []
-    for tag, patterns in TAG_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                tags.append(tag)
-                break  # One match per tag is enough
-
-    is_ambiguous = len(tags) == AMBIGUOUS_THRESHOLD
-    return tags, is_ambiguous
+    result = scan_text(f"{title} {content}")
+    return result.tags, result.is_ambiguous
 
 
 def extract_model_mentions(text: str) -> list[str]:
     """Extract AI model names mentioned in text."""
-    patterns = [
-        r"\bGPT-[\d.]+\b", r"\bClaude[\s-][\w.]+\b", r"\bGemini[\s-][\w.]+\b",
-        r"\bLLaMA[\s-]?\d+\b", r"\bDeepSeek[\s-][\w.]+\b", r"\bQwen[\s-]?\d+\b",
-        r"\bMistral[\s-][\w.]+\b", r"\bGrok[\s-]?\d*\b", r"\bPhi[\s-]?\d+\b",
-    ]
-    mentions = []
-    for pattern in patterns:
-        found = re.findall(pattern, text, re.IGNORECASE)
-        mentions.extend(found)
-    return list(set(mentions))
+    return scan_text(text).model_mentions
 
 
 def extract_org_mentions(text: str) -> list[str]:
     """Extract AI organization names mentioned in text."""
-    orgs = [
-        "OpenAI", "Anthropic", "Google DeepMind", "Google", "Meta",
-        "DeepSeek", "Mistral", "Hugging Face", "Microsoft", "Amazon",
-        "Apple", "xAI", "Cohere", "AI21", "StrongDM",
-    ]
-    found = []
-    for org in orgs:
-        if re.search(r'\b' + re.escape(org) + r'\b', text, re.IGNORECASE):
-            found.append(org)
-    return found
+    return scan_text(text).org_mentions
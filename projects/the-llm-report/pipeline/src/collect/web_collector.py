@@ -2,128 +2,128 @@
 The LLM Report — Web Scraper Collector
 Scrapes web pages for content when RSS is not available.
 Extracts title, date, and main body text.
+Sends persisted ETag/Last-Modified validators and skips unchanged pages (see http_cache).
+Changelog pages are diffed per section against fingerprints stored in the KB,
+so only new or materially changed sections are emitted.
 """
 
 from __future__ import annotations
-import os
+import hashlib
 import re
-from datetime import datetime, timezone
 from typing import Optional
-from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
 from pipeline.src.models import CollectedItem
+from pipeline.src.collect import canonical, extractor, http_cache, http_client, pending
 from pipeline.src.collect.tagger import tag_item
+from pipeline.src.kb import store
 
-TIMEOUT = int(os.environ.get("COLLECTION_TIMEOUT", "30"))
-USER_AGENT = "TheLLMReport/1.0 (+https://thellmreport.com/about)"
-MAX_CONTENT_LENGTH = 5000  # chars — truncate very long pages
-
-
-def _extract_date(soup: BeautifulSoup) -> Optional[datetime]:
-    """Try to extract publication date from common meta tags."""
-    for meta_name in [
-        "article:published_time", "og:article:published_time",
-        "datePublished", "DC.date", "pubdate",
-    ]:
-        tag = soup.find("meta", property=meta_name) or soup.find("meta", attrs={"name": meta_name})
-        if tag and tag.get("content"):
-            try:
-                from dateutil.parser import parse as parse_date
-                return parse_date(tag["content"]).astimezone(timezone.utc).replace(tzinfo=timezone.utc)
-            except Exception:
-                pass
-    # Try time[datetime] tags
-    time_tag = soup.find("time", datetime=True)
-    if time_tag:
-        try:
-            from dateutil.parser import parse as parse_date
-            return parse_date(time_tag["datetime"]).astimezone(timezone.utc).replace(tzinfo=timezone.utc)
-        except Exception:
-            pass
-    return None
-
-
-def _extract_main_content(soup: BeautifulSoup) -> str:
-    """Extract main article text from a page."""
-    # Remove boilerplate
-    for tag in soup.find_all(["nav", "footer", "aside", "script", "style", "header"]):
-        tag.decompose()
-
-    # Try common article containers
-    for selector in ["article", "main", '[role="main"]', ".post-content", ".entry-content", ".article-body"]:
-        el = soup.select_one(selector)
-        if el:
-            text = el.get_text(separator=" ")
-            return re.sub(r'\s+', ' ', text).strip()[:MAX_CONTENT_LENGTH]
-
-    # Fallback: all paragraph text
-    paras = soup.find_all("p")
-    text = " ".join(p.get_text() for p in paras)
-    return re.sub(r'\s+', ' ', text).strip()[:MAX_CONTENT_LENGTH]
-
-
-def fetch_page(source_name: str, url: str, tier: int) -> list[CollectedItem]:
+MAX_CONTENT_LENGTH = extractor.MAX_CONTENT_LENGTH
+
+
+def fetch_page(
+    source_name: str,
+    url: str,
+    tier: int,
+    selectors: Optional[dict] = None,
+    max_bytes: Optional[int] = None,
+) -> list[CollectedItem]:
     """
     Scrape a web page and return CollectedItems.
     For changelog/listing pages, may return multiple items.
     For article pages, returns one item.
+    `selectors` are per-source CSS overrides (see extractor).
+    The download is capped at max_bytes and, without overrides, stops as soon
+    as the main article has been received.
     """
-    headers = {"User-Agent": USER_AGENT}
+    headers = http_cache.conditional_headers(url)
+    stop = None if selectors else extractor.ContentWatcher(MAX_CONTENT_LENGTH)
     try:
-        resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+        resp = http_client.get(url, headers=headers, max_bytes=max_bytes, stop=stop)
     except requests.RequestException as e:
         raise ConnectionError(f"Failed to fetch {url}: {e}") from e
 
+    if http_cache.is_unchanged(url, resp):
+        return []  # 304 or identical body — nothing new on the page
     if resp.status_code != 200:
         raise ConnectionError(f"HTTP {resp.status_code} from {url}")
+    canonical.record_redirect(url, getattr(resp, "url", None))
 
-    soup = BeautifulSoup(resp.content, "html.parser")
-
-    # Extract title
-    title_tag = soup.find("title") or soup.find("h1")
-    title = title_tag.get_text().strip() if title_tag else source_name
-
-    # Clean title
-    title = re.sub(r'\s+', ' ', title)[:200]
+    item = _page_item(source_name, url, tier, resp.content, selectors)
+    pending.defer(http_cache.remember, url, resp)  # once the item is stored
+    return [item]
 
-    content = _extract_main_content(soup)
-    if not content:
-        content = title
 
-    published_at = _extract_date(soup)
+def _page_item(
+    source_name: str, url: str, tier: int, html: bytes, selectors: Optional[dict] = None
+) -> CollectedItem:
+    """Build the single whole-page item from an already fetched page."""
+    page = extractor.extract(html, selectors)
+    title = page.title or source_name
+    content = page.content or title
     tags, _ = tag_item(title, content)
 
-    item = CollectedItem(
+    return CollectedItem(
         source_name=source_name,
         source_tier=tier,
         url=url,
         title=title,
         raw_content=content,
-        published_at=published_at,
+        published_at=page.published_at,
         tags=tags,
     )
-    return [item]
 
 
-def fetch_changelog_entries(source_name: str, url: str, tier: int) -> list[CollectedItem]:
+def _fingerprint(text: str) -> str:
+    """
+    Hash of a section's wording only: case, whitespace and punctuation edits
+    (re-rendered markup, reflowed text) do not count as a material change.
+    """
+    words = re.findall(r"\w+", text.lower())
+    return hashlib.sha256(" ".join(words).encode()).hexdigest()
+
+
+def _section_anchor(header, header_text: str, used: set[str]) -> str:
+    """Stable anchor for a section: the page's own id if any, else a slug of the header."""
+    anchor = header.get("id")
+    if not anchor:
+        inner = header.find(attrs={"id": True}) or header.find("a", attrs={"name": True})
+        if inner:
+            anchor = inner.get("id") or inner.get("name")
+    if not anchor:
+        anchor = re.sub(r"[^a-z0-9]+", "-", header_text.lower()).strip("-") or "section"
+    base, n = anchor, 2
+    while anchor in used:
+        anchor = f"{base}-{n}"
+        n += 1
+    used.add(anchor)
+    return anchor
+
+
+def fetch_changelog_entries(
+    source_name: str, url: str, tier: int, max_bytes: Optional[int] = None
+) -> list[CollectedItem]:
     """
     Scrape a changelog page and extract individual entries as separate items.
     Each dated section becomes one CollectedItem.
     """
-    headers = {"User-Agent": USER_AGENT}
+    headers = http_cache.conditional_headers(url)
     try:
-        resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+        resp = http_client.get(url, headers=headers, max_bytes=max_bytes)
     except requests.RequestException as e:
         raise ConnectionError(f"Failed to fetch {url}: {e}") from e
 
+    if http_cache.is_unchanged(url, resp):
+        return []  # 304 or identical body — nothing new on the page
     if resp.status_code != 200:
         raise ConnectionError(f"HTTP {resp.status_code} from {url}")
 
     soup = BeautifulSoup(resp.content, "html.parser")
+    known = store.get_changelog_fingerprints(url)
     items = []
+    snapshots: list[tuple[str, str, str]] = []
 
     # Try to find dated sections (h2/h3 with dates, common in changelogs)
     date_pattern = re.compile(
@@ -132,7 +132,7 @@ def fetch_changelog_entries(source_name: str, url: str, tier: int) -> list[Colle
         re.IGNORECASE
     )
     sections = soup.find_all(["h2", "h3"])
-    found_sections = False
+    used_anchors: set[str] = set()
 
     for header in sections[:10]:  # Limit to 10 most recent
         header_text = header.get_text().strip()
@@ -154,12 +154,17 @@ def fetch_changelog_entries(source_name: str, url: str, tier: int) -> list[Colle
         if not content:
             continue
 
-        found_sections = True
+        anchor = _section_anchor(header, header_text, used_anchors)
+        fingerprint = _fingerprint(content)
+        snapshots.append((anchor, fingerprint, header_text))
+        if known.get(anchor) == fingerprint:
+            continue  # unchanged since the last snapshot
+
         tags, _ = tag_item(header_text, content)
         item = CollectedItem(
             source_name=source_name,
             source_tier=tier,
-            url=url,
+            url=f"{url}#{anchor}",
             title=f"{source_name}: {header_text}",
             raw_content=content,
             published_at=None,
@@ -167,8 +172,15 @@ def fetch_changelog_entries(source_name: str, url: str, tier: int) -> list[Colle
         )
         items.append(item)
 
-    if not found_sections:
-        # Fallback: treat whole page as one item
-        return fetch_page(source_name, url, tier)
-
+    if not snapshots:
+        # Fallback: treat whole page as one item, reusing the parsed response
+        item = _page_item(source_name, url, tier, resp.content)
+        fingerprint = _fingerprint(item.raw_content)
+        snapshots.append(("", fingerprint, item.title))
+        if known.get("") != fingerprint:
+            items.append(item)
+
+    # Snapshot and validators are committed once the items are stored
+    pending.defer(store.save_changelog_sections, url, snapshots)
+    pending.defer(http_cache.remember, url, resp)
     return items
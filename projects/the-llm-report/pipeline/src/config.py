@@ -41,3 +41,9 @@ def get_budget_caps() -> dict[str, float]:
         "per_day": float(caps.get("per_day", 20.0)),
         "per_month": float(caps.get("per_month", 200.0)),
     }
+
+
+def get_triage_batch_size() -> int:
+    """Items per triage request (optimization.triage_batch_size); 1 = one request per item."""
+    optimization = load_budget().get("optimization", {})
+    return max(1, int(optimization.get("triage_batch_size", 1)))
@@ -1,2 +1,2 @@
 # The LLM Report — Knowledge Base Package
-from pipeline.src.kb import store, vector_store, semantic_cache, kb_query
+from pipeline.src.kb import near_dup, store, vector_store, semantic_cache, kb_query, embedding_queue
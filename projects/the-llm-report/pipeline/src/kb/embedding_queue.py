@@ -0,0 +1,76 @@
+"""
+The LLM Report — Background Embedding Queue
+In-process worker that embeds newly stored items while collection keeps
+fetching, so CPU-bound encoding overlaps network-bound I/O.
+Callers drain the queue right before a stage that needs the vectors.
+"""
+
+from __future__ import annotations
+import queue
+import threading
+from typing import Optional
+
+from pipeline.src.kb import vector_store
+
+_STOP = object()
+
+
+class EmbeddingQueue:
+    """
+    Accepts batches of embed_items entries and embeds them on a worker thread.
+    Entries queued while the worker is busy are coalesced into the next batch.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or vector_store.EMBED_BATCH_SIZE
+        self.failures: dict[str, str] = {}
+        self.submitted = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._drained = False
+
+    def submit(self, entries: list[dict]) -> None:
+        """Queue entries ({item_id, title, content, metadata}) for embedding."""
+        if not entries:
+            return
+        if self._drained:
+            raise RuntimeError("EmbeddingQueue already drained")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="embedding-worker", daemon=True)
+            self._thread.start()
+        self.submitted += len(entries)
+        self._queue.put(list(entries))
+
+    def drain(self, timeout: Optional[float] = None) -> dict[str, str]:
+        """
+        Wait for every queued item to be embedded and stop the worker.
+        Returns {item_id: error} for items that failed. Safe to call twice.
+        """
+        if not self._drained:
+            self._drained = True
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join(timeout)
+        return self.failures
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = self._queue.get()
+            if batch is _STOP:
+                break
+            # Coalesce whatever else is already waiting into one bigger batch
+            while len(batch) < self.batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is _STOP:
+                    stop = True
+                    break
+                batch.extend(extra)
+            try:
+                self.failures.update(vector_store.embed_items(batch, batch_size=self.batch_size))
+            except Exception as e:
+                for entry in batch:
+                    self.failures[entry["item_id"]] = str(e)
@@ -34,6 +34,7 @@ def query(
     entity_names: Optional[list[str]] = None,
     cache_type: str = "factual",
     sufficiency_check: Optional[Callable[[KBContext], bool]] = None,
+    check_cache: bool = True,
 ) -> KBContext:
     """
     Execute the KB-First Query Pattern.
@@ -50,6 +51,7 @@ def query(
         entity_names: Optional list of model/org names to look up
         cache_type: "factual" (7-day TTL) or "news" (1-day TTL)
         sufficiency_check: Optional callable to determine if context is sufficient
+        check_cache: Set False to skip Step 1 and always assemble fresh context
 
     Returns:
         KBContext with all retrieved context. Cache hit = $0 guaranteed.
@@ -57,7 +59,7 @@ def query(
     ctx = KBContext()
 
     # Step 1: Semantic cache check
-    cached = semantic_cache.check_cache(query_text, cache_type=cache_type)
+    cached = semantic_cache.check_cache(query_text, cache_type=cache_type) if check_cache else None
     if cached:
         ctx.cache_hit = True
         ctx.cached_response = cached
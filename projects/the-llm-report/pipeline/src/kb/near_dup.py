@@ -0,0 +1,81 @@
+"""
+The LLM Report — Near-Duplicate Fingerprints
+MinHash signatures over word 3-shingles of title + content. Two items whose
+estimated Jaccard similarity is at least THRESHOLD are treated as the same
+story (a republished post with a new date line, tracking snippet or footer).
+
+Lookup uses LSH banding: the NUM_PERM signature values are split into BANDS
+bands of ROWS values and each band is hashed to a bucket. The store indexes
+(band, bucket), so candidates come from an indexed equality query and only
+they are compared signature against signature. With 16 bands of 4 rows a
+pair at 0.7 similarity shares a bucket ~99% of the time.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import re
+from typing import Optional
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.7"))
+# Shorter texts are too small for a stable signature (exact dedup only)
+MIN_WORDS = int(os.environ.get("NEAR_DUP_MIN_WORDS", "20"))
+
+_WORD = re.compile(r"\w+")
+_PRIME = (1 << 31) - 1
+_perms = None
+
+
+def _permutations():
+    """Fixed (a, b) pairs for h(x) = (a*x + b) mod p — signatures must be stable across runs."""
+    global _perms
+    if _perms is None:
+        import numpy as np
+        rng = np.random.default_rng(20260101)
+        _perms = (
+            rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64),
+            rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64),
+        )
+    return _perms
+
+
+def signature(text: str) -> Optional[bytes]:
+    """NUM_PERM uint32 MinHash values of `text`, or None if it has fewer than MIN_WORDS words."""
+    import numpy as np
+
+    words = _WORD.findall(text.lower())
+    if len(words) < max(MIN_WORDS, SHINGLE_SIZE):
+        return None
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    x = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    a, b = _permutations()
+    hashed = (np.outer(x, a) + b) % _PRIME  # a < 2^31, x < 2^32: no uint64 overflow
+    return hashed.min(axis=0).astype("<u4").tobytes()
+
+
+def similarity(sig_a: bytes, sig_b: bytes) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature values."""
+    import numpy as np
+
+    a = np.frombuffer(sig_a, dtype="<u4")
+    b = np.frombuffer(sig_b, dtype="<u4")
+    return float((a == b).mean())
+
+
+def buckets(sig: bytes) -> list[tuple[int, int]]:
+    """(band, bucket) pairs; the bucket is a signed 64-bit hash of the band's values."""
+    width = ROWS * 4
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(sig[band * width:(band + 1) * width], digest_size=8).digest(), "big", signed=True,
+        ))
+        for band in range(BANDS)
+    ]
@@ -1,6 +1,9 @@
 """
 The LLM Report — SQLite Structured Store
-Manages: models, organizations, published_articles, source_items, run_log, cost_log
+Manages: models, organizations, published_articles, source_items, run_log, cost_log,
+http_cache, feed_watermarks, changelog_sections, collector_state, discovered_pages,
+minhash_signatures, minhash_bands, near_duplicates, canonical_urls, seen_urls,
+source_stats, pre_triage_log, triage_labels, triage_cache
 """
 
 from __future__ import annotations
@@ -12,7 +15,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from pipeline.src.models import CollectedItem, RunState
+from pipeline.src.models import CollectedItem, RunState, TriagedItem
+from pipeline.src.kb import near_dup
 
 DB_PATH = Path(
     os.environ.get(
@@ -99,27 +103,193 @@ CREATE TABLE IF NOT EXISTS cost_log (
 );
 CREATE INDEX IF NOT EXISTS idx_cost_run ON cost_log(run_id);
 CREATE INDEX IF NOT EXISTS idx_cost_time ON cost_log(timestamp);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feed_watermarks (
+    feed_url TEXT PRIMARY KEY,
+    last_guid TEXT,
+    last_link TEXT,
+    newest_published_at TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS changelog_sections (
+    source_url TEXT NOT NULL,
+    anchor TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    title TEXT,
+    first_seen_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source_url, anchor)
+);
+
+CREATE TABLE IF NOT EXISTS collector_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS discovered_pages (
+    page_url TEXT PRIMARY KEY,
+    source_url TEXT NOT NULL,
+    lastmod TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_discovered_source ON discovered_pages(source_url);
+
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    item_id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, item_id)
+);
+
+CREATE TABLE IF NOT EXISTS near_duplicates (
+    content_hash TEXT PRIMARY KEY,
+    original_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    detected_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_near_dup_original ON near_duplicates(original_id);
+
+CREATE TABLE IF NOT EXISTS canonical_urls (
+    url TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    resolved_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seen_urls (
+    canonical_url TEXT PRIMARY KEY,
+    source_name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS source_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    polled_at TEXT NOT NULL,
+    items_fetched INTEGER NOT NULL DEFAULT 0,
+    items_new INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    latency_s REAL NOT NULL DEFAULT 0.0,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+    http_status INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_source_stats_source ON source_stats(source_name, polled_at);
+
+CREATE TABLE IF NOT EXISTS pre_triage_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    source_tier INTEGER NOT NULL,
+    decided_at TEXT NOT NULL,
+    is_ambiguous INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    archived_similarity REAL NOT NULL,
+    confidence REAL NOT NULL,
+    decision TEXT NOT NULL,
+    skipped_llm INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pre_triage_item ON pre_triage_log(item_id);
+
+CREATE TABLE IF NOT EXISTS triage_labels (
+    item_id TEXT PRIMARY KEY,
+    significance INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    labelled_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS triage_cache (
+    content_hash TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    significance INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    suggested_headline TEXT NOT NULL,
+    promoted INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (content_hash, prompt_version, model)
+);
 """
 
 
+# DB files whose schema has already been applied by this process
+_schema_ready: set[str] = set()
+
+# SQLite's default host-parameter limit is 999; stay well under it
+_SQL_PARAM_CHUNK = 500
+
+
 @contextmanager
 def _conn():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    db_key = str(DB_PATH)
+    fresh = not DB_PATH.exists()
+    conn = sqlite3.connect(db_key)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     try:
-        for statement in SCHEMA.strip().split(";"):
-            s = statement.strip()
-            if s:
-                conn.execute(s)
-        conn.commit()
+        if fresh or db_key not in _schema_ready:
+            for statement in SCHEMA.strip().split(";"):
+                s = statement.strip()
+                if s:
+                    conn.execute(s)
+            conn.commit()
+            _schema_ready.add(db_key)
         yield conn
     finally:
         conn.close()
 
 
+def _item_row(item: CollectedItem) -> tuple:
+    return (
+        item.id,
+        item.source_name,
+        item.source_tier,
+        item.url,
+        item.title,
+        item.raw_content,
+        item.content_hash,
+        item.published_at.isoformat() if item.published_at else None,
+        item.collected_at.isoformat(),
+        json.dumps(item.tags),
+        item.significance_score,
+        int(item.promoted),
+    )
+
+
+_INSERT_ITEM_SQL = """
+    INSERT OR IGNORE INTO source_items
+        (id, source_name, source_tier, url, title, raw_content,
+         content_hash, published_at, collected_at, tags,
+         significance_score, promoted)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def item_exists(content_hash: str) -> bool:
     """Check if an item with this content_hash already exists."""
     with _conn() as conn:
@@ -135,37 +305,161 @@ def store_item(item: CollectedItem) -> bool:
     """
     with _conn() as conn:
         try:
+            conn.execute(_INSERT_ITEM_SQL, _item_row(item))
+            inserted = conn.execute("SELECT changes()").fetchone()[0]
+            conn.commit()
+            return inserted > 0
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def _known_hashes(conn: sqlite3.Connection, content_hashes: list[str]) -> set[str]:
+    """Hashes already stored, or already linked as near-duplicates of a stored item."""
+    found: set[str] = set()
+    for i in range(0, len(content_hashes), _SQL_PARAM_CHUNK):
+        chunk = content_hashes[i:i + _SQL_PARAM_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"""
+            SELECT content_hash FROM source_items WHERE content_hash IN ({placeholders})
+            UNION
+            SELECT content_hash FROM near_duplicates WHERE content_hash IN ({placeholders})
+            """,
+            chunk + chunk,
+        ).fetchall()
+        found.update(r["content_hash"] for r in rows)
+    return found
+
+
+def _find_near_duplicate(
+    conn: sqlite3.Connection,
+    item: CollectedItem,
+    sig: bytes,
+    buckets: list[tuple[int, int]],
+    batch: dict[str, CollectedItem],
+) -> Optional[tuple[str, float]]:
+    """
+    (original item id, similarity) of the most similar indexed item at or above THRESHOLD.
+    Other pages of the item's own source never count: consecutive release
+    notes or changelog sections share a template, not a story. `batch`
+    holds items indexed earlier in this ingest, not yet in source_items.
+    """
+    placeholders = ",".join("(?, ?)" for _ in buckets)
+    rows = conn.execute(
+        f"""
+        SELECT s.item_id, s.signature, i.source_name, i.url
+        FROM minhash_signatures s LEFT JOIN source_items i ON i.id = s.item_id
+        WHERE s.item_id IN (
+            SELECT item_id FROM minhash_bands WHERE (band, bucket) IN (VALUES {placeholders})
+        )
+        """,
+        [v for pair in buckets for v in pair],
+    ).fetchall()
+    best = None
+    for r in rows:
+        earlier = batch.get(r["item_id"])
+        source_name, url = (earlier.source_name, earlier.url) if earlier else (r["source_name"], r["url"])
+        if source_name == item.source_name and url != item.url:
+            continue
+        score = near_dup.similarity(sig, r["signature"])
+        if score >= near_dup.THRESHOLD and (best is None or score > best[1]):
+            best = (r["item_id"], score)
+    return best
+
+
+def _split_near_duplicates(conn: sqlite3.Connection, items: list[CollectedItem]) -> list[CollectedItem]:
+    """
+    Index the MinHash signature of each item and link near-duplicates to
+    their original in near_duplicates instead of storing them.
+    Returns the originals. Runs inside ingest_items' transaction, so items
+    earlier in the batch are already indexed for the ones after them.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    originals: list[CollectedItem] = []
+    indexed: dict[str, CollectedItem] = {}
+    for item in items:
+        sig = near_dup.signature(f"{item.title}\n{item.raw_content}")
+        if sig is None:
+            originals.append(item)
+            continue
+        buckets = near_dup.buckets(sig)
+        match = _find_near_duplicate(conn, item, sig, buckets, indexed)
+        if match is not None:
             conn.execute(
                 """
-                INSERT OR IGNORE INTO source_items
-                    (id, source_name, source_tier, url, title, raw_content,
-                     content_hash, published_at, collected_at, tags,
-                     significance_score, promoted)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT OR IGNORE INTO near_duplicates
+                    (content_hash, original_id, source_name, url, title, similarity, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    item.id,
-                    item.source_name,
-                    item.source_tier,
-                    item.url,
-                    item.title,
-                    item.raw_content,
-                    item.content_hash,
-                    item.published_at.isoformat() if item.published_at else None,
-                    item.collected_at.isoformat(),
-                    json.dumps(item.tags),
-                    item.significance_score,
-                    int(item.promoted),
-                ),
+                (item.content_hash, match[0], item.source_name, item.url, item.title, match[1], now),
             )
-            inserted = conn.execute("SELECT changes()").fetchone()[0]
+            continue
+        originals.append(item)
+        indexed[item.id] = item
+        conn.execute(
+            "INSERT OR IGNORE INTO minhash_signatures (item_id, signature) VALUES (?, ?)", (item.id, sig)
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO minhash_bands (band, bucket, item_id) VALUES (?, ?, ?)",
+            [(band, bucket, item.id) for band, bucket in buckets],
+        )
+    return originals
+
+
+def existing_hashes(content_hashes: list[str]) -> set[str]:
+    """Return the subset of `content_hashes` already stored."""
+    with _conn() as conn:
+        return _known_hashes(conn, content_hashes)
+
+
+def ingest_items(items: list[CollectedItem], near_duplicates: bool = False) -> list[CollectedItem]:
+    """
+    Bulk ingest: dedup a whole batch against content_hash and insert the
+    survivors with executemany in a single transaction.
+    Returns exactly the items that were newly inserted, in input order.
+    Duplicates within the batch keep only their first occurrence.
+    With near_duplicates=True, items whose MinHash similarity to a stored
+    (or earlier) item of another source, or to the same URL, reaches
+    near_dup.THRESHOLD are not inserted but linked to it in near_duplicates
+    (see get_near_duplicates).
+    """
+    if not items:
+        return []
+    with _conn() as conn:
+        try:
+            # IMMEDIATE takes the write lock up front so the dedup read and
+            # the insert see the same table state
+            conn.execute("BEGIN IMMEDIATE")
+            known = _known_hashes(conn, list({item.content_hash for item in items}))
+
+            new_items = []
+            for item in items:
+                if item.content_hash in known:
+                    continue
+                known.add(item.content_hash)
+                new_items.append(item)
+            if near_duplicates:
+                new_items = _split_near_duplicates(conn, new_items)
+
+            conn.executemany(_INSERT_ITEM_SQL, [_item_row(item) for item in new_items])
             conn.commit()
-            return inserted > 0
+            return new_items
         except Exception:
             conn.rollback()
             raise
 
 
+def get_near_duplicates(original_id: str) -> list[dict]:
+    """Items linked to `original_id` as near-duplicates, oldest first."""
+    with _conn() as conn:
+        rows = conn.execute(
+            "SELECT * FROM near_duplicates WHERE original_id = ? ORDER BY detected_at, url",
+            (original_id,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
 def update_item_significance(item_id: str, score: float, promoted: bool) -> None:
     with _conn() as conn:
         conn.execute(
@@ -352,6 +646,447 @@ def get_untriaged_items(days: int = 3) -> list[CollectedItem]:
     return items
 
 
+def get_http_cache(url: str) -> Optional[dict]:
+    """Get stored HTTP validators and body hash for a URL."""
+    with _conn() as conn:
+        row = conn.execute(
+            "SELECT * FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def save_http_cache(
+    url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    body_hash: Optional[str],
+) -> None:
+    """Upsert HTTP validators and body hash for a URL."""
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO http_cache (url, etag, last_modified, body_hash, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                fetched_at = excluded.fetched_at
+            """,
+            (url, etag, last_modified, body_hash, datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+
+
+def get_feed_watermark(feed_url: str) -> Optional[dict]:
+    """Get the newest entry seen in a feed on a previous run."""
+    with _conn() as conn:
+        row = conn.execute(
+            "SELECT * FROM feed_watermarks WHERE feed_url = ?", (feed_url,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def save_feed_watermark(
+    feed_url: str,
+    last_guid: Optional[str],
+    last_link: Optional[str],
+    newest_published_at: Optional[datetime],
+) -> None:
+    """Upsert the newest seen entry (GUID/link and published date) for a feed."""
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO feed_watermarks (feed_url, last_guid, last_link, newest_published_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                last_guid = excluded.last_guid,
+                last_link = excluded.last_link,
+                newest_published_at = excluded.newest_published_at,
+                updated_at = excluded.updated_at
+            """,
+            (
+                feed_url,
+                last_guid,
+                last_link,
+                newest_published_at.isoformat() if newest_published_at else None,
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        conn.commit()
+
+
+def get_changelog_fingerprints(source_url: str) -> dict[str, str]:
+    """Get {anchor: fingerprint} for every section seen on a changelog page."""
+    with _conn() as conn:
+        rows = conn.execute(
+            "SELECT anchor, fingerprint FROM changelog_sections WHERE source_url = ?",
+            (source_url,),
+        ).fetchall()
+        return {row["anchor"]: row["fingerprint"] for row in rows}
+
+
+def save_changelog_sections(source_url: str, sections: list[tuple[str, str, str]]) -> None:
+    """Upsert (anchor, fingerprint, title) snapshots for a changelog page."""
+    if not sections:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO changelog_sections (source_url, anchor, fingerprint, title, first_seen_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_url, anchor) DO UPDATE SET
+                fingerprint = excluded.fingerprint,
+                title = excluded.title,
+                updated_at = excluded.updated_at
+            """,
+            [(source_url, anchor, fp, title, now, now) for anchor, fp, title in sections],
+        )
+        conn.commit()
+
+
+def get_collector_state(key: str) -> Optional[str]:
+    """Get a collector's persisted value (cursor, cached listing) by key."""
+    with _conn() as conn:
+        row = conn.execute(
+            "SELECT value FROM collector_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+
+def save_collector_state(key: str, value: str) -> None:
+    """Upsert a collector's persisted value."""
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO collector_state (key, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            (key, value, datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+
+
+def get_discovered_pages(source_url: str) -> dict[str, Optional[str]]:
+    """Get {page_url: lastmod} for article pages already fetched for a source."""
+    with _conn() as conn:
+        rows = conn.execute(
+            "SELECT page_url, lastmod FROM discovered_pages WHERE source_url = ?",
+            (source_url,),
+        ).fetchall()
+        return {row["page_url"]: row["lastmod"] for row in rows}
+
+
+def save_discovered_page(source_url: str, page_url: str, lastmod: Optional[str]) -> None:
+    """Record that an article page was fetched at the given sitemap lastmod."""
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO discovered_pages (page_url, source_url, lastmod, fetched_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(page_url) DO UPDATE SET
+                source_url = excluded.source_url,
+                lastmod = excluded.lastmod,
+                fetched_at = excluded.fetched_at
+            """,
+            (page_url, source_url, lastmod, datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+
+
+def get_canonical_urls(urls: list[str]) -> dict[str, str]:
+    """Return {normalized url: cached canonical form (after redirects)} for the given URLs."""
+    found: dict[str, str] = {}
+    with _conn() as conn:
+        for i in range(0, len(urls), _SQL_PARAM_CHUNK):
+            chunk = urls[i:i + _SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT url, canonical_url FROM canonical_urls WHERE url IN ({placeholders})", chunk
+            ).fetchall()
+            found.update((r["url"], r["canonical_url"]) for r in rows)
+    return found
+
+
+def save_canonical_url(url: str, canonical_url: str) -> None:
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO canonical_urls (url, canonical_url, resolved_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                canonical_url = excluded.canonical_url,
+                resolved_at = excluded.resolved_at
+            """,
+            (url, canonical_url, datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+
+
+def get_seen_urls(canonical_urls: list[str]) -> dict[str, dict]:
+    """Return {canonical_url: seen_urls row} for the URLs already collected."""
+    found: dict[str, dict] = {}
+    with _conn() as conn:
+        for i in range(0, len(canonical_urls), _SQL_PARAM_CHUNK):
+            chunk = canonical_urls[i:i + _SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT * FROM seen_urls WHERE canonical_url IN ({placeholders})", chunk
+            ).fetchall()
+            found.update((r["canonical_url"], dict(r)) for r in rows)
+    return found
+
+
+def save_seen_urls(entries: list[tuple[str, str, str]]) -> None:
+    """
+    Record (canonical_url, source_name, content_hash) for collected items.
+    The first source to deliver a URL keeps ownership; later sightings only
+    refresh last_seen_at and the content hash.
+    """
+    if not entries:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO seen_urls (canonical_url, source_name, content_hash, first_seen_at, last_seen_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(canonical_url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                last_seen_at = excluded.last_seen_at
+            """,
+            [(url, source_name, content_hash, now, now) for url, source_name, content_hash in entries],
+        )
+        conn.commit()
+
+
+def record_source_stats(
+    run_id: str,
+    source_name: str,
+    items_fetched: int,
+    items_new: int,
+    bytes_received: int,
+    latency_s: float,
+    attempts: int = 1,
+    error: Optional[str] = None,
+    http_status: Optional[int] = None,
+) -> None:
+    """Log the outcome of polling one source in one run (see collect/scheduler)."""
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO source_stats
+                (run_id, source_name, polled_at, items_fetched, items_new, bytes,
+                 latency_s, attempts, error, http_status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                run_id, source_name, datetime.now(timezone.utc).isoformat(),
+                items_fetched, items_new, bytes_received, latency_s, attempts, error, http_status,
+            ),
+        )
+        conn.commit()
+
+
+def get_source_stats(source_names: list[str], limit: int = 20) -> dict[str, list[dict]]:
+    """Return {source_name: last `limit` polls, newest first}."""
+    history: dict[str, list[dict]] = {name: [] for name in source_names}
+    with _conn() as conn:
+        for i in range(0, len(source_names), _SQL_PARAM_CHUNK):
+            chunk = source_names[i:i + _SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY source_name ORDER BY polled_at DESC, id DESC
+                    ) AS rn
+                    FROM source_stats WHERE source_name IN ({placeholders})
+                ) WHERE rn <= ? ORDER BY source_name, rn
+                """,
+                chunk + [limit],
+            ).fetchall()
+            for r in rows:
+                row = dict(r)
+                row.pop("rn")
+                history[row["source_name"]].append(row)
+    return history
+
+
+def get_archived_similarity(signatures: list[Optional[bytes]]) -> list[float]:
+    """
+    For each MinHash signature, the highest similarity to an item the triage
+    LLM archived (significance 1-3). Items archived by the pre-triage filter
+    or the predictor are not counted. None signatures (too short) score 0.0.
+    """
+    scores = []
+    with _conn() as conn:
+        for sig in signatures:
+            if sig is None:
+                scores.append(0.0)
+                continue
+            buckets = near_dup.buckets(sig)
+            placeholders = ",".join("(?, ?)" for _ in buckets)
+            rows = conn.execute(
+                f"""
+                SELECT m.signature FROM minhash_signatures m
+                JOIN source_items s ON s.id = m.item_id
+                WHERE m.item_id IN (
+                    SELECT item_id FROM minhash_bands WHERE (band, bucket) IN (VALUES {placeholders})
+                )
+                  AND s.significance_score BETWEEN 1 AND 3
+                  AND m.item_id NOT IN (
+                    SELECT item_id FROM pre_triage_log WHERE skipped_llm = 1
+                  )
+                  AND m.item_id NOT IN (
+                    SELECT item_id FROM triage_labels WHERE source = 'predicted'
+                  )
+                """,
+                [v for pair in buckets for v in pair],
+            ).fetchall()
+            scores.append(max((near_dup.similarity(sig, r["signature"]) for r in rows), default=0.0))
+    return scores
+
+
+def log_pre_triage(run_id: str, decisions: list[dict]) -> None:
+    """Record pre-triage decisions (see triage/pre_triage) for threshold tuning."""
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO pre_triage_log
+                (run_id, item_id, source_name, source_tier, decided_at, is_ambiguous,
+                 word_count, archived_similarity, confidence, decision, skipped_llm)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    run_id, d["item_id"], d["source_name"], d["source_tier"], now, int(d["is_ambiguous"]),
+                    d["word_count"], d["archived_similarity"], d["confidence"], d["decision"], int(d["skipped_llm"]),
+                )
+                for d in decisions
+            ],
+        )
+        conn.commit()
+
+
+def get_pre_triage_outcomes() -> list[dict]:
+    """
+    Logged pre-triage decisions for items that went on to LLM triage, with the
+    significance the LLM gave them — the labelled data for calibrating the threshold.
+    Items scored by the predictor instead of the LLM are left out.
+    """
+    with _conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT p.*, s.significance_score FROM pre_triage_log p
+            JOIN source_items s ON s.id = p.item_id
+            WHERE p.skipped_llm = 0 AND s.significance_score >= 1
+              AND p.item_id NOT IN (SELECT item_id FROM triage_labels WHERE source = 'predicted')
+            ORDER BY p.decided_at
+            """
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def save_triage_labels(labels: list[tuple[str, int, str]], source: str = "llm") -> None:
+    """
+    Record (item_id, significance, category) triage results. `source` is
+    "llm" for LLM triage or "predicted" for triage/predictor output, which is
+    kept out of the training labels.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as conn:
+        conn.executemany(
+            """
+            INSERT INTO triage_labels (item_id, significance, category, source, labelled_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(item_id) DO UPDATE SET
+                significance = excluded.significance,
+                category = excluded.category,
+                source = excluded.source,
+                labelled_at = excluded.labelled_at
+            """,
+            [(item_id, significance, category, source, now) for item_id, significance, category in labels],
+        )
+        conn.commit()
+
+
+def get_triage_labels(item_ids: Optional[list[str]] = None) -> dict[str, dict]:
+    """
+    Return {item_id: {"significance", "category"}} for items scored by the
+    triage LLM — all of them, or those among `item_ids`. Significance comes
+    from source_items, so items triaged before triage_labels existed are
+    included with category None. Predicted and pre-triage-archived items are not.
+    """
+    sql = """
+        SELECT s.id, s.significance_score, l.category FROM source_items s
+        LEFT JOIN triage_labels l ON l.item_id = s.id
+        WHERE s.significance_score >= 1
+          AND COALESCE(l.source, 'llm') = 'llm'
+          AND s.id NOT IN (SELECT item_id FROM pre_triage_log WHERE skipped_llm = 1)
+    """
+    labels: dict[str, dict] = {}
+    with _conn() as conn:
+        if item_ids is None:
+            chunks = [conn.execute(sql).fetchall()]
+        else:
+            chunks = []
+            for i in range(0, len(item_ids), _SQL_PARAM_CHUNK):
+                chunk = item_ids[i:i + _SQL_PARAM_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                chunks.append(conn.execute(f"{sql} AND s.id IN ({placeholders})", chunk).fetchall())
+    for rows in chunks:
+        for r in rows:
+            labels[r["id"]] = {"significance": int(round(r["significance_score"])), "category": r["category"]}
+    return labels
+
+
+def get_triage_cache(content_hashes: list[str], prompt_version: str, model: str) -> dict[str, dict]:
+    """Return {content_hash: cached triage fields} for hashes triaged with this prompt version and model."""
+    cached: dict[str, dict] = {}
+    with _conn() as conn:
+        for i in range(0, len(content_hashes), _SQL_PARAM_CHUNK):
+            chunk = content_hashes[i:i + _SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""
+                SELECT content_hash, significance, category, rationale, suggested_headline, promoted
+                FROM triage_cache
+                WHERE prompt_version = ? AND model = ? AND content_hash IN ({placeholders})
+                """,
+                [prompt_version, model] + chunk,
+            ).fetchall()
+            for r in rows:
+                row = dict(r)
+                row["promoted"] = bool(row["promoted"])
+                cached[row.pop("content_hash")] = row
+    return cached
+
+
+def save_triage_cache(triaged: list[TriagedItem], prompt_version: str, model: str) -> None:
+    """Cache triage results under (content_hash, prompt_version, model)."""
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO triage_cache
+                (content_hash, prompt_version, model, significance, category, rationale,
+                 suggested_headline, promoted, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    t.item.content_hash, prompt_version, model, t.significance, t.category,
+                    t.rationale, t.suggested_headline, int(t.promoted), now,
+                )
+                for t in triaged
+            ],
+        )
+        conn.commit()
+
+
 def get_model_info(name: str) -> Optional[dict]:
     """Get stored metadata for an AI model."""
     with _conn() as conn:
@@ -7,6 +7,7 @@ Chunking: 512 tokens per chunk, 50-token overlap
 
 from __future__ import annotations
 import os
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -23,25 +24,31 @@ CHROMA_PATH = Path(
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 CHUNK_SIZE = 512  # tokens (approximate as words for now)
 CHUNK_OVERLAP = 50
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "64"))  # chunks per encode/upsert call
 
 _client: Optional[chromadb.PersistentClient] = None
 _embed_fn: Optional[embedding_functions.SentenceTransformerEmbeddingFunction] = None
+_init_lock = threading.Lock()  # concurrent triage queries must not load the client/model twice
 
 
 def _get_client() -> chromadb.PersistentClient:
     global _client
     if _client is None:
-        CHROMA_PATH.mkdir(parents=True, exist_ok=True)
-        _client = chromadb.PersistentClient(path=str(CHROMA_PATH))
+        with _init_lock:
+            if _client is None:
+                CHROMA_PATH.mkdir(parents=True, exist_ok=True)
+                _client = chromadb.PersistentClient(path=str(CHROMA_PATH))
     return _client
 
 
 def _get_embed_fn() -> embedding_functions.SentenceTransformerEmbeddingFunction:
     global _embed_fn
     if _embed_fn is None:
-        _embed_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=EMBEDDING_MODEL
-        )
+        with _init_lock:
+            if _embed_fn is None:
+                _embed_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
+                    model_name=EMBEDDING_MODEL
+                )
     return _embed_fn
 
 
@@ -87,6 +94,56 @@ def embed_item(item_id: str, title: str, content: str, metadata: dict) -> None:
     )
 
 
+def embed_items(items: list[dict], batch_size: int = EMBED_BATCH_SIZE) -> dict[str, str]:
+    """
+    Batch-embed many collected items into the vector store.
+    Each entry carries the embed_item arguments: item_id, title, content, metadata.
+    Chunks from several items are encoded together (~batch_size chunks per
+    forward pass) and upserted in one call per batch. If a batch fails, its
+    items are retried one by one so a single bad item cannot sink the rest.
+
+    Returns {item_id: error message} for items that could not be embedded.
+    """
+    collection = _get_collection("source_items")
+    embed_fn = _get_embed_fn()
+    failures: dict[str, str] = {}
+
+    def flush(batch: list[tuple[dict, list[str]]]) -> None:
+        ids, documents, metadatas = [], [], []
+        for entry, chunks in batch:
+            for i, chunk in enumerate(chunks):
+                ids.append(f"{entry['item_id']}__chunk{i}")
+                documents.append(chunk)
+                metadatas.append({**entry["metadata"], "item_id": entry["item_id"], "chunk_index": i})
+        try:
+            collection.upsert(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
+                embeddings=embed_fn(documents),
+            )
+        except Exception:
+            for entry, _ in batch:
+                try:
+                    embed_item(entry["item_id"], entry["title"], entry["content"], entry["metadata"])
+                except Exception as e:
+                    failures[entry["item_id"]] = str(e)
+
+    batch: list[tuple[dict, list[str]]] = []
+    batch_chunks = 0
+    for entry in items:
+        chunks = _chunk_text(f"{entry['title']}\n\n{entry['content']}")
+        batch.append((entry, chunks))
+        batch_chunks += len(chunks)
+        if batch_chunks >= batch_size:
+            flush(batch)
+            batch, batch_chunks = [], 0
+    if batch:
+        flush(batch)
+
+    return failures
+
+
 def embed_article(article_id: str, title: str, content: str, metadata: dict) -> None:
     """Embed a published article into the vector store."""
     collection = _get_collection("published_articles")
@@ -124,6 +181,38 @@ def search_similar_items(query: str, n_results: int = 5) -> list[dict]:
     return items
 
 
+def find_item_neighbours(item_ids: list[str], n_results: int = 10) -> dict[str, list[tuple[str, float]]]:
+    """
+    Nearest other items for already-embedded items, queried with each item's
+    stored first-chunk embedding (nothing is re-encoded).
+    Returns {item_id: [(neighbour_item_id, similarity), ...]}, best first and
+    one entry per neighbour item. Items not in the store are left out.
+    """
+    collection = _get_collection("source_items")
+    count = collection.count()
+    if count == 0 or not item_ids:
+        return {}
+    stored = collection.get(ids=[f"{item_id}__chunk0" for item_id in item_ids], include=["embeddings", "metadatas"])
+    if not stored["ids"]:
+        return {}
+    # Over-fetch: neighbours come back per chunk, and the item itself is among them
+    results = collection.query(
+        query_embeddings=stored["embeddings"],
+        n_results=min(count, n_results * 3 + 1),
+        include=["metadatas", "distances"],
+    )
+    neighbours: dict[str, list[tuple[str, float]]] = {}
+    for q, meta in enumerate(stored["metadatas"]):
+        own_id = meta["item_id"]
+        best: dict[str, float] = {}
+        for hit, distance in zip(results["metadatas"][q], results["distances"][q]):
+            hit_id = hit.get("item_id")
+            if hit_id and hit_id != own_id and hit_id not in best:
+                best[hit_id] = 1 - distance
+        neighbours[own_id] = list(best.items())[:n_results]
+    return neighbours
+
+
 def search_similar_articles(query: str, n_results: int = 5) -> list[dict]:
     """Search published articles for KB context injection."""
     collection = _get_collection("published_articles")
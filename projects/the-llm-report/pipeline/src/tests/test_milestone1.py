@@ -4,6 +4,7 @@ Scenarios 1.1 through 1.5 from scenarios.md
 """
 
 from __future__ import annotations
+import json
 import os
 import sys
 import tempfile
@@ -194,7 +195,7 @@ class TestScenario14MalformedSourceHandling:
         errors = []
 
         # Source 1: HTTP 500
-        with patch("requests.get") as mock_get:
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
             mock_resp = MagicMock()
             mock_resp.status_code = 500
             mock_get.return_value = mock_resp
@@ -208,7 +209,7 @@ class TestScenario14MalformedSourceHandling:
         assert "500" in errors[0], "Error message should include status code"
 
         # Source 2: invalid/empty HTML
-        with patch("requests.get") as mock_get:
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
             mock_resp = MagicMock()
             mock_resp.status_code = 200
             mock_resp.content = b"<html><body>not a valid RSS feed</body></html>"
@@ -290,10 +291,11 @@ class TestScenario15GitHubAPICollection:
             },
         ]
 
-        with patch("requests.get") as mock_get:
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
             mock_resp = MagicMock()
             mock_resp.status_code = 200
             mock_resp.json.return_value = mock_releases
+            mock_resp.content = json.dumps(mock_releases).encode()
             mock_resp.headers = {}
             mock_get.return_value = mock_resp
 
@@ -408,5 +410,1224 @@ class TestTagging:
         assert len(mentions) >= 2
 
 
+class TestConcurrentCollection:
+    """run_collection fetches sources in parallel but ingests in config order."""
+
+    def _run(self, sources, fetch):
+        from pipeline.src.collect import collector
+        from pipeline.src.models import RunState
+
+        with patch.object(collector, "_load_sources", return_value=sources), \
+                patch.object(collector, "_fetch_source", side_effect=fetch), \
+                patch("pipeline.src.kb.vector_store.embed_items", return_value={}), \
+                patch.object(collector, "aslog"):
+            result = collector.run_collection(RunState())
+            result.wait_for_embeddings()
+            return result
+
+    def test_parallel_fetch_keeps_order_and_accounting(self, isolated_db):
+        import threading
+        from collections import Counter
+        from pipeline.src.collect import collector
+
+        sources = [
+            {"name": f"Source {i}", "url": f"https://host{i % 3}.example.com/feed", "tier": 1, "type": "rss"}
+            for i in range(6)
+        ]
+        active, peak = Counter(), Counter()
+        lock = threading.Lock()
+
+        def fetch(source):
+            host = source["url"].split("/")[2]
+            with lock:
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+            # Later sources finish first to exercise ordered ingest
+            time.sleep(0.3 - 0.04 * int(source["name"].split()[-1]))
+            with lock:
+                active[host] -= 1
+            if source["name"] == "Source 2":
+                raise ConnectionError("HTTP 500")
+            return [_make_item(source["name"], f"Unique content from {source['name']}")]
+
+        with patch.object(collector, "MAX_RETRIES", 1), \
+                patch.object(collector, "MAX_CONCURRENCY", 6), \
+                patch.object(collector, "PER_HOST_LIMIT", 1):
+            start = time.monotonic()
+            result = self._run(sources, fetch)
+            elapsed = time.monotonic() - start
+
+        assert [i.title for i in result.items_new] == ["Source 0", "Source 1", "Source 3", "Source 4", "Source 5"]
+        assert result.sources_attempted == 6
+        assert result.sources_succeeded == 5
+        assert len(result.errors) == 1 and result.errors[0].startswith("Source 2:")
+        assert max(peak.values()) == 1, "Per-host limit must never be exceeded"
+        assert elapsed < 1.2, f"Collection should overlap fetches, took {elapsed:.2f}s"
+
+
+class TestRetryScheduler:
+    """Failed sources are retried with backoff without stalling healthy sources."""
+
+    def test_flaky_source_retried_alongside_healthy_sources(self, isolated_db):
+        from pipeline.src.collect import collector
+        from pipeline.src.models import RunState
+
+        sources = [
+            {"name": "Flaky", "url": "https://flaky.example.com/feed", "tier": 1, "type": "rss"},
+            {"name": "Healthy", "url": "https://healthy.example.com/feed", "tier": 1, "type": "rss"},
+        ]
+        calls = {"Flaky": 0, "Healthy": 0}
+        healthy_done_at = []
+
+        def fetch(source):
+            calls[source["name"]] += 1
+            if source["name"] == "Flaky" and calls["Flaky"] < 3:
+                raise ConnectionError("HTTP 503")
+            if source["name"] == "Healthy":
+                healthy_done_at.append(time.monotonic())
+            return [_make_item(source["name"], f"Content from {source['name']}")]
+
+        with patch.object(collector, "_load_sources", return_value=sources), \
+                patch.object(collector, "_fetch_source", side_effect=fetch), \
+                patch("pipeline.src.kb.vector_store.embed_items", return_value={}), \
+                patch.object(collector, "aslog"), \
+                patch.object(collector, "MAX_RETRIES", 3), \
+                patch.object(collector, "RETRY_DELAY", 0.2):
+            start = time.monotonic()
+            result = collector.run_collection(RunState())
+            result.wait_for_embeddings()
+
+        assert [i.title for i in result.items_new] == ["Flaky", "Healthy"]
+        assert result.errors == []
+        assert healthy_done_at[0] - start < 0.1, "Healthy source must not wait on flaky retries"
+
+        history = result.attempts["Flaky"]
+        assert [a.attempt for a in history] == [1, 2, 3]
+        assert history[0].error and history[0].retry_in_s is not None
+        assert history[2].error is None
+        assert len(result.attempts["Healthy"]) == 1
+
+    def test_backoff_is_jittered_exponential(self):
+        from pipeline.src.collect import collector
+
+        with patch.object(collector, "RETRY_DELAY", 4.0), patch.object(collector, "RETRY_MAX_DELAY", 10.0):
+            for attempt, base in [(1, 4.0), (2, 8.0), (3, 10.0)]:
+                delay = collector._backoff_delay(attempt)
+                assert base / 2 <= delay <= base
+
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test Feed</title>
+<item><title>OpenAI releases GPT-5</title><link>https://example.com/gpt-5</link>
+<description>&lt;p&gt;OpenAI announced &lt;b&gt;GPT-5&lt;/b&gt; today.&lt;/p&gt;</description>
+<pubDate>Wed, 25 Feb 2026 10:00:00 GMT</pubDate></item>
+<item><title>Anthropic ships Claude 5</title><link>https://example.com/claude-5</link>
+<description>Anthropic launched Claude 5.</description>
+<pubDate>Tue, 24 Feb 2026 09:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+RSS_FEED_NEW_ENTRY = b"""<channel><title>Test Feed</title>
+<item><title>Google launches Gemini 3</title><link>https://example.com/gemini-3</link>
+<description>Gemini 3 is out.</description>
+<pubDate>Thu, 26 Feb 2026 08:00:00 GMT</pubDate></item>"""
+
+
+def _mock_response(status=200, content=b"", headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = content
+    resp.headers = headers or {}
+    return resp
+
+
+class TestPersistentHTTPCache:
+    """Validators and body hashes persist in the KB across (simulated) runs."""
+
+    def test_conditional_get_and_identical_body_skip(self, isolated_db):
+        from pipeline.src.collect import rss_collector
+
+        url = "https://example.com/feed.xml"
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=RSS_FEED, headers={"ETag": '"v1"'})
+            assert len(rss_collector.fetch_rss("Feed", url, 1)) == 2
+
+            # Next run: validators sent; identical body is not re-parsed
+            with patch.object(rss_collector.feedparser, "parse") as parse:
+                assert rss_collector.fetch_rss("Feed", url, 1) == []
+                parse.assert_not_called()
+            assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+            mock_get.return_value = _mock_response(status=304)
+            assert rss_collector.fetch_rss("Feed", url, 1) == []
+
+            changed = RSS_FEED.replace(b"<channel><title>Test Feed</title>", RSS_FEED_NEW_ENTRY)
+            mock_get.return_value = _mock_response(content=changed, headers={"ETag": '"v2"'})
+            assert [i.url for i in rss_collector.fetch_rss("Feed", url, 1)] == ["https://example.com/gemini-3"]
+
+    def test_web_page_validators_persisted(self, isolated_db):
+        from pipeline.src.collect import web_collector
+        from pipeline.src.kb import store
+
+        url = "https://example.com/news"
+        page = b"<html><head><title>News</title></head><body><article>Big launch.</article></body></html>"
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(
+                content=page, headers={"Last-Modified": "Wed, 25 Feb 2026 10:00:00 GMT"}
+            )
+            assert len(web_collector.fetch_page("News", url, 1)) == 1
+            assert web_collector.fetch_page("News", url, 1) == []
+            sent = mock_get.call_args.kwargs["headers"]
+            assert sent["If-Modified-Since"] == "Wed, 25 Feb 2026 10:00:00 GMT"
+
+        assert store.get_http_cache(url)["body_hash"]
+
+
+class TestSharedHTTPSession:
+    """Collectors share one pooled keep-alive session."""
+
+    def test_session_is_shared_and_pooled(self):
+        from pipeline.src.collect import http_client
+
+        http_client.close()
+        session = http_client._get_session()
+        assert http_client._get_session() is session
+        assert session.headers["User-Agent"] == http_client.USER_AGENT
+        adapter = session.get_adapter("https://api.github.com/")
+        assert adapter._pool_maxsize == http_client.POOL_PER_HOST
+        http_client.close()
+
+    def test_github_fanout_uses_shared_client(self, isolated_db):
+        from pipeline.src.collect import github_collector
+
+        repos = [{"full_name": f"org/repo{i}"} for i in range(3)]
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            def respond(url, headers=None, **kwargs):
+                body = repos if "/orgs/" in url else []
+                resp = _mock_response(content=json.dumps(body).encode())
+                resp.json.return_value = body
+                return resp
+            mock_get.side_effect = respond
+            github_collector.fetch_github("Org", "https://github.com/org", 2)
+
+        assert mock_get.call_count == 4, "Org listing + one call per repo, all via the shared client"
+
+
+class TestBulkIngest:
+    """store.ingest_items dedups and inserts a batch in one transaction."""
+
+    def test_returns_exactly_new_items(self, isolated_db):
+        from pipeline.src.kb import store
+
+        existing = _make_item("Existing Story", "Already stored content.")
+        store.store_item(existing)
+
+        fresh_a = _make_item("Fresh A", "Brand new content A.")
+        fresh_b = _make_item("Fresh B", "Brand new content B.")
+        dup_of_a = _make_item("Fresh A (mirror)", "Brand new content A.")
+        repeat = _make_item("Existing Story again", "Already stored content.")
+
+        new = store.ingest_items([fresh_a, repeat, dup_of_a, fresh_b])
+
+        assert [i.id for i in new] == [fresh_a.id, fresh_b.id]
+        assert len(store.get_recent_items(limit=100)) == 3
+        assert store.existing_hashes([fresh_a.content_hash, "missing"]) == {fresh_a.content_hash}
+        assert store.ingest_items([fresh_a, fresh_b]) == []
+
+
+class TestBatchEmbedding:
+    """vector_store.embed_items encodes and upserts many items per call."""
+
+    def _entries(self, n):
+        return [
+            {"item_id": f"item-{i}", "title": f"Title {i}", "content": f"Body {i}", "metadata": {"source_name": "S"}}
+            for i in range(n)
+        ]
+
+    def test_items_encoded_in_batches(self, isolated_db):
+        from pipeline.src.kb import vector_store
+
+        collection = MagicMock()
+        embed_fn = MagicMock(side_effect=lambda docs: [[0.1, 0.2]] * len(docs))
+        with patch.object(vector_store, "_get_collection", return_value=collection), \
+                patch.object(vector_store, "_get_embed_fn", return_value=embed_fn):
+            failures = vector_store.embed_items(self._entries(10), batch_size=4)
+
+        assert failures == {}
+        assert embed_fn.call_count == 3
+        assert collection.upsert.call_count == 3
+        upserted = [i for c in collection.upsert.call_args_list for i in c.kwargs["ids"]]
+        assert upserted == [f"item-{i}__chunk0" for i in range(10)]
+
+    def test_failed_batch_falls_back_per_item(self, isolated_db):
+        from pipeline.src.kb import vector_store
+
+        collection = MagicMock()
+        embed_fn = MagicMock(side_effect=RuntimeError("encoder crashed"))
+
+        def single(item_id, title, content, metadata):
+            if item_id == "item-1":
+                raise ValueError("bad item")
+
+        with patch.object(vector_store, "_get_collection", return_value=collection), \
+                patch.object(vector_store, "_get_embed_fn", return_value=embed_fn), \
+                patch.object(vector_store, "embed_item", side_effect=single) as embed_item:
+            failures = vector_store.embed_items(self._entries(3), batch_size=8)
+
+        assert embed_item.call_count == 3
+        assert list(failures) == ["item-1"]
+
+
+class TestBackgroundEmbedding:
+    """Embedding runs on a worker thread and is drained on demand."""
+
+    def test_submit_does_not_block_and_drain_waits(self, isolated_db):
+        from pipeline.src.kb import vector_store
+        from pipeline.src.kb.embedding_queue import EmbeddingQueue
+
+        embedded = []
+
+        def slow_embed(entries, batch_size):
+            time.sleep(0.2)
+            embedded.extend(e["item_id"] for e in entries)
+            return {"b": "encoder error"} if any(e["item_id"] == "b" for e in entries) else {}
+
+        with patch.object(vector_store, "embed_items", side_effect=slow_embed):
+            q = EmbeddingQueue()
+            start = time.monotonic()
+            q.submit([{"item_id": "a"}])
+            q.submit([{"item_id": "b"}, {"item_id": "c"}])
+            assert time.monotonic() - start < 0.1, "submit must not wait for encoding"
+
+            failures = q.drain()
+
+        assert sorted(embedded) == ["a", "b", "c"]
+        assert failures == {"b": "encoder error"}
+        assert q.drain() == failures
+
+
+class TestTagEngine:
+    """The precompiled engine returns tags and mentions in one call."""
+
+    def test_scan_text_returns_tags_and_mentions(self):
+        from pipeline.src.collect.tagger import scan_text
+
+        scan = scan_text("Anthropic releases Claude-4 and a new SDK; OpenAI cuts GPT-5 pricing")
+        assert scan.tags == ["model-release", "framework-release", "pricing-change"]
+        assert not scan.is_ambiguous
+        assert set(scan.model_mentions) == {"Claude-4", "GPT-5"}
+        assert scan.org_mentions == ["OpenAI", "Anthropic"]
+
+    def test_overlapping_patterns_across_tags(self):
+        from pipeline.src.collect.tagger import tag_item
+
+        # "benchmark" belongs to two tags; "sdk update" overlaps "sdk"
+        tags, _ = tag_item("SDK update", "New benchmark results")
+        assert {"api-update", "framework-release", "research-paper", "benchmark"} <= set(tags)
+
+    def test_batch_scan_matches_single_scan(self):
+        from pipeline.src.collect.tagger import scan_items, tag_item
+
+        pairs = [("Security patch", "CVE-2026-1 fixed"), ("Nothing", "here"), ("Google DeepMind", "Gemini 3 launch")]
+        results = scan_items(pairs)
+        assert [(r.tags, r.is_ambiguous) for r in results] == [tag_item(t, c) for t, c in pairs]
+        assert results[2].org_mentions == ["Google DeepMind", "Google"]
+
+
+class TestFastFeedParser:
+    """Streaming parser yields the same items as feedparser, falling back on bad XML."""
+
+    ATOM_FEED = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Papers</title>
+<entry><title>New eval suite</title><id>urn:1</id>
+<link rel="self" href="https://example.org/self"/><link rel="alternate" href="https://example.org/p/1"/>
+<updated>2026-02-25T10:00:00+02:00</updated><summary>short</summary>
+<content type="html">&lt;p&gt;Full &lt;script&gt;x()&lt;/script&gt;text&lt;/p&gt;</content></entry>
+</feed>"""
+
+    def test_rss_entries_match_feedparser(self):
+        from pipeline.src.collect import rss_collector
+        from pipeline.src.collect.feed_parser import iter_entries
+
+        fast = list(iter_entries(RSS_FEED))
+        slow = rss_collector._feedparser_entries(RSS_FEED)
+        assert [(e.title, e.link, e.published_at) for e in fast] == \
+               [(e.title, e.link, e.published_at) for e in slow]
+        assert rss_collector._clean_html(fast[0].content_html) == "OpenAI announced GPT-5 today."
+
+    def test_atom_entry_fields(self):
+        from datetime import datetime, timezone
+        from pipeline.src.collect.feed_parser import html_to_text, iter_entries
+
+        (entry,) = iter_entries(self.ATOM_FEED)
+        assert entry.link == "https://example.org/p/1"
+        assert entry.guid == "urn:1"
+        assert entry.published_at == datetime(2026, 2, 25, 8, 0, tzinfo=timezone.utc)
+        assert html_to_text(entry.content_html) == "Full text"
+
+    def test_malformed_feed_falls_back_to_feedparser(self, isolated_db):
+        from pipeline.src.collect import rss_collector
+
+        broken = RSS_FEED.replace(b"Test Feed", b"Test &nbsp; Feed")  # undefined XML entity
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=broken)
+            with patch.object(rss_collector, "iter_entries", wraps=rss_collector.iter_entries) as fast, \
+                 patch.object(rss_collector.feedparser, "parse", wraps=rss_collector.feedparser.parse) as slow:
+                items = rss_collector.fetch_rss("Feed", "https://example.com/broken.xml", 1)
+        assert fast.called and slow.called
+        assert [i.url for i in items] == ["https://example.com/gpt-5", "https://example.com/claude-5"]
+
+
+class TestFeedWatermarks:
+    """Feeds stop at the newest entry seen on a previous run."""
+
+    URL = "https://example.com/feed.xml"
+
+    def _fetch(self, content):
+        from pipeline.src.collect import rss_collector
+
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=content)
+            with patch.object(rss_collector, "tag_item", wraps=rss_collector.tag_item) as tagger:
+                items = rss_collector.fetch_rss("Feed", self.URL, 1)
+        return items, tagger.call_count
+
+    def test_watermark_persisted_and_stops_iteration(self, isolated_db):
+        from pipeline.src.kb import store
+
+        items, _ = self._fetch(RSS_FEED)
+        assert len(items) == 2
+        wm = store.get_feed_watermark(self.URL)
+        assert wm["last_link"] == "https://example.com/gpt-5"
+        assert wm["newest_published_at"].startswith("2026-02-25T10:00")
+
+        # Old entries edited + one new entry: only the new one is processed
+        changed = RSS_FEED.replace(b"<channel><title>Test Feed</title>", RSS_FEED_NEW_ENTRY)
+        changed = changed.replace(b"today", b"this morning")
+        items, tagged = self._fetch(changed)
+        assert [i.url for i in items] == ["https://example.com/gemini-3"]
+        assert tagged == 1
+        assert store.get_feed_watermark(self.URL)["last_link"] == "https://example.com/gemini-3"
+
+    def test_oldest_first_feed_uses_dates(self, isolated_db):
+        import re
+
+        entries = re.findall(rb"<item>.*?</item>", RSS_FEED, re.S)
+        ascending = RSS_FEED.replace(entries[0] + b"\n" + entries[1], entries[1] + b"\n" + entries[0])
+        assert ascending != RSS_FEED
+        self._fetch(ascending)
+
+        new_entry = re.search(rb"<item>.*?</item>", RSS_FEED_NEW_ENTRY, re.S).group(0)
+        items, _ = self._fetch(ascending.replace(b"</channel>", new_entry + b"</channel>"))
+        assert [i.url for i in items] == ["https://example.com/gemini-3"]
+
+
+class TestChangelogSnapshots:
+    """Changelog sections are diffed against stored fingerprints."""
+
+    URL = "https://example.com/changelog"
+    PAGE = b"""<html><body>
+<h2 id="v2">2026-02-25 API v2</h2><p>New batch endpoint.</p>
+<h2>2026-02-20 API v1.9</h2><p>Rate limits raised.</p>
+</body></html>"""
+
+    def _fetch(self, content):
+        from pipeline.src.collect import web_collector
+
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=content)
+            items = web_collector.fetch_changelog_entries("Changelog", self.URL, 1)
+        return items, mock_get.call_count
+
+    def test_only_new_or_changed_sections_emitted(self, isolated_db):
+        items, _ = self._fetch(self.PAGE)
+        assert [i.url for i in items] == [f"{self.URL}#v2", f"{self.URL}#2026-02-20-api-v1-9"]
+
+        # Cosmetic edit (whitespace/punctuation) + new section + real change
+        edited = self.PAGE.replace(b"New batch endpoint.", b"New  batch endpoint!")
+        edited = edited.replace(b"<h2 id=\"v2\">", b"<h2 id=\"v3\">2026-03-01 API v3</h2><p>Streaming.</p>\n<h2 id=\"v2\">")
+        edited = edited.replace(b"Rate limits raised.", b"Rate limits doubled.")
+        items, _ = self._fetch(edited)
+        assert [i.url for i in items] == [f"{self.URL}#v3", f"{self.URL}#2026-02-20-api-v1-9"]
+
+    def test_fallback_reuses_fetched_response(self, isolated_db):
+        page = b"<html><head><title>Changes</title></head><body><article>Undated notes.</article></body></html>"
+        items, calls = self._fetch(page)
+        assert calls == 1
+        assert [(i.url, i.raw_content) for i in items] == [(self.URL, "Undated notes.")]
+
+        items, calls = self._fetch(page.replace(b"<body>", b"<body><nav>menu</nav>"))
+        assert items == []
+
+
+class TestStructuredAPICollectors:
+    """API sources map one record (model/paper) to one CollectedItem."""
+
+    def test_json_mapping_from_sources_yaml(self, isolated_db):
+        from pipeline.src.collect import collector
+
+        hf = next(s for s in collector._load_sources("friday") if s["name"].startswith("Hugging Face"))
+        models = [
+            {"id": "acme/coder-7b", "pipeline_tag": "text-generation", "library_name": "transformers",
+             "tags": ["code", "llama"], "createdAt": "2026-02-24T12:00:00.000Z", "downloads": 10},
+            {"id": "acme/vision-2", "pipeline_tag": "image-to-text", "tags": []},
+        ]
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=json.dumps(models).encode())
+            items = collector._fetch_source(hf)
+
+        assert [i.url for i in items] == ["https://huggingface.co/acme/coder-7b", "https://huggingface.co/acme/vision-2"]
+        assert items[0].raw_content == "acme/coder-7b: text-generation model (transformers). Tags: code, llama"
+        assert items[0].published_at.isoformat() == "2026-02-24T12:00:00+00:00"
+        assert items[1].published_at is None
+
+    def test_arxiv_listing_one_item_per_paper(self, isolated_db):
+        from pipeline.src.collect import api_collector
+
+        listing = b"""<html><body><dl>
+<dt><a href="/abs/2602.00001" title="Abstract">arXiv:2602.00001</a></dt>
+<dd><div class="list-title mathjax"><span class="descriptor">Title:</span> Scaling Agents</div>
+<div class="list-authors"><span class="descriptor">Authors:</span> A. Author, B. Author</div>
+<div class="list-subjects"><span class="descriptor">Subjects:</span> Artificial Intelligence (cs.AI)</div></dd>
+<dt><a href="/abs/2602.00002" title="Abstract">arXiv:2602.00002</a></dt>
+<dd><div class="list-title mathjax">Title: A Benchmark for Tool Use</div></dd>
+</dl></body></html>"""
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=listing)
+            items = api_collector.fetch_api("arXiv", "https://arxiv.org/list/cs.AI/recent", 3, "arxiv_listing")
+
+        assert [(i.title, i.url) for i in items] == [
+            ("Scaling Agents", "https://arxiv.org/abs/2602.00001"),
+            ("A Benchmark for Tool Use", "https://arxiv.org/abs/2602.00002"),
+        ]
+        assert "Authors: A. Author, B. Author" in items[0].raw_content
+        assert "research-paper" in items[1].tags
+
+    def test_api_source_without_format_still_scraped(self):
+        from pipeline.src.collect import collector
+
+        source = {"name": "Legacy API", "type": "api", "url": "https://example.com/api", "tier": 3}
+        with patch.object(collector.web_collector, "fetch_page", return_value=[]) as fetch_page:
+            collector._fetch_source(source)
+        fetch_page.assert_called_once_with("Legacy API", "https://example.com/api", 3, selectors=None, max_bytes=None)
+
+
+class TestGitHubGraphQL:
+    """GitHub releases for all sources come from one GraphQL query, within a rate budget."""
+
+    @staticmethod
+    def _release(tag, days_ago=1):
+        from datetime import timedelta
+        when = (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat().replace("+00:00", "Z")
+        return {"tagName": tag, "name": f"Release {tag}", "description": "Model release notes",
+                "url": f"https://github.com/x/releases/{tag}", "publishedAt": when, "createdAt": when}
+
+    def test_one_query_for_all_sources_with_cursors(self, isolated_db):
+        from pipeline.src.collect import github_collector
+
+        sources = [
+            {"name": "Org", "type": "github", "url": "https://github.com/acme", "tier": 2},
+            {"name": "Repo", "type": "github", "url": "https://github.com/solo/tool", "tier": 2},
+        ]
+        data = {
+            "rateLimit": {"cost": 1, "remaining": 4990, "resetAt": "2099-01-01T00:00:00Z"},
+            "s0": {"repositories": {"nodes": [
+                {"nameWithOwner": "acme/model", "releases": {"nodes": [self._release("v2"), self._release("v1", 2)]}},
+                {"nameWithOwner": "acme/sdk", "releases": {"nodes": []}},
+            ]}},
+            "s1": {"nameWithOwner": "solo/tool", "releases": {"nodes": [self._release("t1")]}},
+        }
+        resp = _mock_response(content=b"")
+        resp.json.return_value = {"data": data}
+
+        def run():
+            with patch.object(github_collector, "GITHUB_TOKEN", "t"), \
+                 patch("pipeline.src.collect.http_client.post", return_value=resp) as post, \
+                 patch("pipeline.src.collect.http_client.get") as get:
+                assert github_collector.graphql_enabled()
+                assert github_collector.prefetch_releases(sources) == 2
+                results = [github_collector.fetch_github(s["name"], s["url"], 2) for s in sources]
+                get.assert_not_called()
+            assert post.call_count == 1
+            return results
+
+        org_items, repo_items = run()
+        assert [i.title for i in org_items] == ["Org: Release v2", "Org: Release v1"]
+        assert [i.title for i in repo_items] == ["Repo: Release t1"]
+        assert github_collector.budgets["graphql"].remaining == 4990
+
+        # Next run: cursors stop at the releases already collected
+        assert run() == [[], []]
+        github_collector.clear_prefetch()
+
+    def test_budget_refuses_calls_inside_reserve(self):
+        from pipeline.src.collect.github_collector import GitHubRateLimited, RateLimitBudget
+
+        budget = RateLimitBudget(reserve=10)
+        budget.check()  # unknown quota: allowed
+        budget.update_from_headers({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(time.time() + 600)})
+        with pytest.raises(GitHubRateLimited):
+            budget.check()
+        budget.update(10, time.time() - 1)  # window already reset
+        budget.check()
+
+    def test_rest_and_graphql_quotas_are_separate(self, isolated_db):
+        from pipeline.src.collect import github_collector
+        from pipeline.src.collect.github_collector import GitHubRateLimited, RateLimitBudget
+
+        far = time.time() + 600
+        budgets = {"core": RateLimitBudget(), "graphql": RateLimitBudget()}
+        sources = [{"name": "Repo", "type": "github", "url": "https://github.com/solo/tool", "tier": 2}]
+        gql = _mock_response(headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "3"})
+        gql.json.return_value = {"data": {"s0": {"nameWithOwner": "solo/tool", "releases": {"nodes": []}}}}
+        rest = _mock_response(content=b"[]", headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000"})
+        rest.json.return_value = []
+
+        with patch.dict(github_collector.budgets, budgets), \
+                patch.object(github_collector, "GITHUB_TOKEN", "t"), \
+                patch("pipeline.src.collect.http_client.post", return_value=gql), \
+                patch("pipeline.src.collect.http_client.get", return_value=rest) as get:
+            github_collector.budgets["core"].update(5, far)  # REST nearly spent
+            assert github_collector.prefetch_releases(sources) == 1
+            with pytest.raises(GitHubRateLimited):
+                github_collector.prefetch_releases(sources)  # GraphQL points now inside the reserve
+
+            github_collector.clear_prefetch()
+            github_collector.budgets["core"].update(4000, far)
+            assert github_collector.fetch_github("Repo", sources[0]["url"], 2) == []
+            assert get.call_count == 1, "REST fallback still has quota"
+            assert github_collector.budgets["core"].remaining == 4000
+            assert github_collector.budgets["graphql"].remaining == 3
+
+    def test_prefetch_cleared_when_collection_fails(self, isolated_db):
+        from pipeline.src.collect import collector, github_collector
+        from pipeline.src.models import RunState
+
+        sources = [{"name": "Repo", "type": "github", "url": "https://github.com/solo/tool", "tier": 2}]
+
+        def prefetch(github_sources):
+            github_collector._prefetched["https://github.com/unfetched/repo"] = []
+            return 1
+
+        with patch.object(collector, "_load_sources", return_value=sources), \
+                patch.object(github_collector, "graphql_enabled", return_value=True), \
+                patch.object(github_collector, "prefetch_releases", side_effect=prefetch), \
+                patch.object(collector, "_ingest_source", side_effect=RuntimeError("disk full")), \
+                patch.object(collector, "_fetch_source", return_value=[]), \
+                patch.object(collector, "aslog"):
+            with pytest.raises(RuntimeError):
+                collector.run_collection(RunState())
+        assert github_collector._prefetched == {}
+
+    def test_org_listing_uses_validators(self, isolated_db):
+        from pipeline.src.collect import github_collector
+
+        repos = [{"full_name": "org/repo0"}]
+        calls = []
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            def respond(url, headers=None, **kwargs):
+                calls.append((url, dict(headers or {})))
+                if "/orgs/" in url and "If-None-Match" in (headers or {}):
+                    return _mock_response(status=304)
+                body = repos if "/orgs/" in url else []
+                resp = _mock_response(content=json.dumps(body).encode(), headers={"ETag": '"r1"'})
+                resp.json.return_value = body
+                return resp
+            mock_get.side_effect = respond
+            github_collector.fetch_github("Org", "https://github.com/org", 2)
+            github_collector.fetch_github("Org", "https://github.com/org", 2)
+
+        org_calls = [h for u, h in calls if "/orgs/" in u]
+        assert org_calls[1]["If-None-Match"] == '"r1"'
+        assert [u for u, _ in calls].count("https://api.github.com/repos/org/repo0/releases?per_page=5") == 2
+
+
+class TestGitHubReleaseCursors:
+    """Release cursors only move past releases a run actually returned."""
+
+    @staticmethod
+    def _release(repo, tag, hours_ago):
+        from datetime import timedelta
+        when = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat().replace("+00:00", "Z")
+        return {"tag_name": tag, "name": f"{repo} {tag}", "body": "Release notes",
+                "html_url": f"https://github.com/org/{repo}/releases/{tag}", "published_at": when}
+
+    def test_releases_over_the_cap_come_next_run(self, isolated_db):
+        from pipeline.src.collect import github_collector
+
+        releases = {
+            "org/model": [self._release("model", f"m{i}", 4 - i) for i in (3, 2, 1)],  # newest first
+            "org/sdk": [self._release("sdk", f"s{i}", 5 - i) for i in (4, 3, 2, 1)],
+        }
+
+        def respond(url, headers=None, **kwargs):
+            if "/orgs/" in url:
+                body = [{"full_name": name} for name in releases]
+            else:
+                body = releases[url.split("/repos/")[1].split("/releases")[0]]
+            resp = _mock_response(content=json.dumps(body).encode(), headers={"ETag": f'"{len(body)}"'})
+            resp.json.return_value = body
+            return resp
+
+        with patch("pipeline.src.collect.http_client.get", side_effect=respond):
+            first = github_collector.fetch_github("Org", "https://github.com/org", 2)
+            second = github_collector.fetch_github("Org", "https://github.com/org", 2)
+            third = github_collector.fetch_github("Org", "https://github.com/org", 2)
+
+        assert len(first) == github_collector.MAX_RELEASES
+        assert [i.title for i in first] == ["Org: model m3", "Org: model m2", "Org: model m1",
+                                            "Org: sdk s2", "Org: sdk s1"]
+        assert [i.title for i in second] == ["Org: sdk s4", "Org: sdk s3"]
+        assert third == []
+
+
+class TestSitemapDiscovery:
+    """Index sources fetch only new or changed article pages, one item each."""
+
+    INDEX = "https://blog.example.com/news/"
+
+    @staticmethod
+    def _sitemap(entries):
+        urls = "".join(
+            f"<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>" for loc, lastmod in entries
+        )
+        return (f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"{urls}</urlset>").encode()
+
+    def _run(self, sitemap, requested, status=200, edited=()):
+        from pipeline.src.collect import discovery
+
+        def respond(url, headers=None, **kwargs):
+            requested.append(url)
+            if url.endswith("sitemap.xml"):
+                return _mock_response(status=status, content=sitemap)
+            if url == self.INDEX:
+                return _mock_response(content=b'<a href="/news/from-links">x</a><a href="/about">y</a>')
+            slug = url.rstrip("/").rsplit("/", 1)[-1]
+            body = f"Article {slug}" + (" (updated)" if slug in edited else "")
+            return _mock_response(content=f"<html><head><title>{slug}</title></head>"
+                                          f"<body><article>{body}</article></body></html>".encode())
+
+        with patch("pipeline.src.collect.http_client.get", side_effect=respond):
+            return discovery.discover_articles("Blog", self.INDEX, 1, "sitemap")
+
+    def test_lastmod_selects_changed_articles(self, isolated_db):
+        from datetime import timedelta
+
+        day = lambda n: (datetime.now(timezone.utc) - timedelta(days=n)).strftime("%Y-%m-%d")
+        entries = [
+            (self.INDEX, day(0)),
+            ("https://blog.example.com/news/a", day(1)),
+            ("https://blog.example.com/news/b", day(2)),
+            ("https://blog.example.com/news/ancient", day(400)),
+            ("https://blog.example.com/careers/job", day(0)),
+        ]
+        requested = []
+        items = self._run(self._sitemap(entries), requested)
+        assert [i.title for i in items] == ["a", "b"]
+        assert not any("ancient" in u or "careers" in u for u in requested)
+
+        # b updated, c added, a untouched: a must not be downloaded again
+        entries[2] = ("https://blog.example.com/news/b", day(0))
+        entries.append(("https://blog.example.com/news/c", day(0)))
+        requested = []
+        items = self._run(self._sitemap(entries), requested, edited={"b"})
+        assert sorted(i.title for i in items) == ["b", "c"]
+        assert "https://blog.example.com/news/a" not in requested
+
+    def test_falls_back_to_index_links(self, isolated_db):
+        requested = []
+        items = self._run(b"", requested, status=404)
+        assert [i.url for i in items] == ["https://blog.example.com/news/from-links"]
+
+    def test_article_fetches_share_the_run_host_limit(self, isolated_db):
+        import threading
+        from pipeline.src.collect import collector
+        from pipeline.src.models import RunState
+
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        sitemap = self._sitemap(
+            [(f"https://blog.example.com/{section}/{n}", today) for section in ("news", "research") for n in range(4)]
+        )
+        sources = [
+            {"name": name, "url": f"https://blog.example.com/{section}/", "tier": 1, "type": "web", "discover": "sitemap"}
+            for name, section in (("News", "news"), ("Research", "research"))
+        ]
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def respond(url, headers=None, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                time.sleep(0.02)
+                if url.endswith("sitemap.xml"):
+                    return _mock_response(content=sitemap)
+                return _mock_response(content=f"<html><head><title>{url}</title></head>"
+                                              f"<body><article>Article at {url}</article></body></html>".encode())
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        with patch.object(collector, "_load_sources", return_value=sources), \
+                patch.object(collector, "PER_HOST_LIMIT", 2), \
+                patch("pipeline.src.kb.vector_store.embed_items", return_value={}), \
+                patch.object(collector, "aslog"), \
+                patch("pipeline.src.collect.http_client.get", side_effect=respond):
+            result = collector.run_collection(RunState())
+            result.wait_for_embeddings()
+
+        assert len(result.items_new) == 8
+        assert peak[0] == 2, "both sources' article fetches stay within the host's limit"
+
+
+class TestContentExtractor:
+    """One lxml parse yields title, date and main text; selectors override heuristics."""
+
+    PAGE = b"""<html><head><title> Lab  News </title>
+<meta name="datePublished" content="2026-02-25T10:00:00+02:00"><script>var nav = 1;</script></head>
+<body><header>Site header</header><nav>Home Blog</nav>
+<div class="post-body"><p>Custom container text.</p></div>
+<main><p>Main <b>story</b> text.</p><!-- hidden --><aside>Related</aside></main>
+<footer>Footer</footer></body></html>"""
+
+    def test_single_pass_extraction(self):
+        from pipeline.src.collect import extractor
+
+        page = extractor.extract(self.PAGE)
+        assert page.title == "Lab News"
+        assert page.content == "Main story text."
+        assert page.published_at == datetime(2026, 2, 25, 8, 0, tzinfo=timezone.utc)
+
+    def test_selector_overrides(self):
+        from pipeline.src.collect import extractor
+
+        page = extractor.extract(self.PAGE, {"content": "div.post-body", "title": "nav", "date": ".missing"})
+        assert page.content == "Custom container text."
+        assert page.title == "Home Blog"
+        assert page.published_at is not None, "unmatched selector falls back to heuristics"
+
+    def test_large_pages_use_process_pool(self):
+        from pipeline.src.collect import extractor
+
+        with patch.object(extractor, "POOL_MIN_BYTES", 100), patch.object(extractor, "PROCESSES", 1):
+            try:
+                page = extractor.extract(self.PAGE)
+                assert extractor._pool is not None
+            finally:
+                extractor.shutdown()
+        assert page.content == "Main story text."
+
+
+class TestStreamingDownloads:
+    """Bodies are read in chunks, capped per source, and article pages stop once complete."""
+
+    def test_read_body_cap_and_stop(self):
+        from pipeline.src.collect.http_client import _read_body
+
+        chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+        assert _read_body(iter(chunks), 0, None) == (b"a" * 10 + b"b" * 10 + b"c" * 10, False)
+        assert _read_body(iter(chunks), 15, None) == (b"a" * 10 + b"b" * 5, True)
+        body, truncated = _read_body(iter(chunks), 0, lambda chunk: chunk.startswith(b"b"))
+        assert body == b"a" * 10 + b"b" * 10 and truncated
+
+    def test_content_watcher_stops_after_article(self):
+        from pipeline.src.collect import extractor
+
+        page = (b"<html><head><title>Post</title></head><body><article><p>Body text.</p></article>"
+                + b"<div>" + b"<p>comments</p>" * 20000 + b"</div></body></html>")
+        watcher = extractor.ContentWatcher()
+        chunks = [page[i:i + 4096] for i in range(0, len(page), 4096)]
+        read = b""
+        for chunk in chunks:
+            read += chunk
+            if watcher(chunk):
+                break
+        assert len(read) < len(page) // 10
+        assert extractor.extract(read).content == extractor.extract(page).content == "Body text."
+
+    @staticmethod
+    def _watch(page, watcher, size=4096):
+        read = b""
+        for i in range(0, len(page), size):
+            read += page[i:i + size]
+            if watcher(page[i:i + size]):
+                break
+        return read
+
+    def test_content_watcher_keeps_date_after_article(self):
+        from pipeline.src.collect import extractor
+
+        page = (b"<html><head><title>Post</title></head><body><article><p>Body text.</p></article>"
+                + b"<p>related</p>" * 300 + b'<footer><time datetime="2026-02-25T10:00:00Z">Feb 25</time></footer>'
+                + b"<div>" + b"<p>comments</p>" * 20000 + b"</div></body></html>")
+        read = self._watch(page, extractor.ContentWatcher())
+        assert len(read) < len(page) // 10
+        assert extractor.extract(read) == extractor.extract(page)
+        assert extractor.extract(read).published_at == datetime(2026, 2, 25, 10, 0, tzinfo=timezone.utc)
+
+    def test_content_watcher_stops_inside_long_article(self):
+        from pipeline.src.collect import extractor
+
+        page = (b'<html><head><meta property="article:published_time" content="2026-02-25T10:00:00Z">'
+                b"</head><body><article>" + b"<p>A long paragraph of article text.</p>\n" * 20000
+                + b"</article></body></html>")
+        watcher = extractor.ContentWatcher(max_chars=1000)
+        read = self._watch(page, watcher, size=512)
+        assert len(read) < 5000
+        assert extractor.extract(read, max_chars=1000) == extractor.extract(page, max_chars=1000)
+
+    def test_collectors_pass_byte_cap(self, isolated_db):
+        from pipeline.src.collect import collector, web_collector
+
+        page = b"<html><head><title>T</title></head><body><article><p>Text.</p></article></body></html>"
+        with patch("pipeline.src.collect.http_client.get", return_value=_mock_response(200, page)) as get:
+            web_collector.fetch_page("Blog", "https://example.com/post", 2, max_bytes=1000)
+        assert get.call_args.kwargs["max_bytes"] == 1000
+        assert isinstance(get.call_args.kwargs["stop"], web_collector.extractor.ContentWatcher)
+
+        with patch("pipeline.src.collect.rss_collector.fetch_rss", return_value=[]) as fetch_rss:
+            collector._fetch_source({"name": "F", "url": "https://example.com/feed", "tier": 1,
+                                     "type": "rss", "max_bytes": 2048})
+        fetch_rss.assert_called_once_with("F", "https://example.com/feed", 1, max_bytes=2048)
+
+    def test_truncated_sitemap_keeps_parsed_entries(self):
+        from pipeline.src.collect.discovery import parse_sitemap
+
+        sitemap = (b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                   b"<url><loc>https://example.com/news/a</loc></url>"
+                   b"<url><loc>https://example.com/news/b</loc></url><url><loc>https://exa")
+        pages, _ = parse_sitemap(sitemap, partial=True)
+        assert [p.url for p in pages] == ["https://example.com/news/a", "https://example.com/news/b"]
+        with pytest.raises(Exception):
+            parse_sitemap(sitemap)
+
+
+class TestNearDuplicateIngest:
+    """MinHash near-duplicates are linked to the original instead of being stored."""
+
+    STORY = (
+        "Acme Labs today released Falcon 4, a mixture of experts language model with a one million "
+        "token context window. The model tops open benchmarks for coding and maths, ships under an "
+        "Apache license, and is available through the Acme API with batch pricing for enterprises."
+    )
+
+    def test_signature_similarity(self):
+        from pipeline.src.kb import near_dup
+
+        a = near_dup.signature("Posted March 3. " + self.STORY)
+        b = near_dup.signature("Updated March 9, 2026. " + self.STORY + " utm_source=newsletter")
+        c = near_dup.signature("Regulators in the EU opened a consultation on general purpose AI codes "
+                             "of practice, asking labs to document training data and energy use "
+                             "before the August deadline for systemic risk models.")
+        assert near_dup.similarity(a, b) >= near_dup.THRESHOLD
+        assert near_dup.similarity(a, c) < 0.2
+        assert near_dup.signature("Too short to fingerprint") is None
+        assert len(set(near_dup.buckets(a)) & set(near_dup.buckets(b))) > 0
+
+    def test_republished_story_is_linked_not_stored(self, isolated_db):
+        from pipeline.src.kb import store
+
+        original = _make_item("Falcon 4 released", "Posted March 3. " + self.STORY)
+        assert store.ingest_items([original], near_duplicates=True) == [original]
+
+        mirror = _make_item("Falcon 4 released", "Updated March 9, 2026. " + self.STORY, source="Mirror")
+        same_batch = _make_item("Falcon 4 is out", self.STORY + " Subscribe for more.", source="Aggregator")
+        unrelated = _make_item("Short note", "A short unrelated note.")
+        new = store.ingest_items([mirror, same_batch, unrelated], near_duplicates=True)
+
+        assert [i.id for i in new] == [unrelated.id]
+        links = store.get_near_duplicates(original.id)
+        assert sorted(l["source_name"] for l in links) == ["Aggregator", "Mirror"]
+        assert all(l["similarity"] >= 0.7 for l in links)
+        # Linked duplicates are not re-processed on the next run
+        assert store.ingest_items([mirror], near_duplicates=True) == []
+        assert len(store.get_recent_items(limit=100)) == 2
+
+    def test_templated_releases_of_one_source_are_kept(self, isolated_db):
+        from pipeline.src.kb import near_dup, store
+        from pipeline.src.models import CollectedItem
+
+        notes = (
+            "Release: {tag}\n\n## Highlights\n* {change}\n\n## What's Changed\n* Bump transformers "
+            "from 4.48.0 to 4.48.1 by @dependabot in #2210\n* Fix tokenizer padding side for batched "
+            "generation by @maintainer in #2214\n* Update Docker base image and CUDA runtime by "
+            "@maintainer in #2215\n* Pin pydantic below 3 in the requirements by @maintainer in "
+            "#2216\n\n## Installation\npip install vllm=={tag} or use the official Docker image "
+            "published with this release.\n\n**Full Changelog**: {prev}...{tag}"
+        )
+        releases = [
+            CollectedItem(
+                source_name="vLLM GitHub", source_tier=2, tags=["release"],
+                url=f"https://github.com/vllm-project/vllm/releases/tag/{tag}",
+                title=f"vLLM GitHub: {tag}",
+                raw_content=notes.format(tag=tag, prev=prev, change=change),
+            )
+            for tag, prev, change in (
+                ("v0.7.1", "v0.7.0", "Add speculative decoding metrics endpoint"),
+                ("v0.7.2", "v0.7.1", "Support FP8 KV cache on Hopper GPUs"),
+            )
+        ]
+        sigs = [near_dup.signature(f"{r.title}\n{r.raw_content}") for r in releases]
+        assert near_dup.similarity(*sigs) >= near_dup.THRESHOLD, "the template alone makes them near-identical"
+
+        assert store.ingest_items(releases[:1], near_duplicates=True) == releases[:1]
+        assert store.ingest_items(releases[1:], near_duplicates=True) == releases[1:]
+        # A mirror of a release on another source is still a duplicate
+        mirror = releases[1].model_copy(update={"id": "mirror", "source_name": "Mirror",
+                                                "raw_content": releases[1].raw_content + " via RSS"})
+        assert store.ingest_items([mirror], near_duplicates=True) == []
+
+    def test_disabled_by_default(self, isolated_db):
+        from pipeline.src.kb import store
+
+        a = _make_item("Falcon 4 released", "Posted March 3. " + self.STORY)
+        b = _make_item("Falcon 4 released again", "Updated March 9. " + self.STORY)
+        assert len(store.ingest_items([a, b])) == 2
+
+
+class TestCanonicalURLs:
+    """URL variants map to one canonical URL; sources skip stories already collected elsewhere."""
+
+    def test_normalization_rules(self):
+        from pipeline.src.collect.canonical import normalize
+
+        assert normalize("HTTPS://Example.com:443/post/?utm_source=rss&b=2&a=1&fbclid=x#comments") == \
+            "https://example.com/post?a=1&b=2"
+        assert normalize("https://example.com/") == "https://example.com/"
+        assert normalize("http://example.com:8080/x/") == "http://example.com:8080/x"
+
+    def test_redirects_resolved_once(self, isolated_db):
+        from pipeline.src.collect import canonical
+
+        resp = _mock_response(200, b"<html>")
+        resp.url = "https://blog.example.com/post/?utm_medium=feed"
+        with patch("pipeline.src.collect.http_client.get", return_value=resp) as get:
+            assert canonical.canonical("https://feedproxy.google.com/~r/blog/abc") == "https://blog.example.com/post"
+            assert canonical.canonical("https://feedproxy.google.com/~r/blog/abc") == "https://blog.example.com/post"
+            assert canonical.canonical("https://blog.example.com/other") == "https://blog.example.com/other"
+        assert get.call_count == 1
+
+    def test_rss_skips_story_from_other_source(self, isolated_db):
+        from pipeline.src.collect import canonical, rss_collector
+
+        canonical.register("Aggregator", [_make_item("GPT-5", "Summary", source="Aggregator").model_copy(
+            update={"url": "https://example.com/gpt-5/?utm_source=aggregator"})])
+        with patch("pipeline.src.collect.http_client.get", return_value=_mock_response(200, RSS_FEED)):
+            items = rss_collector.fetch_rss("Test Feed", "https://example.com/feed", 1)
+        assert [i.url for i in items] == ["https://example.com/claude-5"]
+
+    def test_failed_redirect_cached(self, isolated_db):
+        from pipeline.src.collect import canonical
+        import requests
+
+        url = "https://t.co/abc123"
+        with patch("pipeline.src.collect.http_client.get",
+                   side_effect=requests.ConnectionError("down")) as get:
+            assert canonical.lookup([url]) == {}
+            assert canonical.canonical(url) == url
+        assert get.call_count == 1
+
+    def test_redirect_waits_for_busy_host(self, isolated_db):
+        from pipeline.src.collect import canonical
+        from pipeline.src.collect.concurrency import HostLimiter, shared_limiter
+
+        limiter = HostLimiter(per_host=1)
+        assert limiter.try_acquire("https://t.co/other")
+        with shared_limiter(limiter), patch("pipeline.src.collect.http_client.get") as get:
+            assert canonical.canonical("https://t.co/abc123") == "https://t.co/abc123"
+        assert get.call_count == 0
+        assert limiter.active("https://t.co/") == 1
+
+    def test_rss_looks_up_links_in_one_batch(self, isolated_db):
+        from pipeline.src.collect import canonical, rss_collector
+
+        with patch("pipeline.src.collect.http_client.get", return_value=_mock_response(200, RSS_FEED)), \
+                patch.object(canonical, "lookup", wraps=canonical.lookup) as lookup:
+            items = rss_collector.fetch_rss("Test Feed", "https://example.com/feed", 1)
+        assert len(items) == 2
+        assert lookup.call_count == 1
+
+    def test_discovery_skips_collected_articles(self, isolated_db):
+        from pipeline.src.collect import canonical
+
+        canonical.register("Feed", [_make_item("a", "From the feed").model_copy(
+            update={"url": "https://blog.example.com/news/a?ref=rss"})])
+        sitemap = TestSitemapDiscovery._sitemap([
+            ("https://blog.example.com/news/a", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+            ("https://blog.example.com/news/b", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+        ])
+        requested = []
+        items = TestSitemapDiscovery()._run(sitemap, requested)
+        assert [i.title for i in items] == ["b"]
+        assert "https://blog.example.com/news/a" not in requested
+
+
+class TestAdaptiveScheduler:
+    """Per-source yield history drives which sources a run polls."""
+
+    NOW = datetime(2026, 3, 4, 12, 0, tzinfo=timezone.utc)  # a Wednesday
+
+    def _history(self, *polls):
+        """polls: (days_ago, items_new, http_status), newest first."""
+        from datetime import timedelta
+        return [
+            {"polled_at": (self.NOW - timedelta(days=ago)).isoformat(), "items_new": new, "http_status": status}
+            for ago, new, status in polls
+        ]
+
+    def test_decisions(self):
+        from pipeline.src.collect.scheduler import decide
+
+        src = {"name": "S", "url": "https://s.example.com", "tier": 1}
+        assert decide(src, [], self.NOW).poll
+        assert decide(src, self._history((2, 3, None)), self.NOW).poll
+
+        friday_only = dict(src, run_days=[4, 5])
+        assert not decide(friday_only, self._history((5, 1, None)), self.NOW).poll
+
+        quiet = self._history((1, 0, None), (2, 0, None), (3, 0, None), (5, 0, None), (6, 0, None))
+        assert "low yield" in decide(src, quiet, self.NOW).reason and not decide(src, quiet, self.NOW).poll
+        assert decide(src, self._history((4, 0, None), *[(d, 0, None) for d in (5, 6)]), self.NOW).poll
+
+        blocked = self._history((1, 0, 403), (2, 0, 403), (3, 0, 403))
+        assert decide(src, blocked, self.NOW).reason.startswith("circuit open")
+        assert decide(src, self._history((9, 0, 403), (10, 0, 403), (11, 0, 403)), self.NOW).poll is False
+        assert decide(src, self._history((15, 0, 403), (16, 0, 403), (17, 0, 403)), self.NOW).poll
+
+    def test_run_days_gate_first_run(self):
+        from datetime import timedelta
+        from pipeline.src.collect.scheduler import decide
+
+        friday_only = {"name": "S", "url": "https://s.example.com", "tier": 1, "run_days": [4]}
+        assert decide(friday_only, [], self.NOW).reason.startswith("not a run day")
+        assert decide(friday_only, [], self.NOW + timedelta(days=2)).poll
+
+    def test_revisit_waits_for_run_day(self):
+        from datetime import timedelta
+        from pipeline.src.collect.scheduler import decide
+
+        friday_only = {"name": "S", "url": "https://s.example.com", "tier": 1, "run_days": [4]}
+        quiet = self._history(*[(d, 0, None) for d in (8, 15, 22, 29)])
+        assert not decide(friday_only, quiet, self.NOW).poll
+        assert decide(friday_only, quiet, self.NOW + timedelta(days=2)).reason.startswith("revisit")
+
+    def test_run_days_honoured_without_adaptive(self):
+        from pipeline.src.collect import scheduler
+
+        sources = [
+            {"name": "Daily", "url": "https://daily.example.com", "tier": 1},
+            {"name": "Friday", "url": "https://friday.example.com", "tier": 1, "run_days": [4]},
+        ]
+        with patch.object(scheduler, "ADAPTIVE", False):
+            decisions = scheduler.plan(sources, self.NOW)
+        assert [d.poll for d in decisions] == [True, False]
+
+    def test_run_collection_records_stats_and_skips(self, isolated_db):
+        from pipeline.src.collect import collector
+        from pipeline.src.kb import store
+        from pipeline.src.models import RunState
+
+        sources = [
+            {"name": "Blocked", "url": "https://blocked.example.com/feed", "tier": 1, "type": "rss"},
+            {"name": "Live", "url": "https://live.example.com/feed", "tier": 1, "type": "rss"},
+        ]
+        fetched = []
+
+        def fetch(source):
+            fetched.append(source["name"])
+            if source["name"] == "Blocked":
+                raise ConnectionError("HTTP 403 from https://blocked.example.com/feed")
+            return [_make_item(f"Live {len(fetched)}", f"Fresh content {len(fetched)}")]
+
+        with patch.object(collector, "_load_sources", return_value=sources), \
+                patch.object(collector, "_fetch_source", side_effect=fetch), \
+                patch("pipeline.src.kb.vector_store.embed_items", return_value={}), \
+                patch.object(collector, "aslog"), \
+                patch.object(collector, "MAX_RETRIES", 1):
+            for _ in range(4):
+                result = collector.run_collection(RunState())
+                result.wait_for_embeddings()
+
+        assert fetched.count("Blocked") == 3 and fetched.count("Live") == 4
+        assert result.sources_skipped["Blocked"].startswith("circuit open")
+        stats = store.get_source_stats(["Blocked", "Live"])
+        assert [r["http_status"] for r in stats["Blocked"]] == [403, 403, 403]
+        assert stats["Live"][0]["items_new"] == 1 and stats["Live"][0]["items_fetched"] == 1
+
+
+class TestDeferredCollectorState:
+    """Validators, watermarks and cursors are persisted only once items are stored."""
+
+    URL = "https://example.com/news"
+    PAGE = b"<html><head><title>News</title></head><body><article>Big launch.</article></body></html>"
+
+    def _run(self, ingest_error=None, source_type="web", url=URL, content=PAGE):
+        from pipeline.src.collect import collector
+        from pipeline.src.models import RunState
+
+        source = {"name": "News", "url": url, "tier": 1, "type": source_type}
+        ingest = collector.store.ingest_items
+        with patch.object(collector, "_load_sources", return_value=[source]), \
+                patch.object(collector.store, "ingest_items", side_effect=ingest_error or ingest), \
+                patch("pipeline.src.kb.vector_store.embed_items", return_value={}), \
+                patch.object(collector, "aslog"), \
+                patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=content, headers={"ETag": '"v1"'})
+            result = collector.run_collection(RunState())
+            result.wait_for_embeddings()
+            return result
+
+    def test_validators_not_saved_when_ingest_fails(self, isolated_db):
+        from pipeline.src.kb import store
+
+        with pytest.raises(RuntimeError):
+            self._run(ingest_error=RuntimeError("database is locked"))
+        assert store.get_http_cache(self.URL) is None
+
+        # The next run refetches the page instead of getting a 304
+        assert len(self._run().items_new) == 1
+        assert store.get_http_cache(self.URL)["etag"] == '"v1"'
+
+    def test_feed_watermark_not_advanced_when_ingest_fails(self, isolated_db):
+        from pipeline.src.kb import store
+
+        feed_url = "https://example.com/feed.xml"
+        with pytest.raises(RuntimeError):
+            self._run(RuntimeError("disk full"), "rss", feed_url, RSS_FEED)
+        assert store.get_feed_watermark(feed_url) is None
+        assert store.get_http_cache(feed_url) is None
+
+        result = self._run(source_type="rss", url=feed_url, content=RSS_FEED)
+        assert len(result.items_new) == 2
+        assert store.get_feed_watermark(feed_url)["last_link"] == "https://example.com/gpt-5"
+
+    def test_changelog_snapshot_not_saved_when_ingest_fails(self, isolated_db):
+        from pipeline.src.kb import store
+
+        url = "https://example.com/changelog"
+        with pytest.raises(RuntimeError):
+            self._run(RuntimeError("disk full"), url=url, content=TestChangelogSnapshots.PAGE)
+        assert store.get_changelog_fingerprints(url) == {}
+        assert store.get_http_cache(url) is None
+
+        result = self._run(url=url, content=TestChangelogSnapshots.PAGE)
+        assert [i.url for i in result.items_new] == [f"{url}#v2", f"{url}#2026-02-20-api-v1-9"]
+        assert len(store.get_changelog_fingerprints(url)) == 2
+
+    def test_direct_fetch_persists_immediately(self, isolated_db):
+        from pipeline.src.collect import pending, web_collector
+        from pipeline.src.kb import store
+
+        with patch("pipeline.src.collect.http_client.get") as mock_get:
+            mock_get.return_value = _mock_response(content=self.PAGE, headers={"ETag": '"v1"'})
+            with pending.capture() as writes:
+                assert len(web_collector.fetch_page("News", self.URL, 1)) == 1
+            assert store.get_http_cache(self.URL) is None
+            pending.commit(writes)
+            assert store.get_http_cache(self.URL)["etag"] == '"v1"'
+            assert web_collector.fetch_page("News", self.URL, 1) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
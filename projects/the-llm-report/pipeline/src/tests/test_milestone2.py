@@ -374,15 +374,15 @@ class TestRoutingRules:
     """Additional tests for routing logic correctness."""
 
     def test_significance_boundaries(self, isolated_db):
-        from pipeline.src.triage.triage_agent import _route_item
-        assert _route_item(1) == "archive"
-        assert _route_item(3) == "archive"
-        assert _route_item(4) == "roundup"
-        assert _route_item(6) == "roundup"
-        assert _route_item(7) == "story"
-        assert _route_item(8) == "story"
-        assert _route_item(9) == "lead"
-        assert _route_item(10) == "lead"
+        from pipeline.src.triage.triage_agent import route_item
+        assert route_item(1) == "archive"
+        assert route_item(3) == "archive"
+        assert route_item(4) == "roundup"
+        assert route_item(6) == "roundup"
+        assert route_item(7) == "story"
+        assert route_item(8) == "story"
+        assert route_item(9) == "lead"
+        assert route_item(10) == "lead"
         print("PASS: Routing boundaries all correct")
 
     def test_significance_clamped_to_1_10(self, isolated_db):
@@ -413,6 +413,481 @@ class TestRoutingRules:
         print("PASS: Significance clamping works correctly")
 
 
+class TestConcurrentTriage:
+    """triage_batch runs items in parallel but reports like a sequential run."""
+
+    @pytest.fixture(autouse=True)
+    def no_kb(self):
+        from pipeline.src.kb.kb_query import KBContext
+        with patch("pipeline.src.kb.kb_query.query", return_value=KBContext()):
+            yield
+
+    def test_parallel_results_keep_input_order(self):
+        import threading
+        import time
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(8)]
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def caller(prompt):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            index = int(prompt.split("Title: Item ")[1].split("\n")[0])
+            time.sleep(0.05 * (8 - index))  # later items finish first
+            with lock:
+                active[0] -= 1
+            return {"significance": index + 1, "category": "api-update"}
+
+        start = time.monotonic()
+        triaged, errors = triage_batch(items, llm_caller=caller, concurrency=4)
+        elapsed = time.monotonic() - start
+
+        assert errors == []
+        assert [t.item.title for t in triaged] == [f"Item {i}" for i in range(8)]
+        assert peak[0] == 4, "in-flight calls are bounded by concurrency"
+        assert elapsed < 1.0, f"sequential would take 1.8s, took {elapsed:.2f}s"
+
+    def test_max_errors_matches_sequential_cutoff(self):
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(10)]
+
+        def caller(prompt):
+            index = int(prompt.split("Title: Item ")[1].split("\n")[0])
+            if index in (1, 3, 4, 7):
+                raise RuntimeError("boom")
+            return {"significance": 5, "category": "api-update"}
+
+        sequential = triage_batch(items, llm_caller=caller, max_errors=3, concurrency=1)
+        parallel = triage_batch(items, llm_caller=caller, max_errors=3, concurrency=6)
+
+        for triaged, errors in (sequential, parallel):
+            assert [t.item.title for t in triaged] == ["Item 0", "Item 2"]
+            assert len(errors) == 3
+            assert "Item 4" in errors[-1]
+
+    def test_slow_item_times_out_as_error(self):
+        import time
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item("Fast item", "Quick."), _make_item("Slow item", "Hangs.")]
+
+        def caller(prompt):
+            if "Slow item" in prompt:
+                time.sleep(1.0)
+            return {"significance": 5, "category": "api-update"}
+
+        start = time.monotonic()
+        triaged, errors = triage_batch(items, llm_caller=caller, timeout=0.2)
+
+        assert time.monotonic() - start < 0.8
+        assert [t.item.title for t in triaged] == ["Fast item"]
+        assert len(errors) == 1 and "timed out" in errors[0]
+
+
+    def test_hung_call_does_not_starve_the_others(self):
+        import threading
+        import time
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item("Hung item", "Never answers.")] + [
+            _make_item(f"Item {i}", f"Content {i}.") for i in range(4)
+        ]
+        release = threading.Event()
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def caller(prompt):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                if "Hung item" in prompt:
+                    release.wait(5)
+                else:
+                    time.sleep(0.15)  # queued behind the hung call, this would time out too
+                return {"significance": 5, "category": "api-update"}
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        try:
+            triaged, errors = triage_batch(items, llm_caller=caller, concurrency=2, timeout=0.25)
+        finally:
+            release.set()
+
+        assert [t.item.title for t in triaged] == [f"Item {i}" for i in range(4)]
+        assert len(errors) == 1 and "Hung item" in errors[0] and "timed out" in errors[0]
+        assert peak[0] == 2, "the abandoned call still counts against concurrency"
+
+
+class TestBatchedTriage:
+    """batch_size > 1 scores several items per request, falling back per item."""
+
+    @pytest.fixture(autouse=True)
+    def no_kb(self):
+        from pipeline.src.kb.kb_query import KBContext
+        with patch("pipeline.src.kb.kb_query.query", return_value=KBContext()):
+            yield
+
+    @staticmethod
+    def _caller(calls, drop=(), invalid=()):
+        import re
+
+        def caller(prompt):
+            ids = re.findall(r"^=== ITEM (\S+) ===$", prompt, flags=re.M)
+            calls.append(ids or ["single"])
+            if not ids:
+                return {"significance": 4, "category": "api-update"}
+            return [
+                {"id": i, "significance": "high" if i in invalid else 7, "category": "benchmark"}
+                for i in ids if i not in drop
+            ]
+        return caller
+
+    def test_items_share_requests(self):
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(7)]
+        calls = []
+        triaged, errors = triage_batch(items, llm_caller=self._caller(calls), batch_size=3)
+
+        assert errors == []
+        assert sorted(len(c) for c in calls) == [1, 3, 3], "7 items → 3 requests"
+        assert [t.item.id for t in triaged] == [i.id for i in items]
+        # The leftover single item uses the single-item prompt
+        assert [t.significance for t in triaged] == [7] * 6 + [4]
+
+    def test_missing_and_invalid_entries_fall_back_to_single(self):
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(4)]
+        calls = []
+        caller = self._caller(calls, drop={items[1].id}, invalid={items[2].id})
+        triaged, errors = triage_batch(items, llm_caller=caller, batch_size=4)
+
+        assert errors == []
+        assert calls.count(["single"]) == 2
+        assert [t.significance for t in triaged] == [7, 4, 4, 7]
+
+    def test_failed_batch_request_fails_its_items(self):
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(5)]
+        calls = []
+
+        def caller(prompt):
+            calls.append(prompt)
+            if "=== ITEM" in prompt and items[0].id in prompt:
+                raise RuntimeError("Triage LLM returned invalid JSON")
+            return self._caller([])(prompt)
+
+        triaged, errors = triage_batch(items, llm_caller=caller, batch_size=3, max_errors=5)
+        assert len(calls) == 2, "no single-item retries for a failed request"
+        assert [t.item.id for t in triaged] == [i.id for i in items[3:]]
+        assert len(errors) == 3 and all("invalid JSON" in e for e in errors)
+
+    def test_timed_out_batch_request_fails_its_items(self):
+        import time
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(3)]
+        calls = []
+
+        def caller(prompt):
+            calls.append(prompt)
+            time.sleep(0.5)
+            return self._caller([])(prompt)
+
+        triaged, errors = triage_batch(items, llm_caller=caller, batch_size=3, timeout=0.1)
+        assert len(calls) == 1
+        assert triaged == [] and len(errors) == 3 and "timed out" in errors[0]
+
+    def test_batch_size_read_from_budget_config(self):
+        from pipeline.src import config
+
+        assert config.get_triage_batch_size() >= 1
+        with patch.object(config, "load_budget", return_value={}):
+            assert config.get_triage_batch_size() == 1
+
+
+class TestPreTriageFilter:
+    """Obvious noise is archived locally and every decision is logged."""
+
+    NOISE = "Meet the team behind our office move."
+    STORY = ("OpenAI releases GPT-5 with a new API endpoint and pricing for developers. " * 10).strip()
+
+    def _logged(self):
+        from pipeline.src.kb import store
+        with store._conn() as conn:
+            return [dict(r) for r in conn.execute("SELECT * FROM pre_triage_log ORDER BY id")]
+
+    def test_low_tier_ambiguous_short_item_skips_llm(self, monkeypatch):
+        from pipeline.src.triage import pre_triage
+
+        monkeypatch.setattr(pre_triage, "PRE_TRIAGE_MODE", "on")
+        noise = _make_item("Team spotlight", self.NOISE, tier=3)
+        story = _make_item("OpenAI releases GPT-5", self.STORY, tier=3)
+        to_triage, archived = pre_triage.filter_items([noise, story], run_id="run-1")
+
+        assert [i.id for i in to_triage] == [story.id]
+        assert [t.item.id for t in archived] == [noise.id]
+        assert archived[0].route == "archive"
+
+        rows = self._logged()
+        assert [(r["item_id"], r["decision"], r["skipped_llm"]) for r in rows] == [
+            (noise.id, "archive", 1), (story.id, "triage", 0),
+        ]
+        assert rows[0]["confidence"] >= pre_triage.PRE_TRIAGE_THRESHOLD > rows[1]["confidence"]
+
+    def test_archived_category_is_a_triage_category(self, monkeypatch):
+        from pipeline.src.triage import pre_triage
+        from pipeline.src.triage.triage_agent import VALID_CATEGORIES
+
+        monkeypatch.setattr(pre_triage, "PRE_TRIAGE_MODE", "on")
+        tagged = _make_item("Team spotlight", self.NOISE, tier=3)
+        tagged.tags = ["release", "community", "pricing-change"]
+        untagged = _make_item("Office move", self.NOISE + " Again.", tier=3)
+        untagged.tags = ["release"]
+        _, archived = pre_triage.filter_items([tagged, untagged], run_id="run-1")
+
+        assert [t.category for t in archived] == ["pricing-change", pre_triage.AUTO_ARCHIVE_CATEGORY]
+        assert pre_triage.AUTO_ARCHIVE_CATEGORY in VALID_CATEGORIES
+
+    def test_tier1_noise_still_goes_to_llm(self):
+        from pipeline.src.triage import pre_triage
+
+        to_triage, archived = pre_triage.filter_items([_make_item("Team spotlight", self.NOISE, tier=1)], "run-1")
+        assert len(to_triage) == 1 and archived == []
+
+    def test_similarity_to_llm_archived_items_raises_confidence(self):
+        from pipeline.src.kb import store
+        from pipeline.src.triage import pre_triage
+
+        template = ("This week in our community: office hours, a meetup recap and a few reader "
+                    "questions answered by the team. Thanks for reading and see you next week. ")
+        old = _make_item("Community digest 41", template * 2, tier=2)
+        store.ingest_items([old], near_duplicates=True)
+        store.update_item_significance(old.id, 2.0, False)
+
+        new = _make_item("Community digest 42", template * 2 + "Issue 42.", tier=2)
+        [decision] = pre_triage.assess([new])
+        assert decision.archived_similarity > 0.7
+        assert decision.archive
+
+        store.update_item_significance(old.id, 8.0, False)
+        [decision] = pre_triage.assess([new])
+        assert decision.archived_similarity == 0.0, "only LLM-archived items count"
+
+        store.update_item_significance(old.id, 2.0, False)
+        store.save_triage_labels([(old.id, 2, "api-update")], source="predicted")
+        [decision] = pre_triage.assess([new])
+        assert decision.archived_similarity == 0.0, "predicted archives are not LLM labels"
+
+    def test_shadow_mode_logs_but_triages_everything(self, monkeypatch):
+        from pipeline.src.kb import store
+        from pipeline.src.triage import pre_triage
+
+        monkeypatch.setattr(pre_triage, "PRE_TRIAGE_MODE", "shadow")
+        noise = _make_item("Team spotlight", self.NOISE, tier=3)
+        store.ingest_items([noise])
+        to_triage, archived = pre_triage.filter_items([noise], run_id="run-1")
+
+        assert to_triage == [noise] and archived == []
+        assert [(r["decision"], r["skipped_llm"]) for r in self._logged()] == [("archive", 0)]
+
+        store.update_item_significance(noise.id, 2.0, False)
+        by_threshold = {r["threshold"]: r for r in pre_triage.calibrate()}
+        assert by_threshold[0.75]["would_archive"] == 1
+        assert by_threshold[0.75]["missed"] == 0
+
+    def test_calibrate_ignores_predicted_significance(self, monkeypatch):
+        from pipeline.src.kb import store
+        from pipeline.src.triage import pre_triage
+
+        monkeypatch.setattr(pre_triage, "PRE_TRIAGE_MODE", "shadow")
+        noise = _make_item("Team spotlight", self.NOISE, tier=3)
+        guessed = _make_item("Office move", self.NOISE + " Again.", tier=3)
+        store.ingest_items([noise, guessed])
+        pre_triage.filter_items([noise, guessed], run_id="run-1")
+
+        store.update_item_significance(noise.id, 2.0, False)
+        store.update_item_significance(guessed.id, 8.0, False)
+        store.save_triage_labels([(guessed.id, 8, "api-update")], source="predicted")
+
+        assert [r["item_id"] for r in store.get_pre_triage_outcomes()] == [noise.id]
+        by_threshold = {r["threshold"]: r for r in pre_triage.calibrate()}
+        assert by_threshold[0.75]["items"] == 1
+        assert by_threshold[0.75]["missed"] == 0
+
+    def test_calibrate_cli(self, capsys):
+        from pipeline.src.triage import pre_triage
+
+        assert pre_triage.main([]) == 2
+        assert pre_triage.main(["--calibrate", "--thresholds", "0.5", "0.9"]) == 0
+        out = capsys.readouterr().out
+        assert "labelled items  0" in out
+        assert [line.split()[0] for line in out.splitlines()[2:]] == ["0.50", "0.90"]
+
+
+class TestSignificancePredictor:
+    """Confident kNN predictions from past triage labels replace the LLM call."""
+
+    def _labelled(self, scores, category="api-update"):
+        from pipeline.src.kb import store
+
+        items = [_make_item(f"Past item {i}", f"Past content {i}.") for i in range(len(scores))]
+        store.ingest_items(items)
+        for item, score in zip(items, scores):
+            store.update_item_significance(item.id, float(score), False)
+        store.save_triage_labels([(item.id, score, category) for item, score in zip(items, scores)])
+        return [item.id for item in items]
+
+    def _neighbours(self, mapping):
+        return patch(
+            "pipeline.src.kb.vector_store.find_item_neighbours",
+            side_effect=lambda ids, n_results=10: {i: mapping[i] for i in ids if i in mapping},
+        )
+
+    def test_confident_low_significance_skips_llm(self):
+        from pipeline.src.kb import store
+        from pipeline.src.triage import predictor
+
+        past = self._labelled([2, 2, 3, 2, 2, 3])
+        new = _make_item("New item", "Similar routine update.")
+        with self._neighbours({new.id: [(p, 0.9) for p in past]}):
+            to_triage, predicted = predictor.filter_items([new])
+
+        assert to_triage == []
+        assert predicted[0].route == "archive"
+        assert predicted[0].significance == 2 and predicted[0].category == "api-update"
+        # Predictions are recorded but never become training labels
+        assert new.id not in store.get_triage_labels()
+
+    def test_disagreeing_or_high_significance_neighbours_go_to_llm(self):
+        from pipeline.src.triage import predictor
+
+        mixed = self._labelled([2, 9, 2, 9, 5, 7])
+        high = self._labelled([8, 8, 8, 8, 8, 8])
+        few = self._labelled([2, 2])
+        items = [_make_item(f"New {i}", f"Fresh content {i}.") for i in range(3)]
+        mapping = {
+            items[0].id: [(p, 0.9) for p in mixed],
+            items[1].id: [(p, 0.9) for p in high],  # story route: needs an LLM headline
+            items[2].id: [(p, 0.9) for p in few],
+        }
+        with self._neighbours(mapping):
+            to_triage, predicted = predictor.filter_items(items)
+
+        assert to_triage == items and predicted == []
+
+    def test_unembedded_store_falls_back_to_llm(self):
+        from pipeline.src.triage import predictor
+
+        items = [_make_item("New", "Content.")]
+        with patch("pipeline.src.kb.vector_store.find_item_neighbours", side_effect=RuntimeError("no model")):
+            assert predictor.filter_items(items) == (items, [])
+
+    def test_leave_one_out_evaluation(self):
+        from pipeline.src.triage import predictor
+
+        past = self._labelled([2, 2, 2, 2, 2, 2, 9])
+        mapping = {p: [(q, 0.9) for q in past if q != p] for p in past}
+        with self._neighbours(mapping):
+            report = predictor.evaluate(min_neighbours=5)
+
+        assert report["labelled"] == 7 and report["predicted"] == 7
+        assert report["confident"] == 7
+        # The significance-9 outlier is confidently (and wrongly) predicted as archive
+        assert report["route_accuracy"] == 6 / 7
+
+
+class TestTriageCache:
+    """Identical content is triaged once per prompt version and model."""
+
+    @pytest.fixture(autouse=True)
+    def no_kb(self):
+        from pipeline.src.kb.kb_query import KBContext
+        with patch("pipeline.src.kb.kb_query.query", return_value=KBContext()):
+            yield
+
+    @staticmethod
+    def _counting(calls, significance=7):
+        def caller(prompt):
+            calls.append(prompt)
+            if "=== ITEM" in prompt:
+                import re
+                ids = re.findall(r"^=== ITEM (\S+) ===$", prompt, flags=re.M)
+                return [{"id": i, "significance": significance, "category": "benchmark"} for i in ids]
+            return {"significance": significance, "category": "benchmark", "rationale": "Cached rationale."}
+        return caller
+
+    def test_recollected_content_is_not_retriaged(self):
+        from pipeline.src.triage.triage_agent import triage_item
+
+        calls = []
+        first = triage_item(_make_item("GPT-5 released", "Same body."), llm_caller=self._counting(calls), use_cache=True)
+        again = triage_item(_make_item("GPT-5 released", "Same body."), llm_caller=self._counting(calls), use_cache=True)
+
+        assert len(calls) == 1
+        assert again.item.id != first.item.id
+        assert (again.significance, again.category, again.rationale, again.route) == \
+               (first.significance, first.category, first.rationale, first.route)
+
+    def test_prompt_or_model_change_misses(self, monkeypatch):
+        from pipeline.src.triage import triage_agent
+
+        calls = []
+        item = _make_item("GPT-5 released", "Same body.")
+        triage_agent.triage_item(item, llm_caller=self._counting(calls), use_cache=True)
+        monkeypatch.setattr(triage_agent, "TRIAGE_MODEL", "another-model")
+        triage_agent.triage_item(item, llm_caller=self._counting(calls), use_cache=True)
+        monkeypatch.setattr(triage_agent, "PROMPT_VERSION", "edited-template")
+        triage_agent.triage_item(item, llm_caller=self._counting(calls), use_cache=True)
+        assert len(calls) == 3
+
+    def test_batch_rerun_costs_no_llm_calls(self):
+        from pipeline.src.triage.triage_agent import triage_batch
+
+        items = [_make_item(f"Item {i}", f"Content {i}.") for i in range(5)]
+        calls = []
+        first, _ = triage_batch(items, llm_caller=self._counting(calls), batch_size=3, use_cache=True)
+        assert len(calls) == 2
+
+        recovered = [_make_item(f"Item {i}", f"Content {i}.") for i in range(5)]
+        again, errors = triage_batch(recovered, llm_caller=self._counting(calls), batch_size=3, use_cache=True)
+        assert len(calls) == 2 and errors == []
+        assert [t.item.id for t in again] == [i.id for i in recovered]
+        assert [t.significance for t in again] == [t.significance for t in first]
+
+    def test_injected_caller_bypasses_cache_by_default(self):
+        from pipeline.src.triage.triage_agent import triage_item
+
+        calls = []
+        triage_item(_make_item("GPT-5 released", "Same body."), llm_caller=self._counting(calls))
+        triage_item(_make_item("GPT-5 released", "Same body."), llm_caller=self._counting(calls))
+        assert len(calls) == 2
+
+
+class TestKBQueryCacheFlag:
+    """kb_query.query(check_cache=False) never answers from the semantic cache."""
+
+    def test_check_cache_false_skips_semantic_cache(self):
+        from pipeline.src.kb import kb_query
+
+        with patch("pipeline.src.kb.semantic_cache.check_cache", return_value="cached answer") as check, \
+             patch("pipeline.src.kb.vector_store.search_similar_items", return_value=[]), \
+             patch("pipeline.src.kb.vector_store.search_similar_articles", return_value=[]):
+            assert kb_query.query("GPT-5", cache_type="news").cache_hit
+            ctx = kb_query.query("GPT-5", cache_type="news", check_cache=False)
+
+        assert not ctx.cache_hit and ctx.cached_response is None
+        assert check.call_count == 1
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, "-v"])
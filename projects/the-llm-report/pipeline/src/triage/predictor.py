@@ -0,0 +1,220 @@
+"""
+The LLM Report — Significance Predictor
+kNN over the Chroma item embeddings, labelled with past triage results
+(source_items.significance_score, plus the category from triage_labels).
+Local-only: zero LLM cost.
+
+For an item, the K most similar labelled items (similarity >= MIN_SIMILARITY)
+vote, weighted by similarity: significance is their weighted mean, category
+their weighted majority. The prediction replaces the LLM call only when it is
+confident:
+
+    - at least MIN_NEIGHBOURS labelled neighbours
+    - neighbours agreeing on the route carry >= AGREEMENT of the weight
+    - neighbours agreeing on the category carry >= CATEGORY_AGREEMENT of the
+      weight of those with a known category
+    - the predicted route is in PREDICT_ROUTES — story and lead items still get
+      the LLM's rationale and headline
+
+Offline evaluation (leave-one-out over the stored labels):
+    python -m pipeline.src.triage.predictor --evaluate
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from pipeline.src.models import CollectedItem, TriagedItem
+from pipeline.src.kb import store, vector_store
+from pipeline.src.triage.triage_agent import route_item
+
+PREDICTOR_ENABLED = os.environ.get("PREDICTOR_ENABLED", "1").lower() in ("1", "true", "yes")
+K = int(os.environ.get("PREDICTOR_K", "10"))
+MIN_NEIGHBOURS = int(os.environ.get("PREDICTOR_MIN_NEIGHBOURS", "5"))
+MIN_SIMILARITY = float(os.environ.get("PREDICTOR_MIN_SIMILARITY", "0.5"))
+AGREEMENT = float(os.environ.get("PREDICTOR_AGREEMENT", "0.8"))
+CATEGORY_AGREEMENT = 0.6
+PREDICT_ROUTES = ("archive", "roundup")
+
+
+@dataclass
+class Prediction:
+    significance: int
+    category: Optional[str]
+    route: str
+    neighbours: int
+    route_agreement: float
+    category_agreement: float
+
+    def confident(
+        self,
+        min_neighbours: Optional[int] = None,
+        agreement: Optional[float] = None,
+    ) -> bool:
+        return (
+            self.neighbours >= (MIN_NEIGHBOURS if min_neighbours is None else min_neighbours)
+            and self.route_agreement >= (AGREEMENT if agreement is None else agreement)
+            and self.category is not None
+            and self.category_agreement >= CATEGORY_AGREEMENT
+            and self.route in PREDICT_ROUTES
+        )
+
+
+def predict(
+    neighbours: list[tuple[str, float]],
+    labels: dict[str, dict],
+    k: Optional[int] = None,
+    min_similarity: Optional[float] = None,
+) -> Optional[Prediction]:
+    """Prediction from (neighbour_id, similarity) pairs, or None without labelled neighbours."""
+    k = K if k is None else k
+    min_similarity = MIN_SIMILARITY if min_similarity is None else min_similarity
+    voters = [(labels[n], sim) for n, sim in neighbours if n in labels and sim >= min_similarity][:k]
+    total = sum(sim for _, sim in voters)
+    if not voters or total <= 0:
+        return None
+
+    significance = max(1, min(10, round(sum(label["significance"] * sim for label, sim in voters) / total)))
+    route = route_item(significance)
+    route_weight = sum(sim for label, sim in voters if route_item(label["significance"]) == route)
+
+    votes: dict[str, float] = {}
+    for label, sim in voters:
+        if label["category"]:
+            votes[label["category"]] = votes.get(label["category"], 0.0) + sim
+    category, category_weight = max(sorted(votes.items()), key=lambda kv: kv[1]) if votes else (None, 0.0)
+
+    return Prediction(
+        significance=significance,
+        category=category,
+        route=route,
+        neighbours=len(voters),
+        route_agreement=round(route_weight / total, 3),
+        category_agreement=round(category_weight / sum(votes.values()), 3) if votes else 0.0,
+    )
+
+
+def _predicted(item: CollectedItem, prediction: Prediction) -> TriagedItem:
+    return TriagedItem(
+        item=item,
+        significance=prediction.significance,
+        category=prediction.category,
+        rationale=(f"Predicted from {prediction.neighbours} similar triaged items "
+                   f"({prediction.route_agreement:.0%} route agreement)."),
+        suggested_headline=item.title[:80],
+        promoted=item.source_tier >= 2 and prediction.significance >= 8,
+        route=prediction.route,
+    )
+
+
+def filter_items(items: list[CollectedItem]) -> tuple[list[CollectedItem], list[TriagedItem]]:
+    """
+    Split items into (to_triage, predicted). predicted are TriagedItems for
+    confident predictions, recorded in triage_labels as source "predicted".
+    Without embeddings or labels (or with PREDICTOR_ENABLED off) every item
+    goes to the LLM.
+    """
+    if not PREDICTOR_ENABLED or not items:
+        return list(items), []
+    try:
+        neighbours = vector_store.find_item_neighbours([item.id for item in items], n_results=K)
+    except Exception:
+        return list(items), []
+    labels = store.get_triage_labels(sorted({n for hits in neighbours.values() for n, _ in hits}))
+
+    to_triage: list[CollectedItem] = []
+    predicted: list[TriagedItem] = []
+    for item in items:
+        prediction = predict(neighbours.get(item.id, []), labels)
+        if prediction is not None and prediction.confident():
+            predicted.append(_predicted(item, prediction))
+        else:
+            to_triage.append(item)
+    if predicted:
+        store.save_triage_labels([(t.item.id, t.significance, t.category) for t in predicted], source="predicted")
+    return to_triage, predicted
+
+
+def record_labels(triaged: list[TriagedItem]) -> None:
+    """Store LLM triage results as training labels."""
+    store.save_triage_labels([(t.item.id, t.significance, t.category) for t in triaged], source="llm")
+
+
+def evaluate(
+    k: Optional[int] = None,
+    min_similarity: Optional[float] = None,
+    min_neighbours: Optional[int] = None,
+    agreement: Optional[float] = None,
+) -> dict:
+    """
+    Leave-one-out evaluation over every labelled, embedded item: predict it
+    from its neighbours' labels and compare with the stored LLM result.
+    """
+    k = K if k is None else k
+    labels = store.get_triage_labels()
+    neighbours = vector_store.find_item_neighbours(list(labels), n_results=k)
+
+    predicted = confident = 0
+    abs_error = confident_abs_error = 0
+    route_hits = category_hits = category_known = 0
+    for item_id, hits in neighbours.items():
+        prediction = predict(hits, labels, k=k, min_similarity=min_similarity)
+        if prediction is None:
+            continue
+        truth = labels[item_id]
+        error = abs(prediction.significance - truth["significance"])
+        predicted += 1
+        abs_error += error
+        if not prediction.confident(min_neighbours=min_neighbours, agreement=agreement):
+            continue
+        confident += 1
+        confident_abs_error += error
+        route_hits += prediction.route == route_item(truth["significance"])
+        if truth["category"]:
+            category_known += 1
+            category_hits += prediction.category == truth["category"]
+
+    return {
+        "labelled": len(labels),
+        "embedded": len(neighbours),
+        "predicted": predicted,
+        "confident": confident,
+        "mae": abs_error / predicted if predicted else None,
+        "confident_mae": confident_abs_error / confident if confident else None,
+        "route_accuracy": route_hits / confident if confident else None,
+        "category_accuracy": category_hits / category_known if category_known else None,
+    }
+
+
+def _fmt(value: Optional[float], pattern: str) -> str:
+    return "n/a" if value is None else pattern.format(value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--evaluate", action="store_true", help="Leave-one-out report over stored triage labels")
+    parser.add_argument("--k", type=int, default=K)
+    parser.add_argument("--min-similarity", type=float, default=MIN_SIMILARITY)
+    parser.add_argument("--min-neighbours", type=int, default=MIN_NEIGHBOURS)
+    parser.add_argument("--agreement", type=float, default=AGREEMENT)
+    args = parser.parse_args(argv)
+    if not args.evaluate:
+        parser.print_usage(sys.stderr)
+        return 2
+
+    report = evaluate(args.k, args.min_similarity, args.min_neighbours, args.agreement)
+    share = report["confident"] / report["embedded"] if report["embedded"] else None
+    print(f"labelled items     {report['labelled']} ({report['embedded']} with embeddings)")
+    print(f"predicted          {report['predicted']}  MAE {_fmt(report['mae'], '{:.2f}')}")
+    print(f"confident          {report['confident']} ({_fmt(share, '{:.0%}')} of LLM calls saved)  "
+          f"MAE {_fmt(report['confident_mae'], '{:.2f}')}")
+    print(f"route accuracy     {_fmt(report['route_accuracy'], '{:.1%}')} (confident predictions)")
+    print(f"category accuracy  {_fmt(report['category_accuracy'], '{:.1%}')} (confident, labelled category)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,23 @@ NLSpec Section 5.2
 """
 
 from __future__ import annotations
+import hashlib
 import json
 import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from typing import Optional
 
 from pipeline.src.models import CollectedItem, TriagedItem
-from pipeline.src.kb import kb_query
+from pipeline.src.kb import kb_query, store
 
 LITELLM_URL = os.environ.get("LITELLM_PROXY_URL", "http://localhost:4000")
 TRIAGE_MODEL = os.environ.get("TRIAGE_MODEL", "claude-sonnet-4-5")
+TRIAGE_CONCURRENCY = int(os.environ.get("TRIAGE_CONCURRENCY", "8"))  # LLM requests in flight at once
+TRIAGE_ITEM_TIMEOUT = float(os.environ.get("TRIAGE_ITEM_TIMEOUT", "120"))  # seconds per request
+_START_POLL_S = 0.05  # re-check requests submitted but not yet started
 
 VALID_CATEGORIES = {
     "model-release", "api-update", "security-patch", "acquisition",
@@ -48,9 +55,42 @@ Valid categories: model-release, api-update, security-patch, acquisition, partne
 Return ONLY valid JSON, no markdown:
 {{"significance": <1-10 integer>, "category": "<category>", "rationale": "<one sentence>", "suggested_headline": "<max 80 chars>", "promoted": <true if tier 2/3 AND significance >= 8, else false>}}"""
 
+# Batched mode: the instructions are sent once for up to `batch_size` items
+TRIAGE_BATCH_PROMPT_TEMPLATE = """You are a senior technology news editor assessing incoming stories for an AI industry newsletter.
 
-def _call_triage_llm(prompt: str) -> dict:
-    """Call the triage LLM via LiteLLM proxy. Returns parsed JSON dict."""
+Score each of the {count} items below 1-10 for significance and classify it. Judge every item on its own; the knowledge base context under an item applies to that item only.
+
+Scoring dimensions:
+- Novelty: Is this genuinely new, or an incremental update?
+- Impact: Does this affect how practitioners build or deploy AI?
+- Breadth: Does this affect one product or the whole industry?
+- Timeliness: Is this breaking, or background context?
+
+Valid categories: model-release, api-update, security-patch, acquisition, partnership, research-paper, framework-release, methodology, policy-regulatory, benchmark, pricing-change
+
+{items}
+
+Return ONLY a valid JSON array with exactly one object per item, no markdown:
+[{{"id": "<item id>", "significance": <1-10 integer>, "category": "<category>", "rationale": "<one sentence>", "suggested_headline": "<max 80 chars>", "promoted": <true if tier 2/3 AND significance >= 8, else false>}}]"""
+
+TRIAGE_BATCH_ITEM_TEMPLATE = """=== ITEM {id} ===
+CONTEXT FROM KNOWLEDGE BASE:
+{kb_context}
+
+Title: {title}
+Source: {source_name} (Tier {source_tier})
+Published: {published_at}
+Content: {raw_content}"""
+
+# Triage results are cached per (content_hash, PROMPT_VERSION, TRIAGE_MODEL):
+# editing any prompt template invalidates the cache
+PROMPT_VERSION = hashlib.sha256(
+    "\0".join((TRIAGE_PROMPT_TEMPLATE, TRIAGE_BATCH_PROMPT_TEMPLATE, TRIAGE_BATCH_ITEM_TEMPLATE)).encode()
+).hexdigest()[:16]
+
+
+def _call_triage_llm(prompt: str, max_tokens: int = 300):
+    """Call the triage LLM via LiteLLM proxy. Returns parsed JSON (a dict, or a list for batches)."""
     try:
         import litellm
         litellm.api_base = LITELLM_URL
@@ -59,7 +99,8 @@ def _call_triage_llm(prompt: str) -> dict:
             model=TRIAGE_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
-            max_tokens=300,
+            max_tokens=max_tokens,
+            timeout=TRIAGE_ITEM_TIMEOUT,
         )
         text = response.choices[0].message.content.strip()
 
@@ -75,7 +116,7 @@ def _call_triage_llm(prompt: str) -> dict:
         raise RuntimeError(f"Triage LLM call failed: {e}") from e
 
 
-def _route_item(significance: int) -> str:
+def route_item(significance: int) -> str:
     """Map significance score to pipeline route."""
     if significance <= 3:
         return "archive"
@@ -87,43 +128,27 @@ def _route_item(significance: int) -> str:
         return "lead"
 
 
-def triage_item(
-    item: CollectedItem,
-    llm_caller=None,  # Injectable for testing
-) -> TriagedItem:
-    """
-    Triage a single CollectedItem.
-    1. Query KB for context (KB-First Pattern)
-    2. Call LLM for significance scoring
-    3. Apply tier promotion rule
-    4. Return TriagedItem
-
-    Args:
-        item: The item to triage
-        llm_caller: Optional callable(prompt) -> dict for testing injection
-    """
-    # Step 1: KB context query
+def _prompt_fields(item: CollectedItem) -> dict:
+    """Template fields for one item, including its KB context (KB-First Pattern)."""
+    # The semantic cache is shared with other stages; triage always builds fresh context
     ctx = kb_query.query(
         f"{item.title} {item.raw_content[:200]}",
         n_results=3,
         cache_type="news",
+        check_cache=False,
     )
+    return {
+        "kb_context": kb_query.format_context_for_prompt(ctx, item.title),
+        "title": item.title,
+        "source_name": item.source_name,
+        "source_tier": item.source_tier,
+        "published_at": item.published_at.isoformat() if item.published_at else "unknown",
+        "raw_content": item.raw_content[:1000],
+    }
 
-    # Step 2: Build prompt
-    prompt = TRIAGE_PROMPT_TEMPLATE.format(
-        kb_context=kb_query.format_context_for_prompt(ctx, item.title),
-        title=item.title,
-        source_name=item.source_name,
-        source_tier=item.source_tier,
-        published_at=item.published_at.isoformat() if item.published_at else "unknown",
-        raw_content=item.raw_content[:1000],
-    )
 
-    # Step 3: Call LLM (or injected mock)
-    caller = llm_caller or _call_triage_llm
-    result = caller(prompt)
-
-    # Step 4: Validate and normalize
+def _to_triaged(item: CollectedItem, result: dict) -> TriagedItem:
+    """Validate and normalize one LLM result, then apply tier promotion and routing."""
     significance = int(result.get("significance", 5))
     significance = max(1, min(10, significance))
 
@@ -145,7 +170,7 @@ def triage_item(
         item.source_tier >= 2 and significance >= 8
     )
 
-    route = _route_item(significance)
+    route = route_item(significance)
 
     return TriagedItem(
         item=item,
@@ -158,26 +183,226 @@ def triage_item(
     )
 
 
+def triage_item(
+    item: CollectedItem,
+    llm_caller=None,  # Injectable for testing
+    use_cache: Optional[bool] = None,
+) -> TriagedItem:
+    """
+    Triage a single CollectedItem.
+    0. Return the cached result for identical content, if any
+    1. Query KB for context (KB-First Pattern)
+    2. Call LLM for significance scoring
+    3. Apply tier promotion rule
+    4. Return TriagedItem
+
+    Args:
+        item: The item to triage
+        llm_caller: Optional callable(prompt) -> dict for testing injection
+        use_cache: Read and write the triage cache (content_hash, PROMPT_VERSION,
+            TRIAGE_MODEL); defaults to on unless llm_caller is injected
+    """
+    if use_cache is None:
+        use_cache = llm_caller is None
+
+    # Step 0: Triage cache — same content, prompt and model → same result, no LLM call
+    if use_cache:
+        cached = store.get_triage_cache([item.content_hash], PROMPT_VERSION, TRIAGE_MODEL)
+        if item.content_hash in cached:
+            return _to_triaged(item, cached[item.content_hash])
+
+    # Steps 1-2: KB context query, build prompt
+    prompt = TRIAGE_PROMPT_TEMPLATE.format(**_prompt_fields(item))
+
+    # Step 3: Call LLM (or injected mock)
+    caller = llm_caller or _call_triage_llm
+    result = caller(prompt)
+
+    # Step 4: Validate and normalize
+    triaged = _to_triaged(item, result)
+    if use_cache:
+        store.save_triage_cache([triaged], PROMPT_VERSION, TRIAGE_MODEL)
+    return triaged
+
+
+def triage_group(
+    items: list[CollectedItem],
+    llm_caller=None,  # Injectable for testing
+    use_cache: Optional[bool] = None,
+) -> list[Optional[TriagedItem]]:
+    """
+    Triage several items with one LLM request (TRIAGE_BATCH_PROMPT_TEMPLATE).
+    The reply must be a JSON array of result objects keyed by item "id".
+    Returns one entry per item, in order; None where the reply has no usable
+    result for the item (missing id, duplicate, no integer significance) — the
+    caller falls back to triage_item() for those. A failed request raises.
+
+    Args:
+        items: The items to triage together
+        llm_caller: Optional callable(prompt) -> list[dict] for testing injection
+        use_cache: Write results to the triage cache (see triage_item; lookups
+            happen in triage_batch); defaults to on unless llm_caller is injected
+    """
+    if use_cache is None:
+        use_cache = llm_caller is None
+    blocks = [TRIAGE_BATCH_ITEM_TEMPLATE.format(id=item.id, **_prompt_fields(item)) for item in items]
+    prompt = TRIAGE_BATCH_PROMPT_TEMPLATE.format(count=len(items), items="\n\n".join(blocks))
+
+    caller = llm_caller or (lambda p: _call_triage_llm(p, max_tokens=300 * len(items)))
+    reply = caller(prompt)
+    if isinstance(reply, dict):
+        reply = reply.get("items", [])
+    if not isinstance(reply, list):
+        raise ValueError(f"Triage LLM returned {type(reply).__name__}, expected a JSON array")
+
+    by_id: dict[str, dict] = {}
+    duplicated: set[str] = set()
+    for entry in reply:
+        if not isinstance(entry, dict):
+            continue
+        item_id = str(entry.get("id", "")).strip()
+        if item_id in by_id:
+            duplicated.add(item_id)
+        by_id[item_id] = entry
+
+    triaged: list[Optional[TriagedItem]] = []
+    for item in items:
+        entry = by_id.get(item.id)
+        if entry is None or item.id in duplicated:
+            triaged.append(None)
+            continue
+        try:
+            int(entry["significance"])
+            triaged.append(_to_triaged(item, entry))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            triaged.append(None)
+
+    if use_cache:
+        store.save_triage_cache([t for t in triaged if t is not None], PROMPT_VERSION, TRIAGE_MODEL)
+    return triaged
+
+
 def triage_batch(
     items: list[CollectedItem],
     llm_caller=None,
     max_errors: int = 3,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    batch_size: int = 1,
+    use_cache: Optional[bool] = None,
 ) -> tuple[list[TriagedItem], list[str]]:
     """
     Triage a batch of items. Returns (triaged_items, errors).
     Continues on individual item errors up to max_errors.
+
+    Up to `concurrency` requests (TRIAGE_CONCURRENCY) run at once, each given
+    `timeout` seconds (TRIAGE_ITEM_TIMEOUT) from when it starts before it
+    counts as an error. A timed-out request keeps its slot until it returns.
+    With batch_size > 1, items are sent batch_size per request (triage_group);
+    items the reply leaves out are retried one by one with triage_item. A
+    failed or timed-out request is an error for each of its items — retrying
+    them singly would multiply the requests when the LLM is struggling.
+    Items whose content was already triaged with the current prompts and model
+    come from the triage cache without an LLM call (use_cache: see triage_item).
+
+    Results and errors are in input order and identical to a sequential run:
+    the batch ends at the max_errors-th failing item, and anything finished
+    past that point is dropped. No new items start once max_errors is reached.
     """
+    cap = max(1, concurrency or TRIAGE_CONCURRENCY)
+    timeout = timeout or TRIAGE_ITEM_TIMEOUT
+    size = max(1, batch_size)
+    if use_cache is None:
+        use_cache = llm_caller is None
+    outcomes: dict[int, tuple[Optional[TriagedItem], Optional[str]]] = {}
+
+    if use_cache:
+        cached = store.get_triage_cache(list({item.content_hash for item in items}), PROMPT_VERSION, TRIAGE_MODEL)
+        for index, item in enumerate(items):
+            if item.content_hash in cached:
+                outcomes[index] = (_to_triaged(item, cached[item.content_hash]), None)
+    todo = [index for index in range(len(items)) if index not in outcomes]
+    units = deque(todo[i:i + size] for i in range(0, len(todo), size))
+    fallback: deque[int] = deque()  # items to retry alone, submitted before new units
+    in_flight: dict[Future, tuple[list[int], list[float]]] = {}  # future → (indices, [start time])
+    abandoned: set[Future] = set()  # timed out but still holding a worker
+    failed = 0
+
+    def run(indices: list[int], started: list[float]) -> list[Optional[TriagedItem]]:
+        started.append(time.monotonic())  # the timeout counts from here, not from submit
+        if len(indices) == 1:
+            return [triage_item(items[indices[0]], llm_caller=llm_caller, use_cache=use_cache)]
+        return triage_group([items[i] for i in indices], llm_caller=llm_caller, use_cache=use_cache)
+
+    def submit(indices: list[int]) -> None:
+        started: list[float] = []
+        in_flight[pool.submit(run, indices, started)] = (indices, started)
+
+    def deadline(future: Future) -> float:
+        started = in_flight[future][1]
+        return started[0] + timeout if started else float("inf")
+
+    def fail(index: int, error: str) -> None:
+        nonlocal failed
+        item = items[index]
+        outcomes[index] = (None, f"{item.id} ({item.title[:40]}): {error}")
+        failed += 1
+
+    pool = ThreadPoolExecutor(max_workers=cap)
+    try:
+        while in_flight or fallback or (units and failed < max_errors):
+            # Timed-out requests keep their worker until the LLM client gives
+            # up, so they count against cap: new work never queues behind them
+            abandoned = {future for future in abandoned if not future.done()}
+            while len(in_flight) + len(abandoned) < cap and (fallback or (units and failed < max_errors)):
+                submit([fallback.popleft()] if fallback else units.popleft())
+            if not in_flight:
+                wait(abandoned, return_when=FIRST_COMPLETED)
+                continue
+
+            # Requests not picked up by a worker yet have no deadline: look again shortly
+            nearest = min(deadline(future) for future in in_flight)
+            if any(not started for _, started in in_flight.values()):
+                nearest = min(nearest, time.monotonic() + _START_POLL_S)
+            wait_s = max(0.0, nearest - time.monotonic())
+            done, _ = wait(in_flight, timeout=wait_s, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in list(in_flight):
+                indices = in_flight[future][0]
+                grouped = len(indices) > 1
+                error = None
+                if future in done:
+                    try:
+                        triaged = future.result()
+                    except Exception as e:
+                        triaged, error = [None] * len(indices), str(e)
+                elif now >= deadline(future):
+                    # The worker thread cannot be interrupted; its result is abandoned
+                    abandoned.add(future)
+                    triaged, error = [None] * len(indices), f"timed out after {timeout:.0f}s"
+                else:
+                    continue
+                del in_flight[future]
+                for index, result in zip(indices, triaged):
+                    if result is not None:
+                        outcomes[index] = (result, None)
+                    elif grouped and error is None:
+                        fallback.append(index)  # left out of an otherwise good reply
+                    else:
+                        fail(index, error)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
     results = []
     errors = []
-
-    for item in items:
-        try:
-            triaged = triage_item(item, llm_caller=llm_caller)
-            results.append(triaged)
-        except Exception as e:
-            errors.append(f"{item.id} ({item.title[:40]}): {e}")
+    for index in sorted(outcomes):
+        triaged, error = outcomes[index]
+        if error:
+            errors.append(error)
             if len(errors) >= max_errors:
                 break
+        else:
+            results.append(triaged)
 
     return results, errors
 